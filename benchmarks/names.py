@@ -0,0 +1,136 @@
+'''
+Micro-benchmarks of the naming and export path helpers (fn_names.py, fn_export_paths.py).
+
+Doesn't need Blender, run it with plain Python from the repository root:
+
+    python benchmarks/names.py --count 20000 --repeat 5 --output names.json
+
+Every helper is timed cold (empty caches) and warm, next to the inline code it replaced.
+Correctness is covered by tests/test_names.py.
+'''
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+from vrage_tools.functions import fn_names, fn_export_paths
+
+
+roles = ("", "_Cut", "_Hide", "_Support", "_Glass", "_Grate", "_Conveyor")
+
+
+def generate_names(count: int, seed: int = 0) -> list:
+    """Names like the ones found in block scenes, a third of them with a duplicate suffix"""
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        match rng.randrange(3):
+            case 0:
+                name = f"Fracture_{rng.randint(1, 15):02d}{rng.choice(roles)}"
+            case 1:
+                name = f"Collision_{rng.randint(1, 40):02d}"
+            case _:
+                name = f"Detail_{rng.randint(1, 500)}"
+        if rng.random() < 0.33:
+            name += f".{rng.randint(1, 999):03d}"
+        names.append(name)
+    return names
+
+
+#region Replaced code
+
+def legacy_base_name(name):
+    if len(name) >= 4 and name[-4] == "." and name[-3:].isdigit():
+        return name[:-4]
+    return name
+
+def legacy_fracture_prefix(name):
+    match = re.match(r"(Fracture_\d+)", name)
+    return match.group(1) if match else None
+
+def legacy_collider_mesh_groups(groups):
+    return '|'.join(sorted(set(groups)))
+
+#endregion
+
+
+def clear_caches():
+    for function in (fn_names.split_duplicate_suffix, fn_names.get_fracture_prefix, fn_names.split_groups, fn_names.parse_name,
+                     fn_export_paths.get_export_filename):
+        function.cache_clear()
+
+
+def measure(function, repeat: int, cold: bool) -> float:
+    """Best time of `repeat` runs in seconds"""
+    best = None
+    for i in range(repeat):
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the naming and export path helpers")
+    parser.add_argument('--count', type=int, default=20000, help="Number of generated object names")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of measured runs, the best one is reported")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    names = generate_names(args.count)
+
+    cases = {
+        'base_name': (
+            lambda: [legacy_base_name(name) for name in names],
+            lambda: [fn_names.get_base_name(name) for name in names],
+        ),
+        'fracture_prefix': (
+            lambda: [legacy_fracture_prefix(name) for name in names],
+            lambda: [fn_names.get_fracture_prefix(name) for name in names],
+        ),
+        'parse_name': (
+            lambda: [(legacy_base_name(name), legacy_fracture_prefix(name)) for name in names],
+            lambda: [fn_names.parse_name(name) for name in names],
+        ),
+        'collider_mesh_groups': (
+            lambda: legacy_collider_mesh_groups(legacy_fracture_prefix(name) for name in names if legacy_fracture_prefix(name)),
+            lambda: fn_names.get_collider_mesh_groups(group for group in map(fn_names.get_fracture_group, names) if group),
+        ),
+        'export_filename': (
+            None,
+            lambda: [fn_export_paths.get_export_filename("Block", variant, lod)
+                     for variant in fn_export_paths.export_variants for lod in range(4) for i in range(len(names) // 16)],
+        ),
+    }
+
+    results = {'count': args.count, 'repeat': args.repeat, 'benchmarks': {}}
+    for name, (legacy, current) in cases.items():
+        result = {
+            'cold': measure(current, args.repeat, cold=True),
+            'warm': measure(current, args.repeat, cold=False),
+        }
+        if legacy is not None:
+            result['legacy'] = measure(legacy, args.repeat, cold=False)
+        results['benchmarks'][name] = result
+
+        legacy_text = f"   legacy {result['legacy'] * 1000:7.2f} ms" if 'legacy' in result else ""
+        print(f"{name:<22} cold {result['cold'] * 1000:7.2f} ms   warm {result['warm'] * 1000:7.2f} ms{legacy_text}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
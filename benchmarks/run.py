@@ -0,0 +1,231 @@
+'''
+Times the main VRAGE Tools operators on synthetic block scenes (see scene_generator.py).
+
+Run it with Blender from the repository root:
+
+    blender -b --factory-startup --python benchmarks/run.py -- --output results.json
+    blender -b --factory-startup --python benchmarks/run.py -- --baseline benchmarks/baseline.json --tolerance 0.2
+    blender -b --factory-startup --python benchmarks/run.py -- --baseline benchmarks/baseline.json --update-baseline
+
+Every run of a benchmark gets a freshly generated scene, only the operator itself is timed.
+Exits with 1 if a benchmark got slower than the baseline by more than the tolerance.
+'''
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+
+from collections import namedtuple
+
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+
+from scene_generator import BlockParameters, generate_block, select_objects
+
+Benchmark = namedtuple('Benchmark', ['name', 'setup', 'run'])
+
+
+#region Benchmarks
+# setup(context, block, directory) prepares the scene and returns a reason if the benchmark can't run, run(context) is timed
+
+def setup_fracture_assign(context, block, directory):
+    select_objects(context, block.pieces)
+    context.scene.vrt.fractures_list_active_index = 0
+
+def run_fracture_assign(context):
+    bpy.ops.object.vrt_fracture_assign()
+
+def setup_fracture_select(context, block, directory):
+    select_objects(context, [])
+    context.scene.vrt.fractures_list_active_index = 0
+
+def run_fracture_select(context):
+    bpy.ops.object.vrt_fracture_select()
+
+def setup_section_rename(context, block, directory):
+    if len(context.scene.vrt.sections_list) == 0:
+        return "no sections"
+
+def run_section_rename(context):
+    # Renaming a section renames it on every object assigned to it
+    context.scene.vrt.sections_list[0].name = "Renamed_Section"
+
+def setup_detach_materials(context, block, directory):
+    select_objects(context, block.pieces)
+
+def run_detach_materials(context):
+    bpy.ops.object.detach_materials_cut_glass_decals()
+
+def setup_convex_hull(context, block, directory):
+    select_objects(context, block.pieces)
+
+def run_convex_hull(context):
+    bpy.ops.object.vrt_convex_hull_from_selected()
+
+def setup_relink_materials(context, block, directory):
+    if not bpy.ops.scene.vrt_relink_project_materials.poll():
+        return "asset library not set in the add-on preferences"
+    select_objects(context, block.pieces)
+
+def run_relink_materials(context):
+    bpy.ops.scene.vrt_relink_project_materials()
+
+def setup_export(context, block, directory):
+    vrt = context.scene.vrt
+    vrt.export_name = "Benchmark"
+    vrt.export_directory = directory
+    vrt.export_limit = 'VISIBLE_OBJECTS'
+    # Every run has to export, not find that nothing changed
+    vrt.use_incremental_export = False
+    vrt.use_export_profiler = False
+    vrt.use_watch_export = False
+    select_objects(context, [])
+
+def run_quick_export(context):
+    bpy.ops.scene.vrt_quick_export(export_lod=0)
+
+def run_collision_export(context):
+    bpy.ops.scene.vrt_quick_export_collisions()
+
+benchmarks = (
+    Benchmark('fracture_assign', setup_fracture_assign, run_fracture_assign),
+    Benchmark('fracture_select', setup_fracture_select, run_fracture_select),
+    Benchmark('section_rename', setup_section_rename, run_section_rename),
+    Benchmark('detach_materials', setup_detach_materials, run_detach_materials),
+    Benchmark('convex_hull', setup_convex_hull, run_convex_hull),
+    Benchmark('relink_materials', setup_relink_materials, run_relink_materials),
+    Benchmark('quick_export', setup_export, run_quick_export),
+    Benchmark('collision_export', setup_export, run_collision_export),
+)
+
+#endregion
+
+#region Run
+
+def run_benchmark(context, benchmark: Benchmark, parameters, repeat: int) -> dict:
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="vrt_benchmark_") as directory:
+        for i in range(repeat):
+            if context.mode != 'OBJECT':
+                bpy.ops.object.mode_set(mode='OBJECT')
+            block = generate_block(context, parameters)
+
+            skipped = benchmark.setup(context, block, directory)
+            if skipped:
+                return {'skipped': skipped}
+
+            start = time.perf_counter()
+            benchmark.run(context)
+            runs.append(time.perf_counter() - start)
+
+    values = sorted(runs)
+    return {
+        'runs': runs,
+        'min': values[0],
+        'median': values[len(values) // 2],
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta: float) -> list:
+    """Returns (benchmark, baseline median, median) of every benchmark which got slower than the tolerance allows.
+    Differences below min_delta seconds are noise and never count"""
+    regressions = []
+    for name, result in results['benchmarks'].items():
+        expected = baseline['benchmarks'].get(name)
+        if 'median' not in result or not expected or 'median' not in expected:
+            continue
+        if result['median'] - expected['median'] > max(expected['median'] * tolerance, min_delta):
+            regressions.append((name, expected['median'], result['median']))
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Time VRAGE Tools operators on synthetic block scenes")
+    parser.add_argument('--pieces', type=int, default=BlockParameters._field_defaults['pieces'], help="Number of fracture pieces")
+    parser.add_argument('--fractures', type=int, default=BlockParameters._field_defaults['fractures'], help="Number of fracture groups")
+    parser.add_argument('--sections', type=int, default=BlockParameters._field_defaults['sections'], help="Number of sections")
+    parser.add_argument('--polygons', type=int, default=BlockParameters._field_defaults['polygons'], help="Polygons per fracture piece")
+    parser.add_argument('--colliders', type=int, default=BlockParameters._field_defaults['colliders'], help="Colliders per collision shape")
+    parser.add_argument('--materials', type=int, default=BlockParameters._field_defaults['materials'], help="Materials per fracture piece")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5, help="Number of measured runs per benchmark")
+    parser.add_argument('--only', help="Comma separated benchmarks to run, out of: " + ", ".join(b.name for b in benchmarks))
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Compare the results with this JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed slowdown against the baseline, 0.2 = 20%%")
+    parser.add_argument('--min-delta', type=float, default=0.005, help="Slowdowns below this many seconds are ignored")
+    parser.add_argument('--update-baseline', action='store_true', help="Write the results to --baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    selected = benchmarks
+    if args.only:
+        names = {name.strip() for name in args.only.split(',') if name.strip()}
+        unknown = names - {benchmark.name for benchmark in benchmarks}
+        if unknown:
+            parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+        selected = [benchmark for benchmark in benchmarks if benchmark.name in names]
+
+    if 'vrage_tools' not in bpy.context.preferences.addons:
+        import addon_utils
+        addon_utils.enable('vrage_tools', default_set=False)
+
+    parameters = BlockParameters(args.pieces, args.fractures, args.sections, args.polygons, args.colliders, args.materials, args.seed)
+    results = {
+        'blender': bpy.app.version_string,
+        'platform': platform.platform(),
+        'parameters': parameters._asdict(),
+        'repeat': args.repeat,
+        'benchmarks': {},
+    }
+
+    context = bpy.context
+    for benchmark in selected:
+        result = run_benchmark(context, benchmark, parameters, args.repeat)
+        results['benchmarks'][benchmark.name] = result
+        if 'skipped' in result:
+            print(f"{benchmark.name:<20} skipped: {result['skipped']}")
+        else:
+            print(f"{benchmark.name:<20} min {result['min'] * 1000:9.2f} ms   median {result['median'] * 1000:9.2f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+
+    if not args.baseline:
+        return 0
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    if baseline.get('parameters') != results['parameters']:
+        print(f"The baseline was recorded with different scene parameters: {baseline.get('parameters')}")
+        return 1
+
+    regressions = compare(results, baseline, args.tolerance, args.min_delta)
+    for name, expected, actual in regressions:
+        print(f"REGRESSION {name}: median {actual * 1000:.2f} ms, baseline {expected * 1000:.2f} ms (+{(actual / max(expected, 1e-9) - 1) * 100:.0f}%)")
+    if regressions:
+        return 1
+
+    print(f"No regressions against {args.baseline}")
+    return 0
+
+#endregion
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []))
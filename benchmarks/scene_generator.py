@@ -0,0 +1,168 @@
+'''
+Generates synthetic block scenes for the benchmarks.
+
+A block consists of fracture pieces carrying the custom properties VRAGE reads (Group, SECTION and the fracture id in
+ColliderMeshGroups, group and FractureGroupName, like the fracture Assign operator writes them in the legacy storage
+mode), colliders of every rigid body collision shape assigned to fractures the same way, and faces using the materials
+the construction stages tool detaches (tmp_construction_stages_tool.py). Needs bpy, VRAGE Tools has to be registered.
+'''
+
+import bpy
+import bmesh
+import random
+
+from vrage_tools.functions.fn_fracture_groups import legacy_keys
+
+from collections import namedtuple
+from mathutils   import Matrix
+
+
+collision_shapes = ('BOX', 'SPHERE', 'CAPSULE', 'CYLINDER', 'CONE', 'CONVEX_HULL', 'MESH', 'COMPOUND')
+
+# Same names as in tmp_construction_stages_tool.py, so the detach operator has something to detach
+block_materials = (
+    "FracturedMaterial01",
+    "WindowGlass",
+    "GratingMetallic",
+    "AtlasDecal_Trims01",
+    "AtlasDecal_Parts01",
+    "AtlasDecal_Stickers01",
+    "EmissiveOff",
+    "Display01",
+    "LCDScreen_Off",
+    "WindowGlassBroken",
+    "ConveyorsAtlas",
+    # Materials which stay on the piece
+    "PaintedMetal_Colorable",
+    "Metal_Colorable",
+)
+
+BlockParameters = namedtuple('BlockParameters', ['pieces', 'fractures', 'sections', 'polygons', 'colliders', 'materials', 'seed'],
+                             defaults=(24, 4, 4, 2000, 1, len(block_materials), 0))
+
+GeneratedBlock = namedtuple('GeneratedBlock', ['pieces', 'colliders', 'materials'])
+
+
+def clear_scene(context):
+    """Removes all objects, meshes and materials, and the VRT lists of the scene"""
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+    for material in list(bpy.data.materials):
+        bpy.data.materials.remove(material)
+
+    scene = context.scene
+    scene.vrt.fractures_list.clear()
+    scene.vrt.sections_list.clear()
+    if scene.rigidbody_world is None:
+        with context.temp_override(scene=scene):
+            bpy.ops.rigidbody.world_add()
+
+
+def get_materials(count: int) -> list:
+    materials = []
+    for name in block_materials[:count]:
+        material = bpy.data.materials.get(name) or bpy.data.materials.new(name)
+        materials.append(material)
+    return materials
+
+
+def create_grid_mesh(name: str, polygons: int, materials: list, rng: random.Random):
+    """A displaced grid with about `polygons` faces, material indices spread over all materials"""
+    segments = max(1, int(polygons ** 0.5))
+
+    bm = bmesh.new()
+    bmesh.ops.create_grid(bm, x_segments=segments, y_segments=segments, size=1.0)
+    for vert in bm.verts:
+        vert.co.z = rng.uniform(-0.05, 0.05)
+    if materials:
+        for index, face in enumerate(bm.faces):
+            face.material_index = index % len(materials)
+
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+
+    for material in materials:
+        mesh.materials.append(material)
+    return mesh
+
+
+def create_box_mesh(name: str, offset=(0.0, 0.0, 0.0)):
+    bm = bmesh.new()
+    bmesh.ops.create_cube(bm, size=1.0, matrix=Matrix.Translation(offset))
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+
+def add_rigid_body(context, obj, shape: str):
+    with context.temp_override(object=obj, active_object=obj, selected_objects=[obj], selected_editable_objects=[obj]):
+        bpy.ops.rigidbody.object_add()
+    obj.rigid_body.type = 'PASSIVE'
+    obj.rigid_body.collision_shape = shape
+
+
+def generate_block(context, parameters: BlockParameters = BlockParameters()) -> GeneratedBlock:
+    """Replaces the scene's content with a synthetic block"""
+    rng = random.Random(parameters.seed)
+    scene = context.scene
+    collection = scene.collection
+
+    clear_scene(context)
+    materials = get_materials(parameters.materials)
+
+    for index in range(parameters.fractures):
+        fracture = scene.vrt.fractures_list.add()
+        fracture.name = f"Fracture {index + 1}"
+        fracture.group_id = f"fracture_{index + 1:02d}"
+    for index in range(parameters.sections):
+        section = scene.vrt.sections_list.add()
+        section.name = f"Section_{index + 1:02d}"
+
+    pieces = []
+    for index in range(parameters.pieces):
+        group = index % parameters.fractures + 1 if parameters.fractures else 0
+        mesh = create_grid_mesh(f"Fracture_{group:02d}_{index:03d}", parameters.polygons, materials, rng)
+        obj = bpy.data.objects.new(mesh.name, mesh)
+        obj.location = (index % 8 * 2.5, index // 8 * 2.5, 0.0)
+        collection.objects.link(obj)
+
+        if group:
+            obj['Group'] = f"Fracture_{group:02d}"
+            for key in legacy_keys:
+                obj[key] = f"fracture_{group:02d}"
+        if parameters.sections:
+            obj['SECTION'] = f"Section_{index % parameters.sections + 1:02d}"
+        pieces.append(obj)
+
+    colliders = []
+    for index in range(parameters.colliders):
+        for shape in collision_shapes:
+            offset = (rng.uniform(-0.5, 0.5), rng.uniform(-0.5, 0.5), 0.0)
+            mesh = create_box_mesh(f"Collision_{shape.lower()}_{index:02d}", offset)
+            obj = bpy.data.objects.new(mesh.name, mesh)
+            obj.location = (rng.uniform(0.0, 20.0), rng.uniform(0.0, 20.0), 1.0)
+            # Scaled and with the origin away from the geometry, like hand made colliders often are
+            obj.scale = (rng.uniform(0.5, 2.0), rng.uniform(0.5, 2.0), rng.uniform(0.5, 2.0))
+            collection.objects.link(obj)
+            add_rigid_body(context, obj, shape)
+
+            if parameters.fractures:
+                for key in legacy_keys:
+                    obj[key] = f"fracture_{rng.randrange(parameters.fractures) + 1:02d}"
+            colliders.append(obj)
+
+    context.view_layer.update()
+    return GeneratedBlock(pieces, colliders, materials)
+
+
+def select_objects(context, objs, active=None):
+    view_layer = context.view_layer
+    for obj in view_layer.objects:
+        obj.select_set(False)
+    for obj in objs:
+        obj.select_set(True)
+    view_layer.objects.active = active or (objs[0] if objs else None)
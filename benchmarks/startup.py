@@ -0,0 +1,77 @@
+'''
+Measures how long it takes to import and register VRAGE Tools.
+
+Run it with Blender from the repository root:
+
+    blender -b --factory-startup --python benchmarks/startup.py -- --repeat 5 --output startup.json
+'''
+
+import os
+import sys
+import json
+import time
+import argparse
+
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules which are expensive to load and should only be loaded when a feature needs them
+heavy_modules = (
+    'numpy',
+    'gpu',
+    'gpu_extras',
+    'io_scene_gltf2',
+    'vrage_tools.utilities.easybpy',
+    'vrage_tools.utilities.MSFT_Physics',
+)
+
+
+def purge_modules():
+    for name in [name for name in sys.modules if name == 'vrage_tools' or name.startswith('vrage_tools.')]:
+        del sys.modules[name]
+
+
+def measure():
+    loaded_before = set(sys.modules)
+
+    start = time.perf_counter()
+    import vrage_tools
+    imported = time.perf_counter()
+    vrage_tools.register()
+    registered = time.perf_counter()
+
+    loaded = set(sys.modules) - loaded_before
+    vrage_tools.unregister()
+    purge_modules()
+
+    return {
+        'import': imported - start,
+        'register': registered - imported,
+        'total': registered - start,
+        'heavy_modules': sorted(name for name in heavy_modules if name in loaded),
+        'modules_loaded': len(loaded),
+    }
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Measure import and register time of VRAGE Tools")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of measured runs")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, root)
+
+    runs = [measure() for i in range(args.repeat)]
+
+    for key in ('import', 'register', 'total'):
+        values = sorted(run[key] for run in runs)
+        print(f"{key:<10} min {values[0] * 1000:8.2f} ms   median {values[len(values) // 2] * 1000:8.2f} ms")
+    print(f"heavy modules loaded: {', '.join(runs[0]['heavy_modules']) or 'none'}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'runs': runs}, f, indent=4)
+
+
+if __name__ == '__main__':
+    main(sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else [])
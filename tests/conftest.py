@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The bpy-free helpers are imported from the vrage_tools package, without Blender
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
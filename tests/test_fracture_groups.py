@@ -0,0 +1,88 @@
+'''
+Tests of the fracture storage helpers (fn_fracture_groups.py). Objects are stood in for by dicts, the custom
+properties, with the vrt property group as an attribute. Run with plain Python:
+
+    python -m pytest tests
+'''
+
+from types import SimpleNamespace
+
+from vrage_tools.functions.fn_fracture_groups import (
+    legacy_keys,
+    expanded_fracture_groups,
+    migrate_to_canonical,
+    migrate_to_legacy,
+)
+
+
+class FakeObject(dict):
+    def __init__(self, fracture_group="", **properties):
+        super().__init__(properties)
+        self.vrt = SimpleNamespace(fracture_group=fracture_group)
+
+def make_scene(storage='CANONICAL', group_ids=("fracture_01",)):
+    fractures_list = [SimpleNamespace(group_id=group_id) for group_id in group_ids]
+    return SimpleNamespace(vrt=SimpleNamespace(fracture_storage=storage, fractures_list=fractures_list))
+
+
+#region Export
+
+def test_expanded_fracture_groups_writes_all_keys():
+    obj = FakeObject("fracture_01")
+    with expanded_fracture_groups(make_scene(), [obj]):
+        assert {key: obj[key] for key in legacy_keys} == dict.fromkeys(legacy_keys, "fracture_01")
+    assert obj == {}
+
+def test_expanded_fracture_groups_keeps_collider_links():
+    collider = FakeObject("fracture_01", ColliderMeshGroups="Piece|Piece.001", group="Piece")
+    with expanded_fracture_groups(make_scene(), [collider]):
+        assert collider['ColliderMeshGroups'] == "Piece|Piece.001"
+        assert collider['group'] == "Piece"
+        assert collider['FractureGroupName'] == "fracture_01"
+    assert collider == {'ColliderMeshGroups': "Piece|Piece.001", 'group': "Piece"}
+
+def test_expanded_fracture_groups_replaces_stale_fracture_ids():
+    obj = FakeObject("fracture_01", group="fracture_02")
+    with expanded_fracture_groups(make_scene(), [obj]):
+        assert obj['group'] == "fracture_01"
+    assert obj == {'group': "fracture_02"}
+
+def test_expanded_fracture_groups_legacy_storage():
+    obj = FakeObject("fracture_01", group="Piece")
+    with expanded_fracture_groups(make_scene('LEGACY'), [obj]):
+        assert obj == {'group': "Piece"}
+
+#endregion
+
+#region Migration
+
+def test_migrate_to_canonical_keeps_collider_links():
+    collider = FakeObject(ColliderMeshGroups="Piece", group="Piece", FractureGroupName="fracture_01")
+    assert migrate_to_canonical([collider], {"fracture_01"}) == 1
+    assert collider.vrt.fracture_group == "fracture_01"
+    assert collider == {'ColliderMeshGroups': "Piece", 'group': "Piece"}
+
+def test_migrate_to_canonical_removes_stale_fracture_ids():
+    obj = FakeObject(ColliderMeshGroups="fracture_01", group="fracture_02")
+    assert migrate_to_canonical([obj], {"fracture_01", "fracture_02"}) == 1
+    assert obj.vrt.fracture_group == "fracture_01"
+    assert obj == {}
+
+def test_migrate_to_legacy_keeps_collider_links():
+    collider = FakeObject("fracture_01", group="Piece")
+    assert migrate_to_legacy([collider], {"fracture_01"}) == 1
+    assert collider.vrt.fracture_group == ""
+    assert collider == {'group': "Piece", 'ColliderMeshGroups': "fracture_01", 'FractureGroupName': "fracture_01"}
+
+def test_migration_round_trip():
+    objs = [
+        FakeObject(**dict.fromkeys(legacy_keys, "fracture_01")),
+        FakeObject(ColliderMeshGroups="Piece", group="Piece", FractureGroupName="fracture_01"),
+        FakeObject(group="Piece"),
+    ]
+    before = [dict(obj) for obj in objs]
+    assert migrate_to_canonical(objs, {"fracture_01"}) == 2
+    assert migrate_to_legacy(objs, {"fracture_01"}) == 2
+    assert [dict(obj) for obj in objs] == before
+
+#endregion
@@ -0,0 +1,120 @@
+'''
+Tests of the vertex cache optimization (fn_mesh_optimize.py). Run with plain Python:
+
+    python -m pytest tests
+'''
+
+import numpy as np
+import pytest
+
+from vrage_tools.functions.fn_mesh_optimize import (
+    get_weld_targets,
+    get_gpu_vertices,
+    tipsify,
+    get_first_use_order,
+    get_acmr,
+    optimize_order,
+)
+
+
+def make_grid(size: int):
+    """Triangles of a size x size grid of quads, vertex indices row by row"""
+    triangles = []
+    for y in range(size):
+        for x in range(size):
+            a = y * (size + 1) + x
+            b, c, d = a + 1, a + size + 1, a + size + 2
+            triangles += [(a, b, d), (a, d, c)]
+    return np.array(triangles, dtype=np.int64), (size + 1) ** 2
+
+
+#region Welding
+
+def split_quad():
+    """Two triangles of a quad with their shared edge split: vertices 3 and 4 duplicate 0 and 2"""
+    positions = np.array([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 0, 0), (1, 1, 0), (0, 1, 0)], dtype='f4')
+    corner_vertices = np.array([0, 1, 2, 3, 4, 5])
+    normals = np.tile(np.array([(0, 0, 1)], dtype='f4'), (6, 1))
+    return positions, corner_vertices, normals
+
+def test_weld_identical_vertices():
+    positions, corner_vertices, normals = split_quad()
+    assert get_weld_targets(positions, corner_vertices, normals).tolist() == [0, 1, 2, 0, 2, 5]
+
+def test_weld_keeps_hard_edges():
+    positions, corner_vertices, normals = split_quad()
+    normals[3:] = (0, 1, 0)
+    assert get_weld_targets(positions, corner_vertices, normals).tolist() == [0, 1, 2, 3, 4, 5]
+
+def test_weld_keeps_different_weights():
+    positions, corner_vertices, normals = split_quad()
+    weights = np.array([(1, 0), (1, 0), (1, 0), (0, 1), (1, 0), (0, 1)], dtype='f4')
+    # Vertex 3 is deformed by another bone than vertex 0, vertex 4 by the same as vertex 2
+    assert get_weld_targets(positions, corner_vertices, normals, [weights]).tolist() == [0, 1, 2, 3, 2, 5]
+
+def test_weld_keeps_different_point_attributes():
+    positions, corner_vertices, normals = split_quad()
+    colors = np.array([0.0, 0.0, 0.5, 1.0, 0.5, 0.0])
+    assert get_weld_targets(positions, corner_vertices, normals, [colors]).tolist() == [0, 1, 2, 3, 2, 5]
+
+def test_weld_ignores_loose_vertices():
+    positions, corner_vertices, normals = split_quad()
+    positions = np.vstack((positions, positions[:1]))
+    assert get_weld_targets(positions, corner_vertices, normals).tolist() == [0, 1, 2, 0, 2, 5, 6]
+
+def test_gpu_vertices():
+    corner_vertices = np.array([0, 1, 2, 0, 2, 3])
+    normals = np.array([(0, 0, 1)] * 3 + [(0, 1, 0)] * 3, dtype='f4')
+    gpu_vertices, count = get_gpu_vertices(corner_vertices, [normals])
+    # Vertices 0 and 2 are used with two normals
+    assert count == 6
+    assert len(set(gpu_vertices.tolist())) == 6
+
+#endregion
+
+#region Ordering
+
+def test_acmr():
+    assert get_acmr(np.zeros((0, 3), dtype=np.int64)) == 0.0
+    assert get_acmr(np.array([(0, 1, 2)])) == 3.0
+    assert get_acmr(np.array([(0, 1, 2), (0, 2, 3)])) == 2.0
+    # Vertices 0 to 2 were evicted by the time the last triangle uses them again
+    assert get_acmr(np.array([(0, 1, 2), (3, 4, 5), (0, 1, 2)]), size=3) == 3.0
+    assert get_acmr(np.array([(0, 1, 2), (3, 4, 5), (0, 1, 2)]), size=6) == 2.0
+
+def test_tipsify_is_a_permutation():
+    triangles, vertex_count = make_grid(8)
+    order = tipsify(triangles, vertex_count)
+    assert sorted(order.tolist()) == list(range(len(triangles)))
+    assert len(tipsify(np.zeros((0, 3), dtype=np.int64), 0)) == 0
+
+@pytest.mark.parametrize('size', [4, 16, 32])
+def test_tipsify_reduces_cache_misses(size):
+    triangles, vertex_count = make_grid(size)
+    shuffled = triangles[np.random.default_rng(0).permutation(len(triangles))]
+
+    order = tipsify(shuffled, vertex_count)
+    assert get_acmr(shuffled[order]) < get_acmr(shuffled)
+    # A grid can't go below 0.5 misses per triangle, Tipsify gets well under 1
+    assert get_acmr(shuffled[order]) < 1.0
+
+def test_first_use_order():
+    triangles = np.array([(3, 1, 4), (1, 5, 3)])
+    assert get_first_use_order(triangles, 7).tolist() == [3, 1, 4, 5, 0, 2, 6]
+
+def test_optimize_order():
+    triangles, vertex_count = make_grid(8)
+    shuffled = triangles[np.random.default_rng(1).permutation(len(triangles))]
+
+    triangle_order, vertex_order, before, after = optimize_order(shuffled, shuffled, vertex_count, vertex_count)
+    assert after < before
+    assert sorted(vertex_order.tolist()) == list(range(vertex_count))
+
+    # Vertices are numbered in the order the reordered triangles first use them
+    rank = np.empty(vertex_count, dtype=np.int64)
+    rank[vertex_order] = np.arange(vertex_count)
+    first = rank[shuffled[triangle_order]].ravel()
+    assert first[0] == 0
+    assert np.all(np.maximum.accumulate(first) <= np.arange(len(first)))
+
+#endregion
@@ -0,0 +1,134 @@
+'''
+Tests of the bpy-free naming and export path helpers (fn_names.py, fn_export_paths.py). Run with plain Python:
+
+    python -m pytest tests
+'''
+
+import pytest
+
+from vrage_tools.functions import fn_names, fn_export_paths
+
+
+#region Duplicate suffix
+
+@pytest.mark.parametrize('name, expected', [
+    ("Collision", ("Collision", 0)),
+    ("Collision.002", ("Collision", 2)),
+    ("Collision.1000", ("Collision", 1000)),
+    ("Fracture_01_Cut.017", ("Fracture_01_Cut", 17)),
+    # Not a Blender duplicate suffix
+    ("Collision.02", ("Collision.02", 0)),
+    ("Collision.abc", ("Collision.abc", 0)),
+    ("Collision_001", ("Collision_001", 0)),
+])
+def test_split_duplicate_suffix(name, expected):
+    assert fn_names.split_duplicate_suffix(name) == expected
+    assert fn_names.get_base_name(name) == expected[0]
+    assert fn_names.has_duplicate_suffix(name) == (expected[0] != name)
+
+def test_matches_base_name():
+    assert fn_names.matches_base_name("Collision", "Collision")
+    assert fn_names.matches_base_name("Collision.003", "Collision")
+    assert not fn_names.matches_base_name("Collision_01", "Collision")
+
+#endregion
+
+#region Fracture groups
+
+@pytest.mark.parametrize('name, expected', [
+    ("Fracture_01", "Fracture_01"),
+    ("Fracture_12_Hide.001", "Fracture_12"),
+    ("Fracture_", None),
+    ("Detail_Fracture_01", None),
+    ("fracture_01", None),
+])
+def test_get_fracture_prefix(name, expected):
+    assert fn_names.get_fracture_prefix(name) == expected
+    assert fn_names.is_fracture_group(name) == (expected is not None)
+
+def test_get_fracture_group():
+    assert fn_names.get_fracture_group("Fracture_03_Cut") == "Fracture_03"
+    assert fn_names.get_fracture_group("Fracture_03_Cut", "Support") == "Fracture_03_Support"
+    assert fn_names.get_fracture_group("Collision", "Support") is None
+
+@pytest.mark.parametrize('group_id, expected', [
+    ("fracture_01", 1),
+    ("fracture_07", 7),
+    ("fracture_15", 15),
+    ("fracture_16", None),
+    ("Fracture_01", None),
+    ("fracture_01_Cut", None),
+    (None, None),
+])
+def test_get_fracture_id_number(group_id, expected):
+    assert fn_names.get_fracture_id_number(group_id) == expected
+
+def test_get_fracture_id():
+    assert fn_names.get_fracture_id(3) == "fracture_03"
+    assert fn_names.get_fracture_id_number(fn_names.get_fracture_id(12)) == 12
+
+def test_parse_name():
+    model = fn_names.parse_name("Fracture_02_Cut.004")
+    assert model == fn_names.NameModel("Fracture_02_Cut.004", "Fracture_02_Cut", 4, "Fracture_02", "Cut")
+    assert fn_names.parse_name("Fracture_02").role == ""
+    assert fn_names.parse_name("Collision").fracture_prefix is None
+
+#endregion
+
+#region ColliderMeshGroups
+
+def test_join_and_split_groups():
+    groups = ["Fracture_02", "Fracture_01", "Collision"]
+    assert fn_names.join_groups(groups) == "Fracture_02|Fracture_01|Collision"
+    assert fn_names.split_groups(fn_names.join_groups(groups)) == tuple(groups)
+    assert fn_names.split_groups("||Fracture_01|") == ("Fracture_01",)
+    assert fn_names.split_groups("") == ()
+
+def test_get_collider_mesh_groups():
+    assert fn_names.get_collider_mesh_groups(["Fracture_02", "Fracture_01", "Fracture_02"]) == "Fracture_01|Fracture_02"
+    assert fn_names.get_collider_mesh_groups([]) == ""
+
+def test_get_unique_base_names():
+    assert fn_names.get_unique_base_names(["A.001", "B"]) == ["A", "B"]
+    assert fn_names.get_unique_base_names(["A.001", "A.002"]) is None
+
+#endregion
+
+#region Export paths
+
+@pytest.mark.parametrize('name, expected', [
+    ("LOD1", 1),
+    ("LOD0", 0),
+    ("Block_LOD2.001", 2),
+    ("Block_LOD2_Glass", None),
+    ("XLOD3", None),
+    ("Collection", None),
+])
+def test_get_lod(name, expected):
+    assert fn_names.get_lod(name) == expected
+
+@pytest.mark.parametrize('lod, expected', [(0, ""), (1, "_LOD1"), (4, "_LOD4")])
+def test_get_export_lod_suffix(lod, expected):
+    assert fn_export_paths.get_export_lod_suffix(lod) == expected
+
+@pytest.mark.parametrize('variant, lod, collision, expected', [
+    ('NON_FRACTURED', 0, False, "Block"),
+    ('FRACTURED', 2, False, "Block_Fractured_LOD2"),
+    ('DEFORMED', 1, False, "Block_Deformed_LOD1"),
+    ('NON_FRACTURED', 3, True, "Block_collision"),
+    ('FRACTURED', 0, True, "Block_Fractured_collision"),
+])
+def test_get_export_filename(variant, lod, collision, expected):
+    assert fn_export_paths.get_export_filename("Block", variant, lod, collision) == expected
+
+def test_get_export_filepath(tmp_path):
+    path = fn_export_paths.get_export_filepath(str(tmp_path), "Block", 'FRACTURED', 1, create_dirs=False)
+    assert path == str(tmp_path / "Fractured" / "Block_Fractured_LOD1")
+    assert not (tmp_path / "Fractured").exists()
+
+    fn_export_paths.get_export_filepath(str(tmp_path), "Block", 'FRACTURED', 1)
+    assert (tmp_path / "Fractured").is_dir()
+
+    assert fn_export_paths.get_export_filepath(str(tmp_path), "Block", 'NONE') == str(tmp_path / "Block")
+
+#endregion
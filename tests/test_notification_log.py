@@ -0,0 +1,55 @@
+'''
+Tests of the notification log (notification_log.py). Run with plain Python:
+
+    python -m pytest tests
+'''
+
+from vrage_tools.utilities.notification_log import (
+    NotificationLog,
+    make_record,
+    make_deletion_record,
+    make_clear_record,
+    read_records,
+)
+
+
+def write_records(path, codes) -> list:
+    log = NotificationLog(str(path))
+    records = [make_record('INFO', code, f"Text of {code}") for code in codes]
+    for record in records:
+        log.write(record)
+    return records
+
+
+def test_read_records(tmp_path):
+    path = tmp_path / "Block.vrt-log.jsonl"
+    write_records(path, ["I001", "I002", "I003"])
+
+    assert [record['code'] for record in read_records(str(path))] == ["I001", "I002", "I003"]
+    assert [record['code'] for record in read_records(str(path), 2)] == ["I002", "I003"]
+    assert read_records(str(path), 0) == []
+    assert read_records(str(tmp_path / "missing.jsonl")) == []
+
+def test_deleted_records_stay_deleted(tmp_path):
+    path = tmp_path / "Block.vrt-log.jsonl"
+    records = write_records(path, ["I001", "I002", "I003"])
+    NotificationLog(str(path)).write(make_deletion_record([records[1]['id']]))
+
+    assert [record['code'] for record in read_records(str(path))] == ["I001", "I003"]
+    # The deleted record doesn't take one of the places of the latest records
+    assert [record['code'] for record in read_records(str(path), 2)] == ["I001", "I003"]
+
+def test_cleared_records_stay_cleared(tmp_path):
+    path = tmp_path / "Block.vrt-log.jsonl"
+    write_records(path, ["I001", "I002"])
+    NotificationLog(str(path)).write(make_clear_record())
+    write_records(path, ["I003"])
+
+    assert [record['code'] for record in read_records(str(path))] == ["I003"]
+
+def test_records_without_id(tmp_path):
+    # Logs written before records had ids
+    path = tmp_path / "Block.vrt-log.jsonl"
+    path.write_text('{"type": "INFO", "code": "I001"}\n{"type": "INFO", "code": "I001"}\n{"type": "INFO", "code": "I002"', encoding='utf-8')
+
+    assert [record['code'] for record in read_records(str(path))] == ["I001", "I001"]
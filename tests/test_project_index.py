@@ -0,0 +1,70 @@
+'''
+Tests of the project index (project_index.py) against a small project on disk. Run with plain Python:
+
+    python -m pytest tests
+'''
+
+import os
+import json
+
+from vrage_tools.functions.fn_export_paths import manifest_name
+from vrage_tools.utilities.project_index import ProjectIndex, normalize_path
+
+
+def write_project(directory, source_name: str, output_name: str):
+    """A source and one output recorded in the manifest next to it, exported after the source was saved"""
+    source = os.path.join(directory, source_name)
+    output = os.path.join(directory, output_name)
+    with open(source, 'wb') as f:
+        f.write(b"BLENDER")
+    with open(output, 'wb') as f:
+        f.write(b"FBX")
+    os.utime(source, ns=(1_000_000_000, 1_000_000_000))
+    os.utime(output, ns=(2_000_000_000, 2_000_000_000))
+
+    manifest = {
+        output_name: {
+            'hash': "0",
+            'size': 3,
+            'mtime_ns': os.stat(output).st_mtime_ns,
+            'source': os.path.normpath(source),
+            'source_mtime_ns': os.stat(source).st_mtime_ns,
+            'libraries': [],
+            'libraries_mtime_ns': None,
+        }
+    }
+    with open(os.path.join(directory, manifest_name), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    return source, output
+
+def scan(directory) -> ProjectIndex:
+    index = ProjectIndex([str(directory)], cache_path=os.path.join(str(directory), "index.json"))
+    index.scan(incremental=False)
+    return index
+
+
+def test_up_to_date_output(tmp_path):
+    source, output = write_project(str(tmp_path), "Wall.blend", "Wall.fbx")
+    index = scan(tmp_path)
+
+    assert index.get_stale_outputs() == []
+    assert index.get_unindexed_sources() == []
+    assert {source: list(outputs) for source, outputs in index.graph.items()} == {normalize_path(source): [normalize_path(output)]}
+
+def test_source_changed(tmp_path):
+    source, output = write_project(str(tmp_path), "Wall.blend", "Wall.fbx")
+    os.utime(source, ns=(3_000_000_000, 3_000_000_000))
+
+    stale = scan(tmp_path).get_stale_outputs()
+    assert [(entry.path, entry.reason) for entry in stale] == [(normalize_path(output), "source changed")]
+
+def test_scanned_sources_match_manifest_sources_on_case_insensitive_systems(tmp_path, monkeypatch):
+    # Windows normcase lowercases, the directories are lowercase so they still exist here
+    directory = tmp_path / "blocks"
+    directory.mkdir()
+    write_project(str(directory), "Wall.blend", "Wall.fbx")
+    monkeypatch.setattr(os.path, 'normcase', str.lower)
+
+    index = scan(directory)
+    assert index.get_unindexed_sources() == []
+    assert list(index.graph) == [normalize_path(os.path.join(str(directory), "Wall.blend"))]
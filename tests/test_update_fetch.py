@@ -0,0 +1,138 @@
+'''
+Tests of the background requests of the update check (update_fetch.py) against a local stand-in of the
+GitHub releases API. Run with plain Python:
+
+    python -m pytest tests
+'''
+
+import json
+import time
+import socket
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vrage_tools.utilities.update_fetch import fetch_releases, start_update_check, take_update_result
+
+
+releases = [{'tag_name': "v1.2.0", 'draft': False, 'prerelease': False}]
+etag = '"releases-1"'
+
+
+class ReleasesHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith('/slow'):
+            time.sleep(0.5)
+        if self.path.startswith('/limited'):
+            self.send_response(403)
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        body = json.dumps(releases if not self.path.startswith('/slow') else []).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReleasesServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients which timed out close the connection before the slow response is written
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ReleasesServer(('127.0.0.1', 0), ReleasesHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def wait_for_result(thread):
+    thread.join(timeout=5)
+    return take_update_result()
+
+
+#region Requests
+
+def test_fetch_releases(server_url):
+    result = fetch_releases(f"{server_url}/releases")
+    assert result == {'status': 200, 'etag': etag, 'releases': releases}
+
+def test_fetch_releases_not_modified(server_url):
+    result = fetch_releases(f"{server_url}/releases", etag)
+    assert result['status'] == 304
+    assert result['etag'] == etag
+    assert result['releases'] is None
+
+def test_fetch_releases_rate_limited(server_url):
+    result = fetch_releases(f"{server_url}/limited", etag)
+    assert result == {'status': 403, 'etag': etag, 'releases': None}
+
+def test_fetch_releases_timeout(server_url):
+    start = time.perf_counter()
+    result = fetch_releases(f"{server_url}/slow", timeout=0.1)
+    assert result['status'] is None
+    assert result['error']
+    assert time.perf_counter() - start < 0.45
+
+def test_fetch_releases_offline():
+    # A port nothing listens on
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    result = fetch_releases(f"http://127.0.0.1:{port}/releases", etag, timeout=1.0)
+    assert result['status'] is None
+    assert result['etag'] == etag
+    assert result['error']
+
+#endregion
+
+#region Background thread
+
+def test_update_check_runs_in_background(server_url):
+    thread = start_update_check(f"{server_url}/releases")
+    assert thread.daemon
+    assert wait_for_result(thread) == {'status': 200, 'etag': etag, 'releases': releases}
+    # Every result is taken once
+    assert take_update_result() is None
+
+def test_update_result_not_available_yet(server_url):
+    thread = start_update_check(f"{server_url}/slow")
+    assert take_update_result() is None
+    assert wait_for_result(thread)['status'] == 200
+
+def test_queued_result_of_earlier_check_is_dropped(server_url):
+    earlier = start_update_check(f"{server_url}/releases")
+    earlier.join(timeout=5)
+
+    latest = start_update_check(f"{server_url}/slow")
+    assert take_update_result() is None
+    assert wait_for_result(latest) == {'status': 200, 'etag': etag, 'releases': []}
+
+def test_running_earlier_check_is_dropped(server_url):
+    earlier = start_update_check(f"{server_url}/slow")
+    latest = start_update_check(f"{server_url}/releases")
+
+    assert wait_for_result(latest) == {'status': 200, 'etag': etag, 'releases': releases}
+    # The earlier check finishes later, its result mustn't replace the latest one
+    assert wait_for_result(earlier) is None
+
+#endregion
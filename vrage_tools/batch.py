@@ -0,0 +1,238 @@
+'''
+Headless export of every variant and LOD of a block, described by a JSON job file.
+
+    blender -b Block.blend --python-expr "import vrage_tools.batch; vrage_tools.batch.main()" -- --job job.json
+
+Other pipeline steps can run before the export with --steps clean_names,relink_materials,export. To process many
+files in parallel, use utilities/batch_runner.py which starts this entry point once per file.
+
+The same job can be run from inside Blender with the "Batch Export" operator (scene.vrt_batch_export).
+
+Job file:
+
+    {
+        "name": "CargoContainer",                   # defaults to the scene's export name
+        "directory": "//Export",                    # defaults to the scene's export directory, // is relative to the .blend
+        "view_layer": "ViewLayer",                  # optional default view layer for all sources
+        "variants": [
+            {
+                "variant": "NON_FRACTURED",         # NON_FRACTURED, FRACTURED, DEFORMED or NONE
+                "lods": ["LOD0", "LOD1", {"collection": "LOD2", "view_layer": "Simple"}],
+                "collision": {"collection": "Collisions"}
+            },
+            {
+                "variant": "FRACTURED",
+                "lods": {"0": {"view_layer": "Fractured"}}
+            }
+        ]
+    }
+
+A source is either the name of a collection or an object with a "collection" and/or a "view_layer".
+A collection exports everything inside it, a view layer alone exports all objects visible in it.
+LODs given as a list are numbered from 0.
+'''
+
+import os
+import sys
+import json
+import time
+import argparse
+import traceback
+
+import bpy
+
+from contextlib import contextmanager
+
+from .functions.fn_export_job import BatchExportError, load_job
+from .functions.fn_operators import (
+    clean_names,
+    get_export_filepath,
+    get_export_objects,
+    export_fbx_quick,
+    export_collisions,
+)
+
+
+steps = ('clean_names', 'relink_materials', 'export')
+
+
+#region Export
+
+def find_layer_collection(layer_collection, name: str):
+    if layer_collection.collection.name == name:
+        return layer_collection
+    for child in layer_collection.children:
+        found = find_layer_collection(child, name)
+        if found is not None:
+            return found
+    return None
+
+
+@contextmanager
+def export_source(context, source: dict):
+    """Makes the source's view layer the context view layer and its collection the active one.
+    Yields the export limit to use"""
+    scene = context.scene
+
+    view_layer = context.view_layer
+    if source['view_layer']:
+        view_layer = scene.view_layers.get(source['view_layer'])
+        if view_layer is None:
+            raise BatchExportError(f"View layer '{source['view_layer']}' not found in scene '{scene.name}'")
+
+    layer_collection = None
+    if source['collection']:
+        layer_collection = find_layer_collection(view_layer.layer_collection, source['collection'])
+        if layer_collection is None:
+            raise BatchExportError(f"Collection '{source['collection']}' not found in view layer '{view_layer.name}'")
+
+    window = context.window
+    previous_view_layer = window.view_layer if window else None
+    previous_active = view_layer.active_layer_collection
+    try:
+        # The exporters read the view layer from the window if there is one
+        if window:
+            window.view_layer = view_layer
+        if layer_collection is not None:
+            view_layer.active_layer_collection = layer_collection
+
+        with context.temp_override(view_layer=view_layer):
+            yield 'ACTIVE_COLLECTION' if layer_collection is not None else 'VISIBLE_OBJECTS'
+    finally:
+        view_layer.active_layer_collection = previous_active
+        if window:
+            window.view_layer = previous_view_layer
+
+
+def run_job(context, job: dict, log=print, force: bool = False) -> dict:
+    """Exports everything described by a validated job. Returns the paths of the written and of the skipped,
+    unchanged files"""
+    scene = context.scene
+    name = job['name'] or scene.vrt.export_name
+    directory = bpy.path.abspath(job['directory'] or scene.vrt.export_directory)
+
+    if not name:
+        raise BatchExportError("Model name not set in the job or the scene")
+    if not directory or not os.path.isdir(directory):
+        raise BatchExportError(f"Export directory '{directory}' is not valid")
+
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    result = {'written': [], 'skipped': []}
+    for entry in job['variants']:
+        variant = entry['variant']
+
+        for lod, source in entry['lods']:
+            filepath = f"{get_export_filepath(directory, name, variant, lod)}.fbx"
+            with export_source(context, source) as limit:
+                if not get_export_objects(bpy.context, limit):
+                    raise BatchExportError(f"Nothing to export for LOD {lod} of variant '{variant}'")
+                written = export_fbx_quick(filepath, limit, force)
+            result['written' if written else 'skipped'].append(filepath)
+            log(f"{'Exported' if written else 'Unchanged'} {filepath}")
+
+        if entry['collision'] is not None:
+            filepath = get_export_filepath(directory, name, variant, collision=True)
+            with export_source(context, entry['collision']) as limit:
+                if not get_export_objects(bpy.context, limit):
+                    raise BatchExportError(f"Nothing to export for collisions of variant '{variant}'")
+                written = export_collisions(bpy.context, filepath, limit, force)
+            result['written' if written else 'skipped'].append(f"{filepath}.gltf")
+            log(f"{'Exported' if written else 'Unchanged'} {filepath}.gltf")
+
+    log(f"{len(result['written'])} file(s) written, {len(result['skipped'])} unchanged file(s) skipped")
+    return result
+
+#endregion
+
+#region Command line
+
+def run_steps(context, step_names: list, job: dict = None, force: bool = False) -> dict:
+    """Runs the pipeline steps in order. Returns the duration of every step, the exported and the skipped files"""
+    result = {'steps': {}, 'exported': [], 'skipped': []}
+
+    for step in step_names:
+        start = time.perf_counter()
+        match step:
+            case 'clean_names':
+                clean_names(list(context.scene.objects))
+            case 'relink_materials':
+                if not bpy.ops.scene.vrt_relink_project_materials.poll():
+                    raise BatchExportError("Asset library not set in add-on preferences")
+                bpy.ops.scene.vrt_relink_project_materials()
+            case 'export':
+                exported = run_job(context, job, force=force)
+                result['exported'] = exported['written']
+                result['skipped'] = exported['skipped']
+        result['steps'][step] = time.perf_counter() - start
+
+    return result
+
+
+def write_result(filepath: str, result: dict):
+    if not filepath:
+        return
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=4)
+
+
+def main(argv: list = None):
+    """Entry point for `blender -b`. Arguments are read after `--`. Exits with 1 if the job fails"""
+    if argv is None:
+        argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+    parser = argparse.ArgumentParser(prog="vrage_tools.batch", description="Export all variants and LODs of a block")
+    parser.add_argument('--job', help="Path of the JSON job file, required by the export step")
+    parser.add_argument('--name', help="Override the block name of the job")
+    parser.add_argument('--directory', help="Override the export directory of the job")
+    parser.add_argument('--steps', default='export', help=f"Comma separated steps to run, out of: {', '.join(steps)}")
+    parser.add_argument('--force', action='store_true', help="Export all files, even if they haven't changed")
+    parser.add_argument('--profile', action='store_true', help="Write a Chrome trace next to every exported file")
+    parser.add_argument('--save', action='store_true', help="Save the .blend file after all steps succeeded")
+    parser.add_argument('--result', help="Write the durations, exported files and errors to this JSON file")
+    args = parser.parse_args(argv)
+
+    step_names = [step.strip() for step in args.steps.split(',') if step.strip()]
+    for step in step_names:
+        if step not in steps:
+            parser.error(f"unknown step '{step}'")
+    if 'export' in step_names and not args.job:
+        parser.error("the export step needs --job")
+
+    # The add-on may not be enabled when Blender runs with --factory-startup
+    if __package__ not in bpy.context.preferences.addons:
+        import addon_utils
+        addon_utils.enable(__package__, default_set=False)
+
+    result = {'file': bpy.data.filepath, 'steps': {}, 'exported': [], 'skipped': [], 'error': None}
+    try:
+        job = None
+        if args.job:
+            job = load_job(args.job)
+            if args.name:
+                job['name'] = args.name
+            if args.directory:
+                job['directory'] = args.directory
+
+        if args.profile:
+            bpy.context.scene.vrt.use_export_profiler = True
+
+        result.update(run_steps(bpy.context, step_names, job, args.force))
+
+        if args.save:
+            bpy.ops.wm.save_mainfile()
+    except BatchExportError as e:
+        result['error'] = str(e)
+        write_result(args.result, result)
+        print(f"VRT batch export failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception:
+        result['error'] = traceback.format_exc()
+        write_result(args.result, result)
+        raise
+
+    write_result(args.result, result)
+    print(f"VRT batch export finished, {len(result['exported'])} file(s) written, {len(result['skipped'])} unchanged")
+
+#endregion
@@ -0,0 +1,122 @@
+import bpy
+
+from mathutils import Matrix, Vector
+
+from ..utilities.lazy_import import lazy_import
+from .fn_operators import get_export_objects
+from ..utilities.profiler import profile_phase, end_phase
+
+np = lazy_import('numpy')
+
+
+# Objects changed by bake_collider_transforms(): (object, original mesh, matrix_basis, {child: matrix_parent_inverse})
+baked_colliders = []
+
+#region Bake
+
+def get_collider_objects(context, export_settings) -> list:
+    """Returns the mesh objects with a rigid body the glTF exporter is going to write"""
+    if export_settings.get('gltf_selected'):
+        limit = 'SELECTED_OBJECTS'
+    elif export_settings.get('gltf_active_collection'):
+        limit = 'ACTIVE_COLLECTION'
+    elif export_settings.get('gltf_visible'):
+        limit = 'VISIBLE_OBJECTS'
+    else:
+        limit = None
+
+    objs = get_export_objects(context, limit) if limit else context.scene.objects
+    return [obj for obj in objs if obj.type == 'MESH' and obj.rigid_body is not None]
+
+def get_geometry_center(mesh):
+    """Median of all vertices, like origin_set(type='ORIGIN_GEOMETRY')"""
+    if not mesh.vertices:
+        return None
+    co = np.empty(len(mesh.vertices) * 3, dtype='f4')
+    mesh.vertices.foreach_get('co', co)
+    return co.reshape(-1, 3).mean(axis=0, dtype='f8')
+
+def bake_collider(obj, bake_scale: bool, bake_origin: bool) -> bool:
+    """Swaps the object's mesh with a temporary copy which has scale and origin applied,
+    and changes its transform so that it stays where it was. Returns False if there was nothing to bake"""
+    location, rotation, scale = obj.matrix_basis.decompose()
+    baked_scale = scale
+    if not bake_scale or all(abs(value - 1.0) < 1e-6 for value in scale) or any(value == 0.0 for value in scale):
+        baked_scale = None
+    if baked_scale is None and not bake_origin:
+        return False
+
+    mesh = obj.data.copy()
+    if baked_scale is not None:
+        mesh.transform(Matrix.Diagonal(baked_scale).to_4x4(), shape_keys=True)
+
+    center = get_geometry_center(mesh) if bake_origin else None
+    if center is not None:
+        center = Vector(center.tolist())
+        mesh.transform(Matrix.Translation(-center), shape_keys=True)
+        # Unless it was baked into the mesh, the object's scale still applies to the offset
+        offset = center if baked_scale is not None else center * scale
+        location = location + rotation @ offset
+
+    if baked_scale is None and center is None:
+        bpy.data.meshes.remove(mesh)
+        return False
+
+    # Children keep their world transform, like they do with transform_apply
+    world = obj.matrix_world.copy()
+    old_basis = obj.matrix_basis.copy()
+    new_basis = Matrix.LocRotScale(location, rotation, None if baked_scale is not None else scale)
+    new_world = world @ old_basis.inverted_safe() @ new_basis
+    children = {child: child.matrix_parent_inverse.copy() for child in obj.children}
+    for child, parent_inverse in children.items():
+        child.matrix_parent_inverse = new_world.inverted_safe() @ world @ parent_inverse
+
+    baked_colliders.append((obj, obj.data, old_basis, children))
+    obj.data = mesh
+    obj.matrix_basis = new_basis
+    return True
+
+def bake_collider_transforms(export_settings):
+    """glTF pre export callback. Bakes scale and origin of colliders into temporary meshes,
+    restore_collider_transforms() puts the original data back"""
+    context = bpy.context
+    props = context.scene.msft_physics_exporter_props
+    if not props.enabled or not (props.bake_scale or props.bake_origin):
+        return
+
+    # A previous export may have failed before restoring
+    restore_collider_transforms()
+
+    with profile_phase("bake colliders"):
+        for obj in get_collider_objects(context, export_settings):
+            bake_collider(obj, props.bake_scale, props.bake_origin)
+
+        if baked_colliders:
+            context.view_layer.update()
+
+def restore_collider_transforms(export_settings=None):
+    """glTF post export callback. Safe to call when nothing is baked"""
+    if export_settings is not None:
+        # Everything after the extension hooks ran until now is spent encoding and writing the file
+        end_phase('gathered', "glTF encode and write")
+
+    if not baked_colliders:
+        return
+
+    with profile_phase("restore colliders"):
+        restore_baked_colliders()
+
+def restore_baked_colliders():
+    while baked_colliders:
+        obj, mesh, basis, children = baked_colliders.pop()
+        temp_mesh = obj.data
+        obj.data = mesh
+        obj.matrix_basis = basis
+        for child, parent_inverse in children.items():
+            child.matrix_parent_inverse = parent_inverse
+        if temp_mesh.users == 0:
+            bpy.data.meshes.remove(temp_mesh)
+
+    bpy.context.view_layer.update()
+
+#endregion
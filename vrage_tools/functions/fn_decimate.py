@@ -0,0 +1,114 @@
+import numpy as np
+
+# Vertex clustering decimation of triangle meshes for generated LODs, used by fn_lods.py. Doesn't depend on bpy, so it
+# can be checked with plain Python. Meshes are passed as arrays:
+# positions (V, 3) float, triangles (T, 3) vertex indices and materials (T,) material indices.
+#
+# Vertices snap to the cells of a uniform grid and every cell collapses into one vertex at the mean of its members.
+# Vertices are only clustered with vertices of the same material, and vertices shared by several materials only with
+# each other, so material boundaries stay where they are and every material keeps its own triangles.
+
+# Bisection steps spent searching the grid resolution which hits a triangle ratio
+resolution_steps = 16
+# Cell coordinates are packed into 12 bits per axis
+max_resolution = 4096
+cell_bits = 12
+
+
+#region Clustering
+
+def get_boundary_vertices(triangles, materials, vertex_count: int):
+    """Mask of vertices used by triangles of more than one material"""
+    corner_vertices = triangles.ravel()
+    corner_materials = np.repeat(materials, 3)
+    first = np.full(vertex_count, -1, dtype=np.int64)
+    first[corner_vertices] = corner_materials
+    return np.bincount(corner_vertices[corner_materials != first[corner_vertices]], minlength=vertex_count) > 0
+
+def get_vertex_materials(triangles, materials, vertex_count: int):
+    """A material of every vertex, -1 for unused vertices"""
+    vertex_materials = np.full(vertex_count, -1, dtype=np.int64)
+    vertex_materials[triangles.ravel()] = np.repeat(materials, 3)
+    return vertex_materials
+
+def cluster_vertices(positions, vertex_materials, boundary, resolution: int):
+    """Returns the cluster of every vertex and the number of clusters"""
+    lower = positions.min(axis=0)
+    size = np.maximum(positions.max(axis=0) - lower, 1e-9)
+    cells = np.minimum(((positions - lower) / size.max() * resolution).astype(np.int64), resolution - 1)
+
+    # Boundary vertices form their own group, interior vertices are grouped by material
+    groups = np.where(boundary, -2, vertex_materials) + 2
+    keys = (groups << (3 * cell_bits)) | (cells[:, 0] << (2 * cell_bits)) | (cells[:, 1] << cell_bits) | cells[:, 2]
+    _, clusters = np.unique(keys, return_inverse=True)
+    clusters = clusters.ravel()
+    return clusters, int(clusters.max()) + 1 if len(clusters) else 0
+
+def collapse(positions, triangles, clusters, cluster_count: int):
+    """Returns (positions, triangles, kept) of the clustered mesh. kept are the indices of the surviving triangles"""
+    counts = np.bincount(clusters, minlength=cluster_count).astype(positions.dtype)
+    new_positions = np.column_stack([
+        np.bincount(clusters, weights=positions[:, axis], minlength=cluster_count) for axis in range(3)
+    ]) / np.maximum(counts, 1)[:, None]
+
+    new_triangles = clusters[triangles]
+    a, b, c = new_triangles.T
+    kept = np.flatnonzero((a != b) & (b != c) & (a != c))
+    new_triangles = new_triangles[kept]
+
+    # Triangles which collapsed onto the same three vertices are drawn once
+    if len(new_triangles):
+        corners = np.sort(new_triangles, axis=1)
+        if cluster_count < 1 << 21:
+            # Three cluster indices fit into one int64, which is a lot faster to make unique than rows
+            corners = (corners[:, 0] * cluster_count + corners[:, 1]) * cluster_count + corners[:, 2]
+        _, unique = np.unique(corners, axis=0 if corners.ndim == 2 else None, return_index=True)
+        unique.sort()
+        kept = kept[unique]
+        new_triangles = new_triangles[unique]
+
+    # Drop clusters no triangle uses anymore
+    used, new_triangles = np.unique(new_triangles, return_inverse=True)
+    return new_positions[used], new_triangles.reshape(-1, 3), kept
+
+#endregion
+
+#region Decimation
+
+def decimate(positions, triangles, materials, ratio: float):
+    """Returns (positions, triangles, kept) with about ratio of the triangles left. kept are indices into the
+    original triangles, so materials and face corner attributes can be carried over"""
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    materials = np.asarray(materials, dtype=np.int64).ravel()
+
+    if ratio >= 1.0 or len(triangles) == 0:
+        return positions, triangles, np.arange(len(triangles))
+
+    vertex_materials = get_vertex_materials(triangles, materials, len(positions))
+    boundary = get_boundary_vertices(triangles, materials, len(positions))
+    target = max(1, int(len(triangles) * ratio))
+
+    # More cells keep more triangles. Search the coarsest grid which keeps at least the target
+    low, high = 1, max_resolution
+    best = None
+    for _ in range(resolution_steps):
+        if low > high:
+            break
+        resolution = (low + high) // 2
+        result = collapse(positions, triangles, *cluster_vertices(positions, vertex_materials, boundary, resolution))
+        if len(result[1]) >= target:
+            best = result
+            high = resolution - 1
+        else:
+            low = resolution + 1
+
+    if best is None:
+        return positions, triangles, np.arange(len(triangles))
+    return best
+
+def decimate_levels(positions, triangles, materials, ratios) -> list:
+    """Decimates one mesh to every ratio"""
+    return [decimate(positions, triangles, materials, ratio) for ratio in ratios]
+
+#endregion
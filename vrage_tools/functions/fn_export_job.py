@@ -0,0 +1,73 @@
+import json
+
+from .fn_export_paths import export_variants
+
+# Job files of vrage_tools.batch. See its docstring for the format. Doesn't depend on bpy,
+# the project index reads jobs outside of Blender
+
+
+class BatchExportError(Exception):
+    pass
+
+
+def load_job(filepath: str) -> dict:
+    try:
+        with open(filepath, encoding='utf-8') as f:
+            job = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise BatchExportError(f"Could not read job file '{filepath}': {e}")
+
+    return validate_job(job)
+
+
+def parse_source(source, default_view_layer: str = None) -> dict:
+    if isinstance(source, str):
+        source = {'collection': source}
+    if not isinstance(source, dict) or not (source.get('collection') or source.get('view_layer') or default_view_layer):
+        raise BatchExportError(f"Invalid source {source!r}, expected a collection name or an object with 'collection' or 'view_layer'")
+
+    return {
+        'collection': source.get('collection'),
+        'view_layer': source.get('view_layer') or default_view_layer,
+    }
+
+
+def validate_job(job: dict) -> dict:
+    """Returns the job with all sources expanded to {'collection': ..., 'view_layer': ...} and LODs as (index, source) pairs"""
+    if not isinstance(job, dict) or not isinstance(job.get('variants'), list) or not job['variants']:
+        raise BatchExportError("Job needs a non-empty 'variants' list")
+
+    default_view_layer = job.get('view_layer')
+    result = {
+        'name': job.get('name'),
+        'directory': job.get('directory'),
+        'variants': [],
+    }
+
+    for entry in job['variants']:
+        variant = entry.get('variant', 'NON_FRACTURED')
+        if variant not in export_variants:
+            raise BatchExportError(f"Unknown variant '{variant}', expected one of {', '.join(export_variants)}")
+
+        view_layer = entry.get('view_layer') or default_view_layer
+
+        lods = entry.get('lods', [])
+        if isinstance(lods, list):
+            lods = dict(enumerate(lods))
+        elif not isinstance(lods, dict):
+            raise BatchExportError(f"'lods' of variant '{variant}' must be a list or an object")
+        try:
+            lods = sorted((int(lod), parse_source(source, view_layer)) for lod, source in lods.items())
+        except ValueError:
+            raise BatchExportError(f"LOD keys of variant '{variant}' must be numbers")
+
+        collision = entry.get('collision')
+        if collision is not None:
+            collision = parse_source(collision, view_layer)
+
+        if not lods and collision is None:
+            raise BatchExportError(f"Variant '{variant}' has nothing to export")
+
+        result['variants'].append({'variant': variant, 'lods': lods, 'collision': collision})
+
+    return result
@@ -0,0 +1,209 @@
+import os
+import json
+import hashlib
+import bpy
+
+from ..utilities.lazy_import import lazy_import
+from .fn_export_paths import manifest_name
+
+np = lazy_import('numpy')
+
+
+# Bump to invalidate all manifests when the exported content changes in a way the hash can't see
+hash_version = 2
+
+# (foreach_get property, values per element, numpy dtype) of mesh attribute types.
+# Dtypes are strings so that numpy is only loaded once something is hashed
+attribute_layouts = {
+    'FLOAT': ('value', 1, 'f4'),
+    'INT': ('value', 1, 'i4'),
+    'INT8': ('value', 1, 'i1'),
+    'BOOLEAN': ('value', 1, '?'),
+    'FLOAT_VECTOR': ('vector', 3, 'f4'),
+    'FLOAT2': ('vector', 2, 'f4'),
+    'INT32_2D': ('value', 2, 'i4'),
+    'FLOAT_COLOR': ('color', 4, 'f4'),
+    'BYTE_COLOR': ('color', 4, 'f4'),
+    'QUATERNION': ('value', 4, 'f4'),
+    'FLOAT4X4': ('value', 16, 'f4'),
+}
+
+#region Hash
+
+def to_json_value(value):
+    """Converts ID property values to something json can serialize"""
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    if hasattr(value, 'to_list'):
+        return value.to_list()
+    if isinstance(value, bpy.types.ID):
+        return value.name_full
+    return value
+
+def normalize_for_hash(value):
+    """Sets (e.g. the exporters' object_types or enum flag properties) become sorted lists,
+    their str() order differs between processes"""
+    if isinstance(value, dict):
+        return {str(key): normalize_for_hash(item) for key, item in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted(normalize_for_hash(item) for item in value)
+    if isinstance(value, (list, tuple)):
+        return [normalize_for_hash(item) for item in value]
+    return value
+
+def get_rna_values(struct) -> dict:
+    """Returns the values of all non-pointer properties of a struct, e.g. an object's rigid body settings"""
+    values = {}
+    for prop in struct.bl_rna.properties:
+        if prop.identifier == 'rna_type' or prop.type in {'POINTER', 'COLLECTION'}:
+            continue
+        value = getattr(struct, prop.identifier)
+        values[prop.identifier] = list(value) if getattr(prop, 'is_array', False) else value
+    return values
+
+def get_custom_props(id_data) -> dict:
+    return {key: to_json_value(id_data[key]) for key in sorted(id_data.keys())}
+
+def read_array(collection, prop: str, width: int, dtype):
+    array = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(prop, array)
+    return array
+
+def hash_mesh(hasher, mesh):
+    hasher.update(read_array(mesh.vertices, 'co', 3, 'f4').tobytes())
+    hasher.update(read_array(mesh.edges, 'vertices', 2, 'i4').tobytes())
+    hasher.update(read_array(mesh.loops, 'vertex_index', 1, 'i4').tobytes())
+    hasher.update(read_array(mesh.polygons, 'loop_start', 1, 'i4').tobytes())
+
+    # Covers material indices, smooth shading, UV maps, colors and every other generic attribute
+    for attribute in sorted(mesh.attributes, key=lambda attribute: attribute.name):
+        layout = attribute_layouts.get(attribute.data_type)
+        if layout is None or attribute.name == 'position':
+            continue
+        prop, width, dtype = layout
+        hasher.update(f"{attribute.name}:{attribute.domain}:{attribute.data_type}".encode())
+        hasher.update(read_array(attribute.data, prop, width, dtype).tobytes())
+
+def hash_object(hasher, obj, depsgraph):
+    hasher.update(f"{obj.name}:{obj.type}:{obj.parent.name if obj.parent else ''}".encode())
+    hasher.update(np.array(obj.matrix_world, dtype=np.float64).tobytes())
+    hasher.update(json.dumps([slot.material.name if slot.material else "" for slot in obj.material_slots]).encode())
+
+    # Custom properties are read by VRAGE (e.g. SECTION, ColliderMeshGroups)
+    extras = {'object': get_custom_props(obj)}
+    if obj.data is not None:
+        extras['data'] = get_custom_props(obj.data)
+    if obj.rigid_body is not None:
+        extras['rigid_body'] = get_rna_values(obj.rigid_body)
+    if hasattr(obj, 'msft_physics_extra_props'):
+        extras['physics'] = get_rna_values(obj.msft_physics_extra_props)
+    hasher.update(json.dumps(normalize_for_hash(extras), sort_keys=True, default=str).encode())
+
+    if obj.type != 'MESH':
+        return
+
+    # Exporters apply modifiers, so hash the evaluated mesh
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+    try:
+        hash_mesh(hasher, mesh)
+    finally:
+        obj_eval.to_mesh_clear()
+
+def hash_export(context, objs, settings: dict) -> str:
+    """Returns a hash of everything which affects the exported file: objects, their mesh data and the export settings"""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(json.dumps({'version': hash_version, 'settings': normalize_for_hash(settings)}, sort_keys=True, default=str).encode())
+
+    depsgraph = context.evaluated_depsgraph_get()
+    for obj in sorted(objs, key=lambda obj: obj.name_full):
+        hash_object(hasher, obj, depsgraph)
+
+    return hasher.hexdigest()
+
+#endregion
+
+#region Manifest
+
+def get_mtime_ns(filepath: str):
+    try:
+        return os.stat(filepath).st_mtime_ns
+    except (OSError, ValueError):
+        return None
+
+def get_manifest_path(filepath: str) -> str:
+    return os.path.join(os.path.dirname(filepath), manifest_name)
+
+def load_manifest(filepath: str) -> dict:
+    """Returns the manifest of the directory the file is exported to"""
+    try:
+        with open(get_manifest_path(filepath), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(filepath: str, manifest: dict):
+    path = get_manifest_path(filepath)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    os.replace(temp_path, path)
+
+def is_export_current(filepath: str, content_hash: str) -> bool:
+    """Whether the file exists and was written from content with this hash"""
+    entry = load_manifest(filepath).get(os.path.basename(filepath))
+    if entry is None or entry.get('hash') != content_hash:
+        return False
+
+    # The file was deleted or overwritten by something else since
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return False
+    return stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtime_ns')
+
+def update_manifest(filepath: str, content_hash: str = None):
+    """Records the hash of a written file, or forgets the file if content_hash is None"""
+    manifest = load_manifest(filepath)
+    name = os.path.basename(filepath)
+
+    if content_hash is None:
+        if manifest.pop(name, None) is None:
+            return
+    else:
+        stat = os.stat(filepath)
+        manifest[name] = {
+            'hash': content_hash,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            **get_source_info(),
+        }
+
+    save_manifest(filepath, manifest)
+
+def get_source_info() -> dict:
+    # Read by the project index to find outputs which are older than their sources
+    libraries = sorted({os.path.normpath(bpy.path.abspath(library.filepath)) for library in bpy.data.libraries})
+    library_mtimes = [mtime for mtime in map(get_mtime_ns, libraries) if mtime is not None]
+    return {
+        'source': os.path.normpath(bpy.data.filepath) if bpy.data.filepath else "",
+        'source_mtime_ns': get_mtime_ns(bpy.data.filepath),
+        'libraries': libraries,
+        'libraries_mtime_ns': max(library_mtimes, default=None),
+    }
+
+def refresh_manifest_source(filepath: str):
+    """Records that the current .blend still produces the unchanged file, so the project index doesn't
+    consider it stale because the .blend was saved since"""
+    manifest = load_manifest(filepath)
+    entry = manifest.get(os.path.basename(filepath))
+    if entry is None:
+        return
+
+    source = get_source_info()
+    if all(entry.get(key) == value for key, value in source.items()):
+        return
+    entry.update(source)
+    save_manifest(filepath, manifest)
+
+#endregion
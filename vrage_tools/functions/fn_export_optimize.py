@@ -0,0 +1,228 @@
+import bpy
+import bmesh
+
+from contextlib import contextmanager
+
+from ..utilities.lazy_import import lazy_import
+from ..utilities.notifications import emit_notification
+from ..utilities.profiler import profile_phase
+from .fn_mesh_optimize import get_weld_targets, get_gpu_vertices, optimize_order
+
+np = lazy_import('numpy')
+
+
+# Objects changed by optimized_meshes(): (object, original mesh, {modifier: show_viewport})
+optimized_objects = []
+
+#region Mesh data
+
+def get_corner_normals(mesh):
+    normals = np.empty(len(mesh.loops) * 3, dtype='f4')
+    if bpy.app.version >= (4, 1, 0):
+        mesh.corner_normals.foreach_get('vector', normals)
+    else:
+        mesh.calc_normals_split()
+        mesh.loops.foreach_get('normal', normals)
+    return normals.reshape(-1, 3)
+
+def get_corner_arrays(mesh) -> tuple:
+    """Returns (positions, corner vertices, corner attributes, triangle corners) of a triangulated mesh"""
+    positions = np.empty(len(mesh.vertices) * 3, dtype='f4')
+    mesh.vertices.foreach_get('co', positions)
+    corner_vertices = np.empty(len(mesh.loops), dtype='i4')
+    mesh.loops.foreach_get('vertex_index', corner_vertices)
+    loop_starts = np.empty(len(mesh.polygons), dtype='i4')
+    mesh.polygons.foreach_get('loop_start', loop_starts)
+
+    attributes = [get_corner_normals(mesh)]
+    for layer in mesh.uv_layers:
+        uvs = np.empty(len(mesh.loops) * 2, dtype='f4')
+        layer.data.foreach_get('uv', uvs)
+        attributes.append(uvs.reshape(-1, 2))
+
+    triangle_corners = loop_starts[:, None] + np.arange(3)
+    return positions.reshape(-1, 3), corner_vertices, attributes, triangle_corners
+
+# Point attribute data types welding can compare: (property of the attribute's data, components, buffer type)
+point_attribute_components = {
+    'FLOAT': ('value', 1, 'f4'),
+    'INT': ('value', 1, 'i4'),
+    'INT8': ('value', 1, 'i4'),
+    'BOOLEAN': ('value', 1, '?'),
+    'FLOAT2': ('vector', 2, 'f4'),
+    'INT32_2D': ('value', 2, 'i4'),
+    'FLOAT_VECTOR': ('vector', 3, 'f4'),
+    'FLOAT_COLOR': ('color', 4, 'f4'),
+    'BYTE_COLOR': ('color', 4, 'f4'),
+    'QUATERNION': ('value', 4, 'f4'),
+}
+
+def get_vertex_attributes(mesh):
+    """Per vertex arrays welded vertices have to agree on: deform weights and point attributes.
+    None if the mesh has point attributes which can't be compared"""
+    vertex_count = len(mesh.vertices)
+    attributes = []
+
+    weights = [(vertex.index, group.group, group.weight) for vertex in mesh.vertices for group in vertex.groups]
+    if weights:
+        indices, groups, values = zip(*weights)
+        matrix = np.zeros((vertex_count, max(groups) + 1), dtype='f4')
+        matrix[list(indices), list(groups)] = values
+        attributes.append(matrix)
+
+    for attribute in mesh.attributes:
+        # Positions are compared anyway, names starting with a dot are Blender's internal state, e.g. selection
+        if attribute.domain != 'POINT' or attribute.name == 'position' or attribute.name.startswith('.'):
+            continue
+        component = point_attribute_components.get(attribute.data_type)
+        if component is None:
+            return None
+        name, width, buffer_type = component
+        values = np.empty(vertex_count * width, dtype=buffer_type)
+        attribute.data.foreach_get(name, values)
+        attributes.append(values.reshape(-1, width).astype('f8'))
+
+    return attributes
+
+def sort_elements(elements, order):
+    """Reorders bmesh verts or faces so that order[i] becomes element i"""
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    for element, index in zip(elements, rank.tolist()):
+        element.index = index
+    elements.sort()
+
+#endregion
+
+#region Optimization
+
+def optimize_mesh(mesh) -> tuple:
+    """Triangulates and welds the mesh and reorders its triangles and vertices in place.
+    Returns (triangles, ACMR before, ACMR after)"""
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(mesh)
+        bmesh.ops.triangulate(bm, faces=bm.faces[:])
+        bm.to_mesh(mesh)
+
+        positions, corner_vertices, attributes, triangle_corners = get_corner_arrays(mesh)
+        vertex_attributes = get_vertex_attributes(mesh)
+        welded = []
+        if vertex_attributes is not None:
+            targets = get_weld_targets(positions, corner_vertices, attributes[0], vertex_attributes)
+            welded = np.flatnonzero(targets != np.arange(len(targets))).tolist()
+        if welded:
+            targets = targets.tolist()
+            bm.verts.ensure_lookup_table()
+            bmesh.ops.weld_verts(bm, targetmap={bm.verts[i]: bm.verts[targets[i]] for i in welded})
+            bm.to_mesh(mesh)
+            positions, corner_vertices, attributes, triangle_corners = get_corner_arrays(mesh)
+
+        gpu_vertices, gpu_vertex_count = get_gpu_vertices(corner_vertices, attributes)
+        triangle_order, vertex_order, before, after = optimize_order(
+            corner_vertices[triangle_corners], gpu_vertices[triangle_corners], len(positions), gpu_vertex_count
+        )
+
+        bm.faces.ensure_lookup_table()
+        sort_elements(bm.faces, triangle_order)
+        bm.verts.ensure_lookup_table()
+        sort_elements(bm.verts, vertex_order)
+        bm.to_mesh(mesh)
+        return len(triangle_corners), before, after
+    finally:
+        bm.free()
+
+def is_optimizable(obj) -> bool:
+    # The temporary mesh has modifiers applied, shape keys would be lost
+    return obj.type == 'MESH' and obj.data.shape_keys is None
+
+@contextmanager
+def rest_pose(context, objs):
+    """Disables the armature modifiers of the objects, so their evaluated meshes are in the rest pose"""
+    armatures = {modifier: modifier.show_viewport for obj in objs for modifier in obj.modifiers if modifier.type == 'ARMATURE'}
+    if not armatures:
+        yield
+        return
+
+    try:
+        for modifier in armatures:
+            modifier.show_viewport = False
+        context.view_layer.update()
+        yield
+    finally:
+        for modifier, show_viewport in armatures.items():
+            modifier.show_viewport = show_viewport
+        context.view_layer.update()
+
+@contextmanager
+def optimized_meshes(context, objs):
+    """Swaps the meshes of the objects with optimized copies, with modifiers except armatures applied, for the duration of an export
+    and puts the original meshes back afterwards. Does nothing unless enabled in the scene"""
+    if not context.scene.vrt.use_mesh_optimization:
+        yield
+        return
+
+    # A previous export may have failed before restoring
+    restore_optimized_meshes(context)
+
+    try:
+        with profile_phase("optimize meshes"):
+            objs = [obj for obj in objs if is_optimizable(obj)]
+            triangles = before = after = 0
+            with rest_pose(context, objs):
+                depsgraph = context.evaluated_depsgraph_get()
+                meshes = [
+                    bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph), preserve_all_data_layers=True, depsgraph=depsgraph)
+                    for obj in objs
+                ]
+
+            for obj, mesh in zip(objs, meshes):
+                try:
+                    count, mesh_before, mesh_after = optimize_mesh(mesh)
+                except Exception:
+                    for unused in meshes[len(optimized_objects):]:
+                        bpy.data.meshes.remove(unused)
+                    raise
+
+                # The exporter leaves armature deformation out by itself and needs the modifier for skinning
+                modifiers = {modifier: modifier.show_viewport for modifier in obj.modifiers if modifier.type != 'ARMATURE'}
+                optimized_objects.append((obj, obj.data, modifiers))
+                obj.data = mesh
+                for modifier in modifiers:
+                    modifier.show_viewport = False
+
+                triangles += count
+                before += mesh_before * count
+                after += mesh_after * count
+
+            if optimized_objects:
+                context.view_layer.update()
+
+        if triangles:
+            emit_notification(
+                context, 'INFO', 'I003',
+                [len(optimized_objects), f"{before / triangles:.3f}", f"{after / triangles:.3f}"],
+                operator="export",
+                objects=[obj.name for obj, mesh, modifiers in optimized_objects]
+            )
+        yield
+    finally:
+        restore_optimized_meshes(context)
+
+def restore_optimized_meshes(context):
+    if not optimized_objects:
+        return
+
+    with profile_phase("restore meshes"):
+        while optimized_objects:
+            obj, mesh, modifiers = optimized_objects.pop()
+            temp_mesh = obj.data
+            obj.data = mesh
+            for modifier, show_viewport in modifiers.items():
+                modifier.show_viewport = show_viewport
+            if temp_mesh.users == 0:
+                bpy.data.meshes.remove(temp_mesh)
+
+        context.view_layer.update()
+
+#endregion
@@ -0,0 +1,64 @@
+import os
+
+from functools import lru_cache
+
+# Naming of exported files. Doesn't depend on bpy, so it's also used to predict outputs outside of Blender
+
+export_variants = ('NON_FRACTURED', 'FRACTURED', 'DEFORMED', 'NONE')
+
+# Written next to exported files, holds their content hashes and where they came from
+manifest_name = ".vrt_export_manifest.json"
+# Job file of a .blend file, e.g. Block.vrt-job.json next to Block.blend
+job_suffix = ".vrt-job.json"
+
+def get_export_variant_suffix(variant) -> str:
+    match variant:
+        case 'NON_FRACTURED':
+            return ""
+        case 'FRACTURED':
+            return "_Fractured"
+        case 'DEFORMED':
+            return "_Deformed"
+        case 'NONE':
+            return ""
+
+def get_export_variant_dir(variant) -> str:
+    match variant:
+        case 'NON_FRACTURED':
+            return "NonFractured"
+        case 'FRACTURED':
+            return "Fractured"
+        case 'DEFORMED':
+            return "Deformed"
+        case 'NONE': #should never happen, but adding it for completeness
+            return "None"
+
+def get_export_lod_suffix(lod) -> str:
+    if lod:
+        return f"_LOD{lod}"
+    else:
+        return ""
+
+@lru_cache(maxsize=1024)
+def get_export_filename(name, variant, lod=0, collision=False) -> str:
+    """Returns the file name of an export without its extension, e.g. Block_Fractured_LOD1"""
+    filename = f"{name}{get_export_variant_suffix(variant)}"
+    return filename + ("_collision" if collision else get_export_lod_suffix(lod))
+
+def get_export_filepath(directory, name, variant, lod=0, collision=False, create_dirs=True) -> str:
+    """Returns the path of an export without its file extension and creates the variant folder if needed"""
+    filename = get_export_filename(name, variant, lod, collision)
+
+    if variant == 'NONE':
+        return os.path.join(directory, filename)
+
+    subdir = os.path.join(directory, get_export_variant_dir(variant))
+    if create_dirs:
+        os.makedirs(name=subdir, exist_ok=True)
+    return os.path.join(subdir, filename)
+
+def get_export_extension(collision=False) -> str:
+    return ".gltf" if collision else ".fbx"
+
+def get_job_path(blend_file) -> str:
+    return f"{os.path.splitext(blend_file)[0]}{job_suffix}"
@@ -0,0 +1,134 @@
+from contextlib import contextmanager
+
+from .fn_names import get_fracture_id_number
+
+
+# Custom properties VRAGE reads the fracture of an object from. In the 'LEGACY' storage mode all of them are written
+# to every object, in the 'CANONICAL' mode only obj.vrt.fracture_group is stored and they are written during exports
+legacy_keys = ('ColliderMeshGroups', 'group', 'FractureGroupName')
+
+# Marks that the export expansion has to be undone
+missing = object()
+
+
+def is_canonical(scene) -> bool:
+    return scene.vrt.fracture_storage == 'CANONICAL'
+
+def get_legacy_fracture_group(obj):
+    """Fracture of the object according to its custom properties, in the order VRAGE reads them"""
+    for key in legacy_keys:
+        if key in obj:
+            return obj[key]
+    return None
+
+def get_fracture_group(obj, canonical: bool):
+    """Returns the group id of the object's fracture, or None"""
+    if canonical:
+        return obj.vrt.fracture_group or None
+    return get_legacy_fracture_group(obj)
+
+def set_fracture_group(obj, group_id: str, canonical: bool):
+    if canonical:
+        obj.vrt.fracture_group = group_id
+        return
+    for key in legacy_keys:
+        obj[key] = group_id
+
+def remove_fracture_group(obj, group_id: str, canonical: bool) -> bool:
+    """Removes the object from the fracture if it's in it. Returns whether it was"""
+    if canonical:
+        if obj.vrt.fracture_group != group_id:
+            return False
+        obj.vrt.fracture_group = ""
+        return True
+
+    removed = False
+    for key in legacy_keys:
+        if key in obj and obj[key] == group_id:
+            del obj[key]
+            removed = True
+    return removed
+
+
+#region Migration
+
+def is_fracture_group_value(value, group_ids) -> bool:
+    """ColliderMeshGroups and group are also used to link colliders by name, only fracture ids are migrated"""
+    return isinstance(value, str) and (value in group_ids or get_fracture_id_number(value) is not None)
+
+def get_fracture_keys(obj, group_ids) -> list:
+    """Legacy keys the fracture of the object goes into: those it doesn't have yet and those holding a fracture id.
+    Keys linking colliders are left alone"""
+    return [key for key in legacy_keys if key not in obj or is_fracture_group_value(obj[key], group_ids)]
+
+def migrate_to_canonical(objs, group_ids) -> int:
+    """Moves fracture ids from the legacy custom properties into obj.vrt.fracture_group. Returns the number of changed objects"""
+    changed = 0
+    for obj in objs:
+        # ColliderMeshGroups or group may link colliders while another key holds the fracture
+        group_id = next((obj[key] for key in legacy_keys if key in obj and is_fracture_group_value(obj[key], group_ids)), None)
+        if group_id is None:
+            continue
+        obj.vrt.fracture_group = group_id
+        for key in legacy_keys:
+            if key in obj and is_fracture_group_value(obj[key], group_ids):
+                del obj[key]
+        changed += 1
+    return changed
+
+def migrate_to_legacy(objs, group_ids) -> int:
+    """Writes obj.vrt.fracture_group back into the legacy custom properties. Returns the number of changed objects"""
+    changed = 0
+    for obj in objs:
+        group_id = obj.vrt.fracture_group
+        if not group_id:
+            continue
+        for key in get_fracture_keys(obj, group_ids):
+            obj[key] = group_id
+        obj.vrt.fracture_group = ""
+        changed += 1
+    return changed
+
+#endregion
+
+#region Export
+
+def get_value_copy(obj, key):
+    # Array properties are returned as views, they'd be invalid once overwritten
+    value = obj.get(key, missing)
+    if hasattr(value, 'to_list'):
+        return value.to_list()
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    return value
+
+@contextmanager
+def expanded_fracture_groups(scene, objs):
+    """Writes the legacy custom properties of objects with a canonical fracture for the duration of an export,
+    and puts back what was there before. Does nothing in the legacy storage mode"""
+    if not is_canonical(scene):
+        yield
+        return
+
+    group_ids = {fracture.group_id for fracture in scene.vrt.fractures_list}
+    previous = []
+    for obj in objs:
+        group_id = obj.vrt.fracture_group
+        if not group_id:
+            continue
+        keys = get_fracture_keys(obj, group_ids)
+        previous.append((obj, {key: get_value_copy(obj, key) for key in keys}))
+        for key in keys:
+            obj[key] = group_id
+
+    try:
+        yield
+    finally:
+        for obj, values in previous:
+            for key, value in values.items():
+                if value is missing:
+                    del obj[key]
+                else:
+                    obj[key] = value
+
+#endregion
@@ -0,0 +1,177 @@
+import bpy
+
+from contextlib import contextmanager
+
+from ..utilities.lazy_import import lazy_import
+from .fn_names import split_duplicate_suffix, get_lod
+from .fn_decimate import decimate_levels
+from .fn_fracture_groups import get_value_copy
+
+np = lazy_import('numpy')
+
+
+#region Mesh data
+
+def get_lod_collection_name(lod: int) -> str:
+    """LODn, the collection names get_lod() and batch jobs expect"""
+    return f"LOD{lod}"
+
+def get_lod_object_name(obj, lod: int) -> str:
+    """Name of a generated LOD. The duplicate suffix of the source is kept, Piece.001 becomes Piece_LOD1.001"""
+    base_name, duplicate = split_duplicate_suffix(obj.name)
+    if get_lod(base_name) is not None:
+        base_name = base_name.rsplit("_LOD", 1)[0]
+    name = f"{base_name}_LOD{lod}"
+    return f"{name}.{duplicate:03d}" if duplicate else name
+
+def get_mesh_arrays(obj, depsgraph) -> dict:
+    """Triangulated arrays of the evaluated mesh. Face corner attributes are gathered per triangle corner"""
+    mesh = obj.evaluated_get(depsgraph).data
+    mesh.calc_loop_triangles()
+    triangle_count = len(mesh.loop_triangles)
+
+    positions = np.empty(len(mesh.vertices) * 3, dtype='f4')
+    mesh.vertices.foreach_get('co', positions)
+    triangles = np.empty(triangle_count * 3, dtype='i4')
+    mesh.loop_triangles.foreach_get('vertices', triangles)
+    loops = np.empty(triangle_count * 3, dtype='i4')
+    mesh.loop_triangles.foreach_get('loops', loops)
+    materials = np.empty(triangle_count, dtype='i4')
+    mesh.loop_triangles.foreach_get('material_index', materials)
+    smooth = np.empty(triangle_count, dtype=bool)
+    mesh.loop_triangles.foreach_get('use_smooth', smooth)
+
+    uv_layers = {}
+    for layer in mesh.uv_layers:
+        uvs = np.empty(len(mesh.loops) * 2, dtype='f4')
+        layer.data.foreach_get('uv', uvs)
+        uv_layers[layer.name] = uvs.reshape(-1, 2)[loops]
+
+    return {
+        'positions': positions.reshape(-1, 3),
+        'triangles': triangles.reshape(-1, 3),
+        'materials': materials,
+        'smooth': smooth,
+        'uv_layers': uv_layers,
+    }
+
+def build_lod_mesh(name: str, source_mesh, arrays: dict, level: tuple):
+    """New mesh of one decimated level. level is (positions, triangles, kept) as returned by decimate()"""
+    positions, triangles, kept = level
+    triangle_count = len(triangles)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set('co', positions.astype('f4').ravel())
+    mesh.loops.add(triangle_count * 3)
+    mesh.loops.foreach_set('vertex_index', triangles.astype('i4').ravel())
+    mesh.polygons.add(triangle_count)
+    mesh.polygons.foreach_set('loop_start', np.arange(0, triangle_count * 3, 3, dtype='i4'))
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set('loop_total', np.full(triangle_count, 3, dtype='i4'))
+    mesh.polygons.foreach_set('material_index', arrays['materials'][kept])
+    mesh.polygons.foreach_set('use_smooth', arrays['smooth'][kept])
+
+    corners = (kept[:, None] * 3 + np.arange(3)).ravel()
+    for layer_name, uvs in arrays['uv_layers'].items():
+        layer = mesh.uv_layers.new(name=layer_name)
+        layer.data.foreach_set('uv', uvs[corners].ravel())
+
+    for material in source_mesh.materials:
+        mesh.materials.append(material)
+
+    mesh.update(calc_edges=True)
+    return mesh
+
+#endregion
+
+#region Generation
+
+def copy_lod_properties(source, target):
+    """Custom properties the engine reads (SECTION, fracture groups, construction props) and the stored fracture"""
+    for key in source.keys():
+        target[key] = get_value_copy(source, key)
+    target.vrt.fracture_group = source.vrt.fracture_group
+
+def get_lod_collection(context, lod: int):
+    """Returns the LODn collection, created hidden in the viewport so visible exports of LOD0 don't pick it up"""
+    name = get_lod_collection_name(lod)
+    collection = bpy.data.collections.get(name)
+    if collection is None:
+        collection = bpy.data.collections.new(name)
+        context.scene.collection.children.link(collection)
+        layer_collection = context.view_layer.layer_collection.children.get(name)
+        if layer_collection is not None:
+            layer_collection.hide_viewport = True
+    return collection
+
+def get_generated_lods(collection) -> dict:
+    """Source object -> LOD object of the LODs generated into the collection"""
+    return {obj.vrt.lod_source: obj for obj in collection.objects if obj.type == 'MESH' and obj.vrt.lod_source is not None}
+
+def is_in_lod_collection(obj) -> bool:
+    """Whether the object belongs to LOD1 or a later LOD"""
+    return any(get_lod(collection.name) for collection in obj.users_collection)
+
+def is_lod_source(obj) -> bool:
+    """Meshes of LOD0. Colliders and generated levels aren't decimated"""
+    if obj.type != 'MESH' or obj.rigid_body is not None:
+        return False
+    return not is_in_lod_collection(obj)
+
+@contextmanager
+def selected_only(context, objs):
+    """Selects only the objects for the duration of the block, e.g. to export exactly them"""
+    view_layer = context.view_layer
+    previous = [obj for obj in view_layer.objects if obj.select_get(view_layer=view_layer)]
+    previous_active = view_layer.objects.active
+    try:
+        for obj in previous:
+            obj.select_set(False, view_layer=view_layer)
+        for obj in objs:
+            obj.select_set(True, view_layer=view_layer)
+        yield
+    finally:
+        for obj in objs:
+            obj.select_set(False, view_layer=view_layer)
+        for obj in previous:
+            obj.select_set(True, view_layer=view_layer)
+        view_layer.objects.active = previous_active
+
+def generate_lods(context, objs, ratios) -> dict:
+    """Creates or replaces LOD1..LODn of the objects in the LODn collections. ratios are the triangle ratios of
+    the levels relative to LOD0. Returns the triangle count of every level"""
+    depsgraph = context.evaluated_depsgraph_get()
+    sources = [obj for obj in objs if is_lod_source(obj)]
+    jobs = [get_mesh_arrays(obj, depsgraph) for obj in sources]
+    results = [decimate_levels(arrays['positions'], arrays['triangles'], arrays['materials'], ratios) for arrays in jobs]
+
+    triangles = {0: sum(len(arrays['triangles']) for arrays in jobs)}
+    for lod in range(1, len(ratios) + 1):
+        collection = get_lod_collection(context, lod)
+        generated = get_generated_lods(collection)
+        triangles[lod] = 0
+
+        for obj, arrays, levels in zip(sources, jobs, results):
+            name = get_lod_object_name(obj, lod)
+            mesh = build_lod_mesh(name, obj.data, arrays, levels[lod - 1])
+            triangles[lod] += len(mesh.polygons)
+
+            # Looked up by source, names of duplicates may have been taken or changed
+            lod_obj = generated.get(obj)
+            if lod_obj is not None:
+                old_mesh = lod_obj.data
+                lod_obj.data = mesh
+                if old_mesh.users == 0:
+                    bpy.data.meshes.remove(old_mesh)
+            else:
+                lod_obj = bpy.data.objects.new(name, mesh)
+                lod_obj.vrt.lod_source = obj
+                collection.objects.link(lod_obj)
+
+            lod_obj.matrix_world = obj.matrix_world.copy()
+            copy_lod_properties(obj, lod_obj)
+
+    return triangles
+
+#endregion
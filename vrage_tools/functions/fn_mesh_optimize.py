@@ -0,0 +1,160 @@
+import numpy as np
+
+from collections import deque
+
+# Vertex and index order optimization of triangle meshes for the GPU. Doesn't depend on bpy, so it can be checked
+# with plain Python, fn_export_optimize.py applies it to temporary copies of the exported meshes.
+#
+# A GPU vertex is a unique combination of a mesh vertex and the attributes of the face corners using it (normal,
+# UVs), that's what the engine's index buffer points at. Triangles are reordered with Tipsify (Sander et al. 2007)
+# so consecutive triangles share GPU vertices still in the post-transform cache, then vertices are ordered by
+# first use so the vertex fetches follow the index buffer.
+
+# Post-transform cache size Tipsify optimizes for and ACMR is measured with
+cache_size = 16
+
+
+#region Welding
+
+def get_weld_targets(positions, corner_vertices, corner_normals, vertex_attributes=()):
+    """Returns the vertex every vertex merges into, itself if none. Vertices merge if their positions and
+    vertex_attributes (per vertex arrays, e.g. deform weights) are identical and all face corners of both have
+    the same normal, so welding doesn't change the shading or the deformation"""
+    vertex_count = len(positions)
+    targets = np.arange(vertex_count)
+    if not len(corner_vertices):
+        return targets
+
+    lower = np.full((vertex_count, 3), np.inf)
+    upper = np.full((vertex_count, 3), -np.inf)
+    np.minimum.at(lower, corner_vertices, corner_normals)
+    np.maximum.at(upper, corner_vertices, corner_normals)
+    weldable = np.flatnonzero(np.all(lower == upper, axis=1))
+    if len(weldable) < 2:
+        return targets
+
+    attributes = [np.asarray(attribute).reshape(vertex_count, -1)[weldable] for attribute in vertex_attributes]
+    keys = np.column_stack((positions[weldable], lower[weldable], *attributes))
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    targets[weldable] = weldable[first[inverse.ravel()]]
+    return targets
+
+def get_gpu_vertices(corner_vertices, corner_attributes):
+    """Returns the GPU vertex of every face corner and the number of GPU vertices. corner_attributes are float
+    arrays with one row per corner, e.g. normals and UVs"""
+    keys = np.column_stack([corner_vertices.astype(np.float64), *corner_attributes])
+    _, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    return inverse, int(inverse.max()) + 1 if len(inverse) else 0
+
+#endregion
+
+#region Ordering
+
+def get_vertex_triangles(triangles, vertex_count: int):
+    """Triangles using every vertex as (offsets, triangle indices), vertex v uses indices[offsets[v]:offsets[v + 1]]"""
+    order = np.argsort(triangles.ravel(), kind='stable')
+    offsets = np.zeros(vertex_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(triangles.ravel(), minlength=vertex_count), out=offsets[1:])
+    return offsets, order // 3
+
+def tipsify(triangles, vertex_count: int, size: int = cache_size):
+    """Returns the triangle order of Tipsify for a cache of the given size"""
+    triangle_count = len(triangles)
+    if triangle_count == 0:
+        return np.arange(0)
+
+    offsets, vertex_triangles = get_vertex_triangles(triangles, vertex_count)
+    offsets = offsets.tolist()
+    vertex_triangles = vertex_triangles.tolist()
+    corners = triangles.tolist()
+
+    live = np.bincount(triangles.ravel(), minlength=vertex_count).tolist()
+    timestamps = [0] * vertex_count
+    emitted = bytearray(triangle_count)
+    dead_end = []
+    output = []
+
+    time = size + 1
+    cursor = 0
+    fanning = corners[0][0]
+
+    while fanning >= 0:
+        candidates = []
+        for triangle in vertex_triangles[offsets[fanning]:offsets[fanning + 1]]:
+            if emitted[triangle]:
+                continue
+            for vertex in corners[triangle]:
+                dead_end.append(vertex)
+                candidates.append(vertex)
+                live[vertex] -= 1
+                if time - timestamps[vertex] > size:
+                    timestamps[vertex] = time
+                    time += 1
+            emitted[triangle] = 1
+            output.append(triangle)
+
+        # Next fanning vertex: the one still in the cache which most likely stays there
+        fanning = -1
+        best = -1
+        for vertex in candidates:
+            if live[vertex] > 0:
+                priority = 0
+                if time - timestamps[vertex] + 2 * live[vertex] <= size:
+                    priority = time - timestamps[vertex]
+                if priority > best:
+                    best = priority
+                    fanning = vertex
+
+        if fanning < 0:
+            # Dead end, continue from a recently used vertex or the next one in input order
+            while dead_end:
+                vertex = dead_end.pop()
+                if live[vertex] > 0:
+                    fanning = vertex
+                    break
+            else:
+                while cursor < vertex_count and live[cursor] <= 0:
+                    cursor += 1
+                fanning = cursor if cursor < vertex_count else -1
+
+    return np.array(output, dtype=np.int64)
+
+def get_first_use_order(triangles, vertex_count: int):
+    """Vertex order by first use in the triangles. Unused vertices go last"""
+    flat = triangles.ravel()
+    _, first = np.unique(flat, return_index=True)
+    used = flat[np.sort(first)]
+    unused = np.setdiff1d(np.arange(vertex_count), used, assume_unique=True)
+    return np.concatenate((used, unused))
+
+def get_acmr(triangles, size: int = cache_size) -> float:
+    """Average cache miss ratio of a FIFO cache, transformed vertices per triangle. 0.5 is ideal, 3 is the worst"""
+    if len(triangles) == 0:
+        return 0.0
+
+    cache = deque()
+    cached = set()
+    misses = 0
+    for vertex in triangles.ravel().tolist():
+        if vertex in cached:
+            continue
+        misses += 1
+        cache.append(vertex)
+        cached.add(vertex)
+        if len(cache) > size:
+            cached.discard(cache.popleft())
+    return misses / len(triangles)
+
+#endregion
+
+#region Optimization
+
+def optimize_order(triangles, gpu_triangles, vertex_count: int, gpu_vertex_count: int):
+    """Returns (triangle order, vertex order, ACMR before, ACMR after). triangles index the mesh vertices,
+    gpu_triangles the GPU vertices of the same corners"""
+    triangle_order = tipsify(gpu_triangles, gpu_vertex_count)
+    vertex_order = get_first_use_order(triangles[triangle_order], vertex_count)
+    return triangle_order, vertex_order, get_acmr(gpu_triangles), get_acmr(gpu_triangles[triangle_order])
+
+#endregion
@@ -0,0 +1,128 @@
+import re
+
+from collections import namedtuple
+from functools import lru_cache
+
+# Naming and grouping rules of VRAGE objects. Doesn't depend on bpy, so it can be used and measured
+# with plain Python (see benchmarks/names.py). Parse results are cached, names repeat a lot across calls
+
+# Blender's duplicate suffix: .001, .002, ... .999, .1000, ...
+duplicate_suffix = re.compile(r"\.(\d{3,})$")
+# Fracture_01, Fracture_12, ... at the start of an object or group name
+fracture_prefix = re.compile(r"Fracture_\d+")
+# fracture_01 ... fracture_15, group ids of the fractures list
+fracture_id = re.compile(r"fracture_(\d+)$")
+# LOD1, Block_LOD2, ... in collection and object names, like the _LODn suffix of exported files
+lod_name = re.compile(r"(?:^|_)LOD(\d+)$")
+
+# Separator of the group names in ColliderMeshGroups and group
+group_separator = "|"
+# Engine maximum of fractures per block
+max_fractures = 15
+
+cache_size = 65536
+
+# Parsed object name. role is what follows Fracture_XX, e.g. "Cut" for Fracture_01_Cut.001, "" if nothing does
+NameModel = namedtuple('NameModel', ['name', 'base_name', 'duplicate_index', 'fracture_prefix', 'role'])
+
+
+#region Duplicate suffix
+
+@lru_cache(maxsize=cache_size)
+def split_duplicate_suffix(name: str) -> tuple:
+    """Returns (base name, duplicate index), e.g. ("Collision", 2) for "Collision.002" and ("Collision", 0) for "Collision" """
+    match = duplicate_suffix.search(name)
+    if match is None:
+        return name, 0
+    return name[:match.start()], int(match.group(1))
+
+def get_base_name(name: str) -> str:
+    """Returns the name without its Blender duplicate suffix (.001, .002, ...)"""
+    return split_duplicate_suffix(name)[0]
+
+def has_duplicate_suffix(name: str) -> bool:
+    return split_duplicate_suffix(name)[0] != name
+
+def matches_base_name(name: str, base_name: str) -> bool:
+    """True if the name is base_name, with or without a duplicate suffix"""
+    return name == base_name or get_base_name(name) == base_name
+
+#endregion
+
+#region Fracture groups
+
+@lru_cache(maxsize=cache_size)
+def get_fracture_prefix(name: str):
+    """Returns the Fracture_XX the name starts with, or None"""
+    match = fracture_prefix.match(name)
+    return match.group() if match else None
+
+def is_fracture_group(name: str) -> bool:
+    return get_fracture_prefix(name) is not None
+
+def get_fracture_group(name: str, role: str = None):
+    """Group of an object, Fracture_XX or Fracture_XX_<role> (Hide, Support, FrameCut). None if the name has no Fracture_XX prefix"""
+    prefix = get_fracture_prefix(name)
+    if prefix is None:
+        return None
+    return f"{prefix}_{role}" if role else prefix
+
+@lru_cache(maxsize=1024)
+def get_fracture_id_number(group_id: str):
+    """Returns 1 for fracture_01, None if the id doesn't follow the fracture_XX format or is above max_fractures"""
+    match = fracture_id.match(str(group_id))
+    if match is None:
+        return None
+    number = int(match.group(1))
+    return number if number <= max_fractures else None
+
+def get_fracture_id(number: int) -> str:
+    return f"fracture_{number:02d}"
+
+#endregion
+
+#region Name model
+
+@lru_cache(maxsize=cache_size)
+def parse_name(name: str) -> NameModel:
+    base_name, duplicate_index = split_duplicate_suffix(name)
+    prefix = get_fracture_prefix(base_name)
+    role = ""
+    if prefix is not None and base_name[len(prefix):].startswith("_"):
+        role = base_name[len(prefix) + 1:]
+    return NameModel(name, base_name, duplicate_index, prefix, role)
+
+#endregion
+
+#region LODs
+
+@lru_cache(maxsize=cache_size)
+def get_lod(name: str):
+    """LOD number of a collection or object name, or None if the name doesn't end in LODn"""
+    match = lod_name.search(get_base_name(name))
+    return int(match.group(1)) if match else None
+
+#endregion
+
+#region ColliderMeshGroups
+
+def join_groups(groups) -> str:
+    """Value of ColliderMeshGroups / group, in the given order"""
+    return group_separator.join(groups)
+
+@lru_cache(maxsize=cache_size)
+def split_groups(value: str) -> tuple:
+    return tuple(group for group in str(value).split(group_separator) if group)
+
+def get_collider_mesh_groups(groups) -> str:
+    """Deduplicated and sorted ColliderMeshGroups value"""
+    return join_groups(sorted(set(groups)))
+
+def get_unique_base_names(names):
+    """Base names of the names, in order. None if two names share a base name"""
+    base_names = [get_base_name(name) for name in names]
+    if len(base_names) != len(set(base_names)):
+        return None
+    return base_names
+
+#endregion
@@ -1,41 +1,41 @@
 import os
+import time
 from pathlib import Path
 import bpy
 import bmesh
 
-from ..utilities.easybpy import *
-
+from ..utilities.lazy_import import lazy_import
 from ..preferences import get_preferences
+from .fn_export_manifest import hash_export, is_export_current, update_manifest, refresh_manifest_source
+from ..utilities.profiler import profile_export, profile_phase
+from ..utilities.notifications import emit_notification
+from .fn_names import get_base_name, join_groups
+from .fn_fracture_groups import expanded_fracture_groups
+from ..utilities.name_model import get_name_model, get_name_models
+from .fn_export_paths import (
+    get_export_variant_suffix,
+    get_export_variant_dir,
+    get_export_lod_suffix,
+    get_export_filepath,
+)
+
+np = lazy_import('numpy')
+easybpy = lazy_import('..utilities.easybpy', __package__)
 
 
 def op_fix_vrage_project_materials(self, context):
 
-
+    start_time = time.perf_counter()
     prefs = get_preferences()
 
-    def compare_names(name: str, ref: str):
-        if name == ref:
-            return True
-        if name[:-4] == ref:
-            if name[-3:].isdigit():
-                return True
-        else:
-            return False
-
     ##### Remove unused slots
-    scene_objects = bpy.context.scene.objects
-    for obj in scene_objects:
-        if obj.type != "MESH":
-            continue
-        if obj.hide_viewport:
-            continue
-        if not obj.name in bpy.context.view_layer.objects:
-            continue
-        deselect_all_objects()
-        select_object(obj)
-        bpy.ops.object.material_slot_remove_unused()
+    view_layer_objects = bpy.context.view_layer.objects
+    remove_unused_material_slots(
+        [obj for obj in bpy.context.scene.objects if not obj.hide_viewport and obj.name in view_layer_objects]
+        )
 
     ##### Find material .blend
+    blend_files = []
     asset_libraries = bpy.context.preferences.filepaths.asset_libraries
     material_library_name = prefs.project_asset_lib
     for asset_lib in asset_libraries:
@@ -54,82 +54,146 @@ def op_fix_vrage_project_materials(self, context):
             self.report({'ERROR'}, message='Asset library empty')
             return {'CANCELLED'}
 
-    ##### Append materials
-    # Init list of material base names
-    imported_material_names = []
-    # Get a list of all materials in the current scene
-    scene_materials = bpy.data.materials
+    ##### Map local materials by base name
+    # Strip the duplicate suffix once per material instead of once per comparison.
+    # Linked materials are already library materials and are never replaced.
+    local_materials = {}
+    for mat in bpy.data.materials:
+        if mat.library is not None:
+            continue
+        local_materials.setdefault(get_base_name(mat.name), []).append(mat)
 
+    ##### Link materials
+    library_materials = {}
     for blend_file in blend_files:
         with bpy.data.libraries.load(str(blend_file), assets_only=True, link=True) as (data_from, data_to):
-            # Get a list of the materials in the external file
-            external_materials = data_from.materials
-            # Init list of materials to append
-            materials_to_append = []
-            # Go through all the materials in the current scene
-            for scene_material in scene_materials:
-                for external_material in external_materials:
-                    if external_material in materials_to_append:
-                            continue
-                    if compare_names(scene_material.name,external_material):
-                        # Add material name to list
-                        materials_to_append.append(external_material)
-            # Add the external material to the current scene
-            for mat in materials_to_append:
-                data_to.materials.append(mat)
-            # Make names accessible outside of loop
-            imported_material_names.append(materials_to_append)
-
-    # ##### Rename materials
-    # for imported_material in data_to.materials:
-    # #    imported_material.asset_clear()
-    #     for mat_name in imported_material_names:
-    #         if compare_names(imported_material.name,mat_name):
-    #             imported_material.name = mat_name
+            # Only link materials which are used locally and haven't been found in a previous file
+            materials_to_link = [
+                name for name in data_from.materials
+                if name in local_materials and name not in library_materials
+                ]
+            data_to.materials = materials_to_link
+
+        # After the load block, data_to holds the linked datablocks
+        for name, mat in zip(materials_to_link, data_to.materials):
+            if mat is not None:
+                library_materials[name] = mat
 
     ##### Replace materials
-    # Go through all the objects in the current scene
-    for obj in scene_objects:
-        # Go through all the material slots of the object
-        for index, material_slot in enumerate(obj.material_slots):
-            # Get the material in the current material slot
-            old_material = material_slot.material
-            if old_material is None:
-                continue
-            new_material = None
-
-            if old_material.name[:-4] in bpy.data.materials:
-                new_material = old_material.name[:-4]
-            else:
-                new_material = old_material.name
-
-            if new_material is not None:
-                for mat in bpy.data.materials:
-                    if mat.name == new_material:
-                        obj.material_slots[index].material = mat
-            # # Go through all imported materials
-            # for imported_material in data_to.materials:
-            #     # If the material names match, use the external material
-            #     if compare_names(slot_material.name,imported_material.name):
-            #         obj.material_slots[index].material = imported_material
-
-    # Purge unused
-    bpy.ops.outliner.orphans_purge(do_recursive=True)
-    self.report({'INFO'}, message='Done')
+    # Remap all users (material slots of every object and mesh) of a local material in one call
+    replaced_materials = []
+    for base_name, library_material in library_materials.items():
+        for old_material in local_materials[base_name]:
+            old_material.user_remap(library_material)
+            replaced_materials.append(old_material)
+
+    ##### Remove replaced data
+    # Only data replaced by the relink is removed, other unused data in the file is left alone
+    candidates = set(replaced_materials) | collect_material_dependencies(replaced_materials)
+    removed = remove_unused_ids(candidates)
+
+    self.report({'INFO'}, message=(
+        f"Relinked {len(replaced_materials)} material(s), removed {removed} unused data-block(s) "
+        f"in {time.perf_counter() - start_time:.2f}s"
+        ))
+
+def collect_material_dependencies(materials) -> set:
+    """Returns the node groups and images used by the node trees of given materials, including nested node groups"""
+    dependencies = set()
+    node_trees = [mat.node_tree for mat in materials if mat.node_tree is not None]
+    while node_trees:
+        node_tree = node_trees.pop()
+        for node in node_tree.nodes:
+            if node.type == 'GROUP' and node.node_tree is not None and node.node_tree not in dependencies:
+                dependencies.add(node.node_tree)
+                node_trees.append(node.node_tree)
+            image = getattr(node, 'image', None)
+            if image is not None:
+                dependencies.add(image)
+    return dependencies
+
+def remove_unused_ids(candidates) -> int:
+    """Removes those of the given data-blocks which are only used by other removed candidates.
+    All data-blocks are removed in a single call. Returns the number of removed data-blocks"""
+    candidates = {id_data for id_data in candidates if id_data.library is None and not id_data.use_fake_user}
+    user_map = bpy.data.user_map(subset=candidates)
+
+    # Users may be reported as the embedded node tree of a material instead of the material itself
+    owners = {mat.node_tree: mat for mat in candidates if isinstance(mat, bpy.types.Material) and mat.node_tree}
+
+    removable = set()
+    changed = True
+    while changed:
+        changed = False
+        for id_data in candidates - removable:
+            if all(user in removable or owners.get(user) in removable for user in user_map[id_data]):
+                removable.add(id_data)
+                changed = True
+
+    if removable:
+        bpy.data.batch_remove(removable)
+    return len(removable)
+
+def remove_unused_material_slots(objs) -> int:
+    """Removes material slots which are not used by any face, directly on the mesh data.
+    Returns the number of removed slots"""
+
+    # Slots live on the mesh, so objects sharing a mesh are compacted together
+    meshes = {}
+    for obj in objs:
+        if obj.type != 'MESH' or obj.data.library is not None:
+            continue
+        meshes.setdefault(obj.data, []).append(obj)
+
+    removed = 0
+    for mesh, users in meshes.items():
+        slot_count = len(mesh.materials)
+        if slot_count == 0:
+            continue
+
+        indices = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get('material_index', indices)
+        # Out of range indices are drawn with the last slot
+        np.clip(indices, 0, slot_count - 1, out=indices)
+
+        used = np.zeros(slot_count, dtype=bool)
+        used[indices] = True
+        if used.all():
+            continue
+        used_slots = np.flatnonzero(used)
+        remap = (np.cumsum(used) - 1).astype(np.int32)
+
+        # Object-linked slots keep their material on the object, remember them before compacting
+        object_slots = [[(slot.link, slot.material) for slot in obj.material_slots] for obj in users]
+
+        kept_materials = [mesh.materials[i] for i in used_slots]
+        mesh.materials.clear()
+        for mat in kept_materials:
+            mesh.materials.append(mat)
+        mesh.polygons.foreach_set('material_index', remap[indices])
+
+        for obj, slots in zip(users, object_slots):
+            for new_index, old_index in enumerate(used_slots):
+                link, material = slots[old_index]
+                if link == 'OBJECT':
+                    obj.material_slots[new_index].link = 'OBJECT'
+                    obj.material_slots[new_index].material = material
+
+        mesh.update()
+        removed += slot_count - len(kept_materials)
+
+    return removed
 
 def clean_names(objs):
      for obj in objs:
             # if not "Fracture_" in obj.name:
             #     continue
-            if not len(obj.name) >= 4:
-                continue
-            if not obj.name[-4] == ".":
-                continue
-            if not obj.name[-3:].isdigit():
+            model = get_name_model(obj)
+            if model.base_name == model.name:
                 continue
 
             init_name = obj.name
-            new_name = obj.name[:-4]
+            new_name = model.base_name
             obj.name = new_name
             # sometimes just setting the name doesn't work if there is a hidden object in the scene with that name.
             # This addresses that problematic object directly and switches the names:
@@ -139,30 +203,23 @@ def clean_names(objs):
 
 def collision_custom_prop(self, context, selected_objs, active_obj) -> bool:
 
-    # Get the names of all objects except the active one
-    names = [obj.name for obj in selected_objs if obj != active_obj]
-    # Clean names
-    for i, name in enumerate(names):
-        if not name[-4] == ".":
-            continue
-        if not name[-3:].isdigit():
-                continue
-        names[i] = name[:-4]
-    # Check for duplicates
+    # Get the base names of all objects except the active one, they have to be unique
+    names = [model.base_name for model in get_name_models(obj for obj in selected_objs if obj != active_obj)]
     if not len(names) == len(set(names)):
         return False
     # Combine the names into a single string
-    combined_names = '|'.join(names)
+    combined_names = join_groups(names)
 
     active_obj["ColliderMeshGroups"] = combined_names
     active_obj["group"] = combined_names
+    active_obj.update_tag()
     return True
 
 def convex_hull_from_selected():
 
     # Get a BMesh representation
     bm = bmesh.new()   # create an empty BMesh
-    for obj in get_selected_objects():
+    for obj in easybpy.get_selected_objects():
         if not obj.type == 'MESH':
             continue
         # create a temp global-transformed mesh
@@ -203,9 +260,9 @@ def convex_hull_from_selected():
     mod.strength = -0.03
     mod.mid_level = 0
     # select new object
-    deselect_all_objects()
-    select_object(obj)
-    set_active_object(obj)
+    easybpy.deselect_all_objects()
+    easybpy.select_object(obj)
+    easybpy.set_active_object(obj)
     # Add a rigid body physics type if not already present
     if not obj.rigid_body:
         bpy.ops.rigidbody.object_add()
@@ -214,60 +271,120 @@ def convex_hull_from_selected():
 
 #region export funcs
 
-def get_export_variant_suffix(variant) -> str:
-    match variant:
-        case 'NON_FRACTURED':
-            return ""
-        case 'FRACTURED':
-            return "_Fractured"
-        case 'DEFORMED':
-            return "_Deformed"
-        case 'NONE':
-            return ""
-
-def get_export_variant_dir(variant) -> str:
-    match variant:
-        case 'NON_FRACTURED':
-            return "NonFractured"
-        case 'FRACTURED':
-            return "Fractured"
-        case 'DEFORMED':
-            return "Deformed"
-        case 'NONE': #should never happen, but adding it for completeness
-            return "None"
-
-def get_export_lod_suffix(lod) -> str:
-    if lod:
-        return f"_LOD{lod}"
-    else:
-        return ""
-
-def export_fbx_quick(filepath):
-    use_selection = False
-    use_visible = False
-    use_active_collection = False
-    match bpy.context.scene.vrt.export_limit:
+def get_export_objects(context, limit) -> list:
+    """Returns the objects an export limited to `limit` would contain. Doesn't rely on the screen context,
+    so it also works in background mode"""
+    view_layer = context.view_layer
+    match limit:
         case 'SELECTED_OBJECTS':
-            use_selection = True
+            return [obj for obj in view_layer.objects if obj.select_get(view_layer=view_layer)]
         case 'ACTIVE_COLLECTION':
-            use_active_collection = True
+            return list(view_layer.active_layer_collection.collection.all_objects)
         case 'VISIBLE_OBJECTS':
-            use_visible = True
-    
-    bpy.ops.export_scene.fbx(
-    filepath=filepath,
-    check_existing=False,
-    # Limit to
-    use_selection=use_selection,
-    use_visible=use_visible,
-    use_active_collection=use_active_collection,
+            return [obj for obj in view_layer.objects if obj.visible_get(view_layer=view_layer)]
+    return []
+
+def get_export_limit_args(limit) -> dict:
+    return {
+        'use_selection': limit == 'SELECTED_OBJECTS',
+        'use_visible': limit == 'VISIBLE_OBJECTS',
+        'use_active_collection': limit == 'ACTIVE_COLLECTION',
+    }
+
+fbx_quick_settings = {
     # Include
-    object_types={'EMPTY', 'MESH', 'ARMATURE', 'OTHER'},
-    use_custom_props=True,
+    'object_types': {'EMPTY', 'MESH', 'ARMATURE', 'OTHER'},
+    'use_custom_props': True,
     # Transform
-    apply_scale_options='FBX_SCALE_ALL',
+    'apply_scale_options': 'FBX_SCALE_ALL',
+}
+
+gltf_physics_quick_settings = {
+    'export_format': 'GLTF_SEPARATE',
+    'will_save_settings': False,
+    'export_yup': True,
+    'export_gpu_instances': False,
+    'export_apply': False,
+    'export_texcoords': False,
+    'export_normals': False,
+    'export_materials': 'NONE',
+    'export_morph': False,
+    'export_skins': False,
+    'export_animations': False,
+    'export_extras': True,
+}
+
+def export_incremental(filepath, limit, settings, export, force=False) -> bool:
+    """Calls export() unless the file was already written from the same objects and settings.
+    Returns whether the file was written. Profiles the export if enabled in the scene"""
+    context = bpy.context
+    with profile_export(os.path.basename(filepath), context.scene.vrt.use_export_profiler) as profiler:
+        # Fractures stored in a single property are written into the custom properties VRAGE reads, only for the export
+        with expanded_fracture_groups(context.scene, get_export_objects(context, limit)):
+            written = run_incremental_export(context, filepath, limit, settings, export, force)
+
+    if profiler is not None:
+        report_export_profile(context, profiler, filepath, written)
+    return written
+
+def run_incremental_export(context, filepath, limit, settings, export, force=False) -> bool:
+    if not context.scene.vrt.use_incremental_export and not force:
+        with profile_phase("exporter", exporter=settings.get('exporter')):
+            export()
+        # The file no longer matches whatever the manifest says about it
+        with profile_phase("manifest"):
+            update_manifest(filepath)
+        return True
+
+    with profile_phase("hash"):
+        content_hash = hash_export(context, get_export_objects(context, limit), {'limit': limit, **settings})
+    with profile_phase("manifest"):
+        if not force and is_export_current(filepath, content_hash):
+            refresh_manifest_source(filepath)
+            return False
+
+    with profile_phase("exporter", exporter=settings.get('exporter')):
+        export()
+    with profile_phase("manifest"):
+        update_manifest(filepath, content_hash)
+    return True
+
+def report_export_profile(context, profiler, filepath, written):
+    """Writes the Chrome trace next to the exported file and logs a summary"""
+    trace_path = f"{os.path.splitext(filepath)[0]}.trace.json"
+    profiler.write_trace(trace_path)
+
+    state = "" if written else " (skipped, unchanged)"
+    emit_notification(
+        context, 'INFO', 'I002',
+        [os.path.basename(filepath) + state, f"{profiler.duration * 1000:.0f} ms", profiler.get_summary(), trace_path],
+        operator="export"
     )
 
+def export_fbx_quick(filepath, limit=None, force=False) -> bool:
+    if limit is None:
+        limit = bpy.context.scene.vrt.export_limit
+
+    def export():
+        from .fn_export_optimize import optimized_meshes
+
+        # Vertex cache optimization works on temporary copies of the meshes, if enabled
+        with optimized_meshes(bpy.context, get_export_objects(bpy.context, limit)):
+            bpy.ops.export_scene.fbx(
+            filepath=filepath,
+            check_existing=False,
+            # Limit to
+            **get_export_limit_args(limit),
+            **fbx_quick_settings,
+            )
+
+    settings = {
+        'exporter': 'FBX',
+        'optimize_meshes': bpy.context.scene.vrt.use_mesh_optimization,
+        **fbx_quick_settings,
+    }
+    return export_incremental(filepath, limit, settings, export, force)
+
 def export_gltf_physics_invoke():
     bpy.ops.export_scene.gltf(
             'INVOKE_DEFAULT',
@@ -287,37 +404,42 @@ def export_gltf_physics_invoke():
             filter_glob="*.gltf",
             )
 
-def export_gltf_physics_quick(filepath):
-    use_selection = False
-    use_visible = False
-    use_active_collection = False
-    match bpy.context.scene.vrt.export_limit:
-        case 'SELECTED_OBJECTS':
-            use_selection = True
-        case 'ACTIVE_COLLECTION':
-            use_active_collection = True
-        case 'VISIBLE_OBJECTS':
-            use_visible = True
+def export_gltf_physics_quick(filepath, limit=None, force=False) -> bool:
+    from .fn_collider_bake import restore_collider_transforms
 
-    bpy.ops.export_scene.gltf(
-            filepath=filepath,
-            export_format = 'GLTF_SEPARATE',
-            will_save_settings=False,
-            # Limit to
-            use_selection=use_selection,
-            use_visible=use_visible,
-            use_active_collection=use_active_collection,
+    if limit is None:
+        limit = bpy.context.scene.vrt.export_limit
+
+    def export():
+        try:
+            bpy.ops.export_scene.gltf(
+                filepath=filepath,
+                # Limit to
+                **get_export_limit_args(limit),
+                **gltf_physics_quick_settings,
+                )
+        finally:
+            # Colliders are baked by the pre export callback, make sure they are restored even if the export failed
+            restore_collider_transforms()
+
+    props = bpy.context.scene.msft_physics_exporter_props
+    settings = {
+        'exporter': 'GLTF',
+        'physics': props.enabled,
+        'bake_scale': props.bake_scale,
+        'bake_origin': props.bake_origin,
+        **gltf_physics_quick_settings,
+    }
+    return export_incremental(f"{filepath}.gltf", limit, settings, export, force)
+
+def export_collisions(context, filepath, limit=None, force=False) -> bool:
+    """Exports colliders as glTF with the physics extension. Their scale and origin are baked into the exported
+    data by the pre export callback, the scene isn't changed. Returns whether the file was written"""
+    props = context.scene.msft_physics_exporter_props
+    props.enabled = True # Enable havok extention
+    props.bake_scale = True
+    props.bake_origin = True
+
+    return export_gltf_physics_quick(filepath, limit, force)
 
-            export_yup=True,
-            export_gpu_instances=False,
-            export_apply=False,
-            export_texcoords=False,
-            export_normals=False,
-            export_materials='NONE',
-            export_morph=False,
-            export_skins=False,
-            export_animations=False,
-            export_extras=True
-            )
-    
 #endregion
\ No newline at end of file
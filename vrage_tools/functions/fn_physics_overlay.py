@@ -0,0 +1,138 @@
+import numpy as np
+
+# Line geometry of the physics overlay: velocities, centers of mass and inertia boxes of rigid bodies.
+# Doesn't depend on bpy or gpu, every function takes plain sequences and returns float32 arrays of line
+# vertices (two per segment), so the geometry can be built and checked in background mode.
+
+velocity_color = (1.0, 1.0, 0.0, 1.0)
+mass_color = (1.0, 0.0, 1.0, 1.0)
+
+angular_samples = 20
+star_size = 0.1
+
+unit_box = np.array([
+    (-1, -1, -1), (-1, -1,  1),
+    (-1,  1, -1), (-1,  1,  1),
+    ( 1, -1, -1), ( 1, -1,  1),
+    ( 1,  1, -1), ( 1,  1,  1),
+], dtype=np.float64)
+
+# Corner index pairs of the 12 box edges
+box_edges = np.array([
+    0, 1, 2, 3, 4, 5, 6, 7,
+    0, 2, 1, 3, 4, 6, 5, 7,
+    0, 4, 1, 5, 2, 6, 3, 7,
+])
+
+star = np.array([
+    (-1, 0, 0), (1, 0, 0),
+    (0, -1, 0), (0, 1, 0),
+    (0, 0, -1), (0, 0, 1),
+], dtype=np.float64) * star_size
+
+
+#region Math
+
+def transform_points(matrix, points):
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(4, 4)
+    return np.asarray(points, dtype=np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
+
+def normalized(v):
+    length = np.linalg.norm(v)
+    return v / length if length > 0.0 else np.zeros(3)
+
+def perpendicular(v):
+    """A normalized vector perpendicular to v, picked the same way as the original viewport helper"""
+    x, y, z = v
+    d0 = np.array((y, x, 0.0))
+    d1 = np.array((z, 0.0, x))
+    return normalized(d1 if d0 @ d0 < d1 @ d1 else d0)
+
+def rotate(points, axis, angles):
+    """Rotates points[i] around the normalized axis by angles[i] (Rodrigues)"""
+    cos = np.cos(angles)[:, None]
+    sin = np.sin(angles)[:, None]
+    return points * cos + np.cross(axis, points) * sin + np.outer(points @ axis, axis) * (1.0 - cos)
+
+def euler_to_matrix(euler):
+    """Rotation matrix of an XYZ euler, like mathutils.Euler(euler).to_matrix()"""
+    x, y, z = euler
+    cx, sx = np.cos(x), np.sin(x)
+    cy, sy = np.cos(y), np.sin(y)
+    cz, sz = np.cos(z), np.sin(z)
+    rx = np.array(((1, 0, 0), (0, cx, -sx), (0, sx, cx)))
+    ry = np.array(((cy, 0, sy), (0, 1, 0), (-sy, 0, cy)))
+    rz = np.array(((cz, -sz, 0), (sz, cz, 0), (0, 0, 1)))
+    return rz @ ry @ rx
+
+def polyline_to_lines(points):
+    """Vertices of LINES drawing the points as one connected line"""
+    lines = np.empty((max(0, len(points) - 1) * 2, 3), dtype=points.dtype)
+    lines[0::2] = points[:-1]
+    lines[1::2] = points[1:]
+    return lines
+
+#endregion
+
+#region Geometry
+
+def build_velocity_lines(matrix, linear_velocity, angular_velocity):
+    """Linear velocity as a line from the origin, angular velocity as a spiral sampled along it"""
+    linear = np.asarray(linear_velocity, dtype=np.float64)
+    angular = np.asarray(angular_velocity, dtype=np.float64)
+
+    t = np.arange(angular_samples, dtype=np.float64) / angular_samples
+    samples = rotate(np.outer(t, perpendicular(angular)), normalized(angular), np.linalg.norm(angular) * np.pi * t)
+    samples += np.outer(t, linear)
+
+    local = np.vstack(((0.0, 0.0, 0.0), linear, (0.0, 0.0, 0.0), samples))
+    world = transform_points(matrix, local)
+    return np.vstack((world[:2], polyline_to_lines(world[2:])))
+
+def build_mass_lines(matrix, com_override, center_of_mass, inertia_override, inertia_major_axis, inertia_orientation):
+    """Star at the overridden center of mass and box of the overridden inertia tensor"""
+    parts = []
+
+    com = np.asarray(center_of_mass, dtype=np.float64) if com_override else np.zeros(3)
+    if com_override:
+        # The star keeps its size regardless of the object's scale
+        parts.append(transform_points(matrix, com[None, :]) + star)
+
+    if inertia_override:
+        corners = unit_box * np.asarray(inertia_major_axis, dtype=np.float64)
+        corners = corners @ euler_to_matrix(inertia_orientation).T + com
+        parts.append(transform_points(matrix, corners)[box_edges])
+
+    return np.vstack(parts) if parts else np.empty((0, 3))
+
+def build_object_lines(matrix, props: dict, draw_velocity: bool, draw_mass_props: bool):
+    """Returns (positions, colors) of one rigid body. props holds the values of msft_physics_extra_props"""
+    positions = []
+    colors = []
+
+    if draw_velocity:
+        lines = build_velocity_lines(matrix, props['linear_velocity'], props['angular_velocity'])
+        positions.append(lines)
+        colors.append(np.broadcast_to(velocity_color, (len(lines), 4)))
+
+    if draw_mass_props:
+        lines = build_mass_lines(
+            matrix,
+            props['enable_com_override'], props['center_of_mass'],
+            props['enable_inertia_override'], props['inertia_major_axis'], props['inertia_orientation'],
+        )
+        positions.append(lines)
+        colors.append(np.broadcast_to(mass_color, (len(lines), 4)))
+
+    if not positions:
+        return np.empty((0, 3), dtype=np.float32), np.empty((0, 4), dtype=np.float32)
+    return np.vstack(positions).astype(np.float32), np.vstack(colors).astype(np.float32)
+
+def combine_lines(parts):
+    """Concatenates (positions, colors) of many objects into the arrays of a single batch"""
+    parts = [part for part in parts if len(part[0])]
+    if not parts:
+        return np.empty((0, 3), dtype=np.float32), np.empty((0, 4), dtype=np.float32)
+    return np.concatenate([part[0] for part in parts]), np.concatenate([part[1] for part in parts])
+
+#endregion
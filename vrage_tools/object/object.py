@@ -0,0 +1,27 @@
+import bpy
+
+from bpy.types      import PropertyGroup
+from bpy.props      import (IntProperty,
+                            PointerProperty,
+                            StringProperty)
+
+
+# Main class
+class VRT_Object(PropertyGroup):
+    """Holder for VRT Object properties"""
+
+    version: IntProperty(
+        default=1
+    ) # type: ignore
+
+    fracture_group: StringProperty(
+        name="Fracture",
+        description="Group id of the fracture the object belongs to. Written into ColliderMeshGroups, group and FractureGroupName when exporting",
+        default=""
+    ) # type: ignore
+
+    lod_source: PointerProperty(
+        name="LOD Source",
+        description="Object this generated LOD was decimated from. Generating LODs again replaces its mesh",
+        type=bpy.types.Object
+    ) # type: ignore
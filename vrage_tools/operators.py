@@ -1,12 +1,26 @@
 import bpy
 
-from .utilities.easybpy import *
+from .utilities.lazy_import import lazy_import
 from .functions.fn_operators import *
 from .functions.fn_ui import refresh_ui
+from .functions.fn_names import split_groups, get_fracture_id_number
+from .utilities.name_model import get_name_model
+from .utilities.validation import check_export_gate
+from .utilities import block_statistics, validation
+from .functions.fn_fracture_groups import (
+    is_canonical,
+    get_fracture_group,
+    set_fracture_group,
+    remove_fracture_group,
+    migrate_to_canonical,
+    migrate_to_legacy,
+)
 from .preferences import get_preferences
 
 from bpy.types import Context, Operator
 
+easybpy = lazy_import('.utilities.easybpy', __package__)
+
 class VRT_OT_DummyOperator(Operator):
     bl_idname = "scene.vrt_do_nothing"
     bl_label = "Do Nothing"
@@ -19,7 +33,7 @@ class VRT_OT_DummyOperator(Operator):
 class VRT_OT_ReLinkProjectMaterials(Operator):
     bl_idname = "scene.vrt_relink_project_materials"
     bl_label = "Re-link VRAGE Project Materials"
-    bl_description = "Link materials from asset library, delete unused materials slots and purge unused data"
+    bl_description = "Link materials from asset library, delete unused materials slots and remove the replaced materials"
 
     @classmethod
     def poll(cls, context):
@@ -32,6 +46,29 @@ class VRT_OT_ReLinkProjectMaterials(Operator):
         op_fix_vrage_project_materials(self, context)
         return {'FINISHED'}
 
+class VRT_OT_RemoveUnusedMaterialSlots(Operator):
+    bl_idname = "object.vrt_remove_unused_material_slots"
+    bl_label = "Remove Unused Material Slots"
+    bl_description = "Remove material slots which are not used by any face from selected objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        cls.poll_message_set("Mode is not set to 'Object Mode'")
+        return context.mode == 'OBJECT'
+
+    def execute(self, context):
+        objs = easybpy.get_selected_objects()
+
+        if len(objs) == 0:
+            self.report({'WARNING'}, "Nothing selected")
+            return {'CANCELLED'}
+
+        removed = remove_unused_material_slots(objs)
+
+        self.report({'INFO'}, f"Removed {removed} unused material slot(s)")
+        return {'FINISHED'}
+
 class VRT_OT_ResetPaintColor(Operator):
     bl_idname = "scene.vrt_reset_paint_color"
     bl_label = "Reset Paint Color"
@@ -49,7 +86,7 @@ class VRT_OT_CleanNames(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        objs = get_selected_objects()
+        objs = easybpy.get_selected_objects()
 
         if len(objs) == 0:
             self.report({'WARNING'}, "Nothing selected")
@@ -67,14 +104,14 @@ class VRT_OT_AddRigidBody(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        objs = get_selected_objects()
+        objs = easybpy.get_selected_objects()
 
         if len(objs) == 0:
             self.report({'WARNING'}, "Nothing selected")
             return {'CANCELLED'}
 
         for obj in objs:
-            set_active_object(obj)
+            easybpy.set_active_object(obj)
 
             # Add a rigid body physics type if not already present
             if not obj.rigid_body:
@@ -88,7 +125,7 @@ class VRT_OT_AddRigidBody(Operator):
 class VRT_OT_ExportCollisions(Operator):
     bl_idname = "scene.vrt_export_collisions"
     bl_label = "Export Collisions"
-    bl_description = "Apply scale to selected Objects and open exporter dialogue with preset settings"
+    bl_description = "Open exporter dialogue with preset settings. Scale of selected colliders is applied in the exported file only"
     bl_options = {'REGISTER', 'UNDO'}
 
     @classmethod
@@ -102,20 +139,11 @@ class VRT_OT_ExportCollisions(Operator):
         return is_object_mode
 
     def execute(self, context):
-        objs = get_selected_objects()
-        # clean_names(objs) # remove duplicate suffixes
-
-        # apply scale
-        bpy.ops.object.transform_apply(
-            location=False,
-            rotation=False,
-            scale=True,
-            properties=True,
-            isolate_users=True
-            )
-
-        # Invoke glTF export
-        context.scene.msft_physics_exporter_props.enabled = True # Enable havok extention
+        # Invoke glTF export. Scale is baked by the pre export callback
+        props = context.scene.msft_physics_exporter_props
+        props.enabled = True # Enable havok extention
+        props.bake_scale = True
+        props.bake_origin = False
         export_gltf_physics_invoke()
         return {'FINISHED'}
 
@@ -126,8 +154,8 @@ class VTR_OT_LinkCollisionsToFracture(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        selected_objs = get_selected_objects()
-        active_obj = get_active_object()
+        selected_objs = easybpy.get_selected_objects()
+        active_obj = easybpy.get_active_object()
 
         if len(selected_objs) < 2:
             self.report({'WARNING'}, "Select two or more objects")
@@ -148,7 +176,7 @@ class VTR_OT_SelectLinkedCollisions(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        obj = get_selected_objects()
+        obj = easybpy.get_selected_objects()
 
         # check that 1 object is selected
         if not len(obj) == 1:
@@ -161,21 +189,11 @@ class VTR_OT_SelectLinkedCollisions(Operator):
             self.report(type={'WARNING'}, message="Object has no linked collisions")
             return {'CANCELLED'}
 
-        deselect_all_objects()
-        for coll in obj['group'].split("|"):
-            # Find objects which share the same root name
-            matching_objs = []
-            for obj in context.view_layer.objects:
-                # Name matches
-                if obj.name == coll:
-                    matching_objs.append(obj)
-                # Name partially matches
-                elif obj.name[:-4] == coll:
-                    # make sure last 4 chars are duplicate suffix
-                    if obj.name[-4] == "." and obj.name[-3:].isdigit():
-                        matching_objs.append(obj)
-
-            select_objects(matching_objs)
+        easybpy.deselect_all_objects()
+        # Find objects whose name or base name is one of the linked collisions, in a single pass
+        colls = set(split_groups(obj['group']))
+        matching_objs = [o for o in context.view_layer.objects if o.name in colls or get_name_model(o).base_name in colls]
+        easybpy.select_objects(matching_objs)
         return {'FINISHED'}
 
 class VTR_OT_UnlinkCollisionsFractureCollisions(Operator):
@@ -185,12 +203,13 @@ class VTR_OT_UnlinkCollisionsFractureCollisions(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        objs = get_selected_objects()
+        objs = easybpy.get_selected_objects()
         for obj in objs:
             if 'group' in obj.keys():
                 del obj['group']
             if 'ColliderMeshGroups' in obj.keys():
                 del obj['ColliderMeshGroups']
+            obj.update_tag()
         refresh_ui(self, context)
         return {'FINISHED'}
 
@@ -258,17 +277,11 @@ class VTR_OT_fracture_remove(bpy.types.Operator):
         scene = context.scene
         fractures = scene.vrt.fractures_list
 
-        scene_objs = context.scene.objects
-        for obj in scene_objs:
-            if 'ColliderMeshGroups' in obj:
-                if obj['ColliderMeshGroups'] == fractures[len(fractures) - 1].group_id:
-                    del obj['ColliderMeshGroups']
-            if 'group' in obj:
-                if obj['group'] == fractures[len(fractures) - 1].group_id:
-                    del obj['group']
-            if 'FractureGroupName' in obj:
-                if obj['FractureGroupName'] == fractures[len(fractures) - 1].group_id:
-                    del obj['FractureGroupName']
+        canonical = is_canonical(scene)
+        group_id = fractures[len(fractures) - 1].group_id
+        for obj in context.scene.objects:
+            if remove_fracture_group(obj, group_id, canonical):
+                obj.update_tag()
 
         fractures.remove(len(fractures) - 1)
         scene.vrt.fractures_list_active_index = max(0, len(fractures) - 1)
@@ -290,11 +303,13 @@ class VRT_OT_fracture_Assign(Operator):
             self.report({'WARNING'},message="No active fracture!")
             return {'CANCELLED'}
 
-        objs = get_selected_objects()
+        canonical = is_canonical(context.scene)
+        group_id = fractures_list[active_fracture_index].group_id
+        objs = easybpy.get_selected_objects()
         for obj in objs:
-            obj['ColliderMeshGroups'] = fractures_list[active_fracture_index].group_id
-            obj['group'] = fractures_list[active_fracture_index].group_id
-            obj['FractureGroupName'] = fractures_list[active_fracture_index].group_id
+            set_fracture_group(obj, group_id, canonical)
+            # Custom properties don't send depsgraph updates, the block statistics and validation rely on them
+            obj.update_tag()
 
         refresh_ui(self, context)
         return {'FINISHED'}
@@ -309,17 +324,12 @@ class VRT_OT_fracture_Remove(Operator):
         fractures_list = bpy.context.scene.vrt.fractures_list
         active_fracture_index = bpy.context.scene.vrt.fractures_list_active_index
 
-        objs = get_selected_objects()
+        canonical = is_canonical(context.scene)
+        group_id = fractures_list[active_fracture_index].group_id
+        objs = easybpy.get_selected_objects()
         for obj in objs:
-            if 'ColliderMeshGroups' in obj:
-                if obj['ColliderMeshGroups'] == fractures_list[active_fracture_index].group_id:
-                    del obj['ColliderMeshGroups']
-            if 'group' in obj:
-                if obj['group'] == fractures_list[active_fracture_index].group_id:
-                    del obj['group']
-            if 'FractureGroupName' in obj:
-                if obj['FractureGroupName'] == fractures_list[active_fracture_index].group_id:
-                    del obj['FractureGroupName']
+            if remove_fracture_group(obj, group_id, canonical):
+                obj.update_tag()
 
         refresh_ui(self, context)
         return {'FINISHED'}
@@ -334,17 +344,12 @@ class VRT_OT_fracture_Select(Operator):
         fractures_list = bpy.context.scene.vrt.fractures_list
         active_fracture_index = bpy.context.scene.vrt.fractures_list_active_index
 
+        canonical = is_canonical(context.scene)
+        group_id = fractures_list[active_fracture_index].group_id
         objs = bpy.context.view_layer.objects
         for obj in objs:
-            if 'ColliderMeshGroups' in obj:
-                if obj['ColliderMeshGroups'] == fractures_list[active_fracture_index].group_id:
-                    select_object(obj)
-            elif 'group' in obj:
-                if obj['group'] == fractures_list[active_fracture_index].group_id:
-                    select_object(obj)
-            elif 'FractureGroupName' in obj:
-                if obj['FractureGroupName'] == fractures_list[active_fracture_index].group_id:
-                    select_object(obj)
+            if get_fracture_group(obj, canonical) == group_id:
+                easybpy.select_object(obj)
 
         return {'FINISHED'}
 
@@ -358,17 +363,12 @@ class VRT_OT_fracture_Deselect(Operator):
         fractures_list = bpy.context.scene.vrt.fractures_list
         active_fracture_index = bpy.context.scene.vrt.fractures_list_active_index
 
+        canonical = is_canonical(context.scene)
+        group_id = fractures_list[active_fracture_index].group_id
         objs = bpy.context.view_layer.objects
         for obj in objs:
-            if 'ColliderMeshGroups' in obj:
-                if obj['ColliderMeshGroups'] == fractures_list[active_fracture_index].group_id:
-                    deselect_object(obj)
-            elif 'group' in obj:
-                if obj['group'] == fractures_list[active_fracture_index].group_id:
-                    deselect_object(obj)
-            elif 'FractureGroupName' in obj:
-                if obj['FractureGroupName'] == fractures_list[active_fracture_index].group_id:
-                    deselect_object(obj)
+            if get_fracture_group(obj, canonical) == group_id:
+                easybpy.deselect_object(obj)
 
         return {'FINISHED'}
 
@@ -381,18 +381,13 @@ class VRT_OT_fracture_Repopulate_List(Operator):
     def execute(self, context):
         fractures_list = context.scene.vrt.fractures_list
         fracture_ids = [a.group_id for a in fractures_list]
+        canonical = is_canonical(context.scene)
         scene_objs = context.scene.objects
         fracture_objects = []
         
         for obj in scene_objs:
-            fracture_id = None
-            if 'ColliderMeshGroups' in obj:
-                fracture_id = obj['ColliderMeshGroups']
-            elif 'group' in obj:
-                fracture_id = obj['group']
-            elif 'FractureGroupName' in obj:
-                fracture_id = obj['FractureGroupName']
-            else:
+            fracture_id = get_fracture_group(obj, canonical)
+            if fracture_id is None:
                 continue
             if not fracture_id in fracture_ids:
                 fracture_ids.append(fracture_id)
@@ -408,17 +403,9 @@ class VRT_OT_fracture_Repopulate_List(Operator):
         
         has_non_standard_name = False
         for obj in fracture_objects:
-            fracture_id = None
-            if 'ColliderMeshGroups' in obj:
-                fracture_id = obj['ColliderMeshGroups']
-            elif 'group' in obj:
-                fracture_id = obj['group']
-            elif 'FractureGroupName' in obj:
-                fracture_id = obj['FractureGroupName']
-            number = str(fracture_id).replace("fracture_", "")
-            if number.isdigit():
-                if int(number) <= 15:
-                    continue
+            fracture_id = get_fracture_group(obj, canonical)
+            if get_fracture_id_number(fracture_id) is not None:
+                continue
             has_non_standard_name = True
         if has_non_standard_name:
             self.report({'ERROR'}, message="Some fracture group ids don't follow the 'fracture_01' format. Re-assign fractures manually")
@@ -429,6 +416,48 @@ class VRT_OT_fracture_Repopulate_List(Operator):
     def invoke(self, context, _):
         return self.execute(context)
 
+class VRT_OT_fracture_ConvertStorage(Operator):
+    bl_idname = "scene.vrt_fracture_convert_storage"
+    bl_label = "Convert Fracture Storage"
+    bl_description = "Move the fractures of the objects in this scene to the selected storage and use it for this scene"
+    bl_options = {"REGISTER", "UNDO"}
+
+    storage: bpy.props.EnumProperty(
+        items=[
+            ('CANONICAL', "Single Property", "Store the fracture in one property per object"),
+            ('LEGACY', "Custom Properties", "Write the fracture into ColliderMeshGroups, group and FractureGroupName"),
+        ],
+        name="Storage",
+    ) # type: ignore
+
+    def execute(self, context):
+        # Objects shared with scenes which keep the other storage would lose their fracture there
+        shared = {
+            obj.name_full
+            for scene in bpy.data.scenes if scene != context.scene and scene.vrt.fracture_storage != self.storage
+            for obj in scene.objects
+        }
+        objs = [obj for obj in context.scene.objects if obj.name_full not in shared]
+
+        group_ids = {fracture.group_id for fracture in context.scene.vrt.fractures_list}
+        if self.storage == 'CANONICAL':
+            changed = migrate_to_canonical(objs, group_ids)
+        else:
+            changed = migrate_to_legacy(objs, group_ids)
+
+        context.scene.vrt.fracture_storage = self.storage
+        # Every object's fracture is read differently now, not only that of the converted ones
+        block_statistics.mark_all_dirty()
+        validation.mark_all_dirty()
+        refresh_ui(self, context)
+
+        skipped = len(context.scene.objects) - len(objs)
+        if skipped:
+            self.report({'WARNING'}, f"Converted {changed} objects, skipped {skipped} objects shared with scenes using the other storage")
+        else:
+            self.report({'INFO'}, f"Converted {changed} objects")
+        return {'FINISHED'}
+
 #region Sections
 class VRT_OT_section_add(Operator):
     bl_idname = "scene.vrt_section_add"
@@ -500,6 +529,7 @@ class VRT_OT_section_remove(Operator):
                     continue
                 if obj['SECTION'] == section_name:
                     del obj['SECTION']
+                    obj.update_tag()
 
         refresh_ui(self, context)
         return {'FINISHED'}
@@ -518,9 +548,10 @@ class VRT_OT_Section_Assign(Operator):
             self.report({'WARNING'},message="No active section group!")
             return {'CANCELLED'}
 
-        objs = get_selected_objects()
+        objs = easybpy.get_selected_objects()
         for obj in objs:
             obj['SECTION'] = sections_list[active_section_index].name
+            obj.update_tag()
 
         refresh_ui(self, context)
         return {'FINISHED'}
@@ -535,12 +566,13 @@ class VRT_OT_Section_Remove(Operator):
         sections_list = bpy.context.scene.vrt.sections_list
         active_section_index = bpy.context.scene.vrt.sections_list_active_index
 
-        objs = get_selected_objects()
+        objs = easybpy.get_selected_objects()
         for obj in objs:
             if not 'SECTION' in obj:
                 continue
             if obj['SECTION'] == sections_list[active_section_index].name:
                 del obj['SECTION']
+                obj.update_tag()
 
         refresh_ui(self, context)
         return {'FINISHED'}
@@ -560,7 +592,7 @@ class VRT_OT_Section_Select(Operator):
             if not 'SECTION' in obj:
                 continue
             if obj['SECTION'] == sections_list[active_section_index].name:
-                select_object(obj)
+                easybpy.select_object(obj)
 
         return {'FINISHED'}
 
@@ -579,7 +611,7 @@ class VRT_OT_Section_Deselect(Operator):
             if not 'SECTION' in obj:
                 continue
             if obj['SECTION'] == sections_list[active_section_index].name:
-                deselect_object(obj)
+                easybpy.deselect_object(obj)
 
         return {'FINISHED'}
 
@@ -644,7 +676,7 @@ class VRT_OT_QuickExport(Operator):
     def execute(self, context):
         match context.scene.vrt.export_limit:
             case 'SELECTED_OBJECTS':
-                if not get_selected_objects():
+                if not easybpy.get_selected_objects():
                     self.report(type={'WARNING'}, message="Select one or more objects")
                     return {'CANCELLED'}
             case 'ACTIVE_COLLECTION':
@@ -656,28 +688,26 @@ class VRT_OT_QuickExport(Operator):
                     self.report(type={'WARNING'}, message="No objects visible")
                     return {'CANCELLED'}
 
+        if not check_export_gate(self, context):
+            return {'CANCELLED'}
 
         name = context.scene.vrt.export_name
         dir = context.scene.vrt.export_directory
         var = context.scene.vrt.export_variant
         lod = self.export_lod
 
-        filename = f"{name}{get_export_variant_suffix(var)}{get_export_lod_suffix(lod)}"
-        filepath = os.path.join(dir, f"{filename}.fbx") # set path to root dir
-
-        if not var == 'NONE': # if a variant is selected
-            subdir = get_export_variant_dir(var)
-            os.makedirs(name=os.path.join(dir, subdir), exist_ok=True)
-            filepath = os.path.join(dir, subdir, f"{filename}.fbx") # overwrite path to include subdir
+        filepath = get_export_filepath(dir, name, var, lod)
 
-        export_fbx_quick(filepath)
-        self.report({'INFO'}, "Done")
+        if export_fbx_quick(f"{filepath}.fbx"):
+            self.report({'INFO'}, "Done")
+        else:
+            self.report({'INFO'}, "Skipped, nothing changed since the last export")
         return {'FINISHED'}
 
 class VRT_OT_QuickExportCollisions(Operator):
     bl_idname = "scene.vrt_quick_export_collisions"
     bl_label = "Export Collisions"
-    bl_description = "Apply scale to selected Objects and export selected objects directly into its variant folder under selected directory"
+    bl_description = "Export selected objects directly into its variant folder under selected directory, with scale and origin of colliders applied in the exported file only"
     bl_options = {'REGISTER', 'UNDO'}
 
     @classmethod
@@ -710,7 +740,7 @@ class VRT_OT_QuickExportCollisions(Operator):
         objs = None
         match context.scene.vrt.export_limit:
             case 'SELECTED_OBJECTS':
-                objs = get_selected_objects()
+                objs = easybpy.get_selected_objects()
                 if not objs:
                     self.report(type={'WARNING'}, message="Select one or more objects")
                     return {'CANCELLED'}
@@ -725,38 +755,134 @@ class VRT_OT_QuickExportCollisions(Operator):
                     self.report(type={'WARNING'}, message="No objects visible")
                     return {'CANCELLED'}
 
-        deselect_all_objects()
-        for obj in objs:
-            try:
-                select_object(obj)
-            except:
-                pass
-        # apply scale
-        bpy.ops.object.transform_apply(
-            location=False,
-            rotation=False,
-            scale=True,
-            properties=True,
-            isolate_users=True
-            )
-        bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY')
-
-        # Invoke glTF export
-        context.scene.msft_physics_exporter_props.enabled = True # Enable havok extention
+        if not check_export_gate(self, context):
+            return {'CANCELLED'}
 
         name = context.scene.vrt.export_name
         dir = context.scene.vrt.export_directory
         var = context.scene.vrt.export_variant
 
-        filename = f"{name}{get_export_variant_suffix(var)}"
-        filepath = os.path.join(dir, f"{filename}_collision") # set path to root dir
+        filepath = get_export_filepath(dir, name, var, collision=True)
+
+        if export_collisions(context, filepath):
+            self.report({'INFO'}, "Done")
+        else:
+            self.report({'INFO'}, "Skipped, nothing changed since the last export")
+        return {'FINISHED'}
 
-        if not var == 'NONE': # if a variant is selected
-            subdir = get_export_variant_dir(var)
-            os.makedirs(name=os.path.join(dir, subdir), exist_ok=True)
-            filepath = os.path.join(dir, subdir, f"{filename}_collision") # overwrite path to include subdir
+class VRT_OT_GenerateLODs(Operator):
+    bl_idname = "scene.vrt_generate_lods"
+    bl_label = "Generate LODs"
+    bl_description = "Decimate the LOD0 meshes to be exported into LOD1 to LODn objects in the LODn collections. Material boundaries and the custom properties are kept, existing generated LODs are replaced"
+    bl_options = {'REGISTER', 'UNDO'}
 
-        export_gltf_physics_quick(filepath)
-        self.report({'INFO'}, "Done")
+    @classmethod
+    def poll(cls, context):
+        if context.mode != 'OBJECT':
+            cls.poll_message_set("Mode is not set to 'Object Mode'")
+            return False
+        return True
+
+    def execute(self, context):
+        from .functions.fn_lods import generate_lods
+
+        objs = get_export_objects(context, context.scene.vrt.export_limit)
+        ratios = context.scene.vrt.lod_ratios[:context.scene.vrt.lod_count]
+        triangles = generate_lods(context, objs, ratios)
+
+        if not triangles[0]:
+            self.report({'WARNING'}, "No meshes to generate LODs from")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, ", ".join(f"LOD{lod}: {count:,} tris" for lod, count in triangles.items()))
+        return {'FINISHED'}
+
+class VRT_OT_QuickExportLODs(Operator):
+    bl_idname = "scene.vrt_quick_export_lods"
+    bl_label = "Export All LODs"
+    bl_description = "Quick export LOD0 and every generated LOD in its LODn collection in one run"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return VRT_OT_QuickExport.poll(context)
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_confirm(self, event)
+
+    def execute(self, context):
+        from .batch import export_source
+        from .functions.fn_export_job import BatchExportError
+        from .functions.fn_lods import get_lod_collection_name, is_in_lod_collection, selected_only
+
+        if not check_export_gate(self, context):
+            return {'CANCELLED'}
+
+        name = context.scene.vrt.export_name
+        dir = context.scene.vrt.export_directory
+        var = context.scene.vrt.export_variant
+
+        # The export limit may also cover the LODn collections, e.g. an active parent collection or unhidden LODs
+        # Levels without objects are skipped, only those exported are counted
+        exported = written = 0
+        lod0 = [obj for obj in get_export_objects(context, context.scene.vrt.export_limit) if not is_in_lod_collection(obj)]
+        if lod0:
+            with selected_only(context, lod0):
+                written += export_fbx_quick(f"{get_export_filepath(dir, name, var, 0)}.fbx", 'SELECTED_OBJECTS')
+            exported += 1
+
+        lod = 1
+        while bpy.data.collections.get(get_lod_collection_name(lod)) is not None:
+            try:
+                with export_source(context, {'collection': get_lod_collection_name(lod), 'view_layer': None}) as limit:
+                    if get_export_objects(bpy.context, limit):
+                        written += export_fbx_quick(f"{get_export_filepath(dir, name, var, lod)}.fbx", limit)
+                        exported += 1
+            except BatchExportError as e:
+                self.report({'ERROR'}, str(e))
+                return {'CANCELLED'}
+            lod += 1
+
+        if not exported:
+            self.report({'WARNING'}, "No objects to export in LOD0 or the LODn collections")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Exported {exported} LOD(s), {written} file(s) changed")
+        return {'FINISHED'}
+
+class VRT_OT_BatchExport(Operator):
+    bl_idname = "scene.vrt_batch_export"
+    bl_label = "Batch Export"
+    bl_description = "Export all variants, LODs and collisions described by a JSON job file"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(name="Job File", subtype='FILE_PATH') # type: ignore
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'}) # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        if context.mode != 'OBJECT':
+            cls.poll_message_set("Mode is not set to 'Object Mode'")
+            return False
+        return True
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        from .batch import BatchExportError, load_job, run_job
+
+        if not check_export_gate(self, context):
+            return {'CANCELLED'}
+
+        try:
+            job = load_job(bpy.path.abspath(self.filepath))
+            result = run_job(context, job, log=lambda message: None)
+        except BatchExportError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Exported {len(result['written'])} file(s), skipped {len(result['skipped'])} unchanged")
         return {'FINISHED'}
 #endregion
\ No newline at end of file
@@ -2,7 +2,7 @@ import bpy
 import time
 
 from bpy.types import AddonPreferences
-from bpy.props import EnumProperty, StringProperty, BoolProperty, FloatProperty
+from bpy.props import EnumProperty, StringProperty, BoolProperty, FloatProperty, IntProperty
 
 
 def items_project_asset_lib(self, context):
@@ -44,7 +44,58 @@ class VRT_AddonPreferences(AddonPreferences):
         default=0.0
     )
     addon_cache_releases: StringProperty()
-    addon_cache_tags: StringProperty()
+    addon_cache_etag: StringProperty()
+    addon_offline_mode: BoolProperty(
+        name="Offline Mode",
+        description="Never check GitHub for updates",
+        default=False
+    )
+
+    # Notifications
+    notification_capacity: IntProperty(
+        name="Notification History",
+        description="Maximum number of notifications kept in the VRT Notifications screen",
+        default=50,
+        min=1,
+        max=10000
+    )
+    use_notification_log: BoolProperty(
+        name="Use Notification Log",
+        description="Write notifications to a JSONL log file next to the BLEND file instead of storing them inside it. Only the latest notifications are kept in memory",
+        default=False
+    )
+    notification_log_directory: StringProperty(
+        name="Log Directory",
+        description="Directory for notification logs. Leave empty to write the log next to the BLEND file",
+        subtype='DIR_PATH'
+    )
+    notification_log_max_size: IntProperty(
+        name="Max Log Size (KB)",
+        description="Size at which the notification log is rotated",
+        default=1024,
+        min=16
+    )
+    notification_log_backups: IntProperty(
+        name="Log Backups",
+        description="Number of rotated notification logs to keep",
+        default=3,
+        min=0,
+        max=100
+    )
+
+    # Operator statistics
+    use_operator_stats: BoolProperty(
+        name="Record Operator Statistics",
+        description="Record duration, object and polygon counts of every VRAGE Tools operator. Shown in the Operator Statistics panel",
+        default=False
+    )
+    operator_stats_capacity: IntProperty(
+        name="Statistics History",
+        description="Maximum number of recorded operator runs",
+        default=500,
+        min=10,
+        max=100000
+    )
 
 
     def draw(self, context):
@@ -89,9 +140,31 @@ class VRT_AddonPreferences(AddonPreferences):
                 row.alignment = 'RIGHT'
                 row.label(text=preferences.addon_update_message)
 
+        row = box.row(align=True)
+        row.prop(self, "addon_offline_mode")
+
         row = layout.row()
         row.prop(self, "project_asset_lib", text="Project Asset Library")
 
+        box = layout.box()
+        box.label(text="Notifications", icon='INFO')
+        box.prop(self, "notification_capacity")
+        box.prop(self, "use_notification_log")
+        col = box.column()
+        col.enabled = self.use_notification_log
+        col.prop(self, "notification_log_directory")
+        row = col.row()
+        row.prop(self, "notification_log_max_size")
+        row.prop(self, "notification_log_backups")
+
+        box = layout.box()
+        box.label(text="Operator Statistics", icon='TIME')
+        row = box.row()
+        row.prop(self, "use_operator_stats")
+        sub = row.row()
+        sub.enabled = self.use_operator_stats
+        sub.prop(self, "operator_stats_capacity")
+
 
 def get_preferences():
     """Returns the preferences of the addon"""
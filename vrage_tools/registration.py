@@ -0,0 +1,182 @@
+#region Imports
+
+import bpy
+from bpy.app.handlers import persistent
+
+# TODO: We should explicitly import classes instead of wildcards, once we implement everything we need to.
+from .operators                     import *
+from .preferences                   import *
+from .ui                            import *
+
+from .scene.scene                   import *
+from .view_layer.view_layer         import *
+from .text.text                     import *
+from .object.object                 import *
+from .utilities.documentation_link  import *
+from .utilities.notifications       import *
+from .utilities.update_check        import *
+from .utilities.watch_export        import register_watch_export, unregister_watch_export
+from .utilities.validation          import VRT_OT_Validate, register_validation, unregister_validation
+from .utilities.block_statistics    import VRT_OT_ExportBlockStatistics, register_block_statistics, unregister_block_statistics
+from .utilities.operator_stats      import *
+
+from .utilities.MSFT_Physics_settings import MSFT_Physics_register, MSFT_Physics_unregister
+
+# Construction Tool - temporary implementation
+from .tmp_construction_stages_tool  import (
+	ConstructionPropertySettings,
+	OBJECT_PT_construction_panel,
+	OBJECT_OT_apply_selected_properties,
+	OBJECT_OT_detach_materials,
+	# OBJECT_OT_select_objects_by_name,
+	OBJECT_OT_SetFractureGroupDefault,
+	OBJECT_OT_SetFractureGroupHide,
+	OBJECT_OT_SetFractureGroupSupport,
+	OBJECT_OT_SetFractureGroupFrameCut,
+	OBJECT_OT_SetColliderMeshGroups
+ )
+
+classes = (
+    VRT_AddonPreferences,
+
+    VRT_Section,
+    VRT_Fracture,
+    VRT_Scene,
+    VRT_ViewLayer,
+    VRT_Notification,
+    VRT_Text,
+    VRT_Object,
+
+    VRT_PT_Panel,
+    VRT_PT_Panel_subpanel_physics,
+    VRT_PT_BlockProperties,
+    VRT_UL_fractures,
+    VRT_PT_BlockProperties_subpanel_fractures,
+    VRT_MT_Menu_subpanel_fractures_more_options,
+    VRT_UL_sections,
+    VRT_PT_BlockProperties_subpanel_sections,
+    VRT_MT_Menu_subpanel_sections_more_options,
+    VRT_MT_Menu_subpanel_sections_add_preset,
+    VRT_PT_Materials,
+    VRT_PT_Export,
+    VRT_PT_BlockStatistics,
+    VRT_PT_OperatorStats,
+
+    VRT_OT_DummyOperator,
+    VRT_OT_ReLinkProjectMaterials,
+    VRT_OT_RemoveUnusedMaterialSlots,
+    VRT_OT_ResetPaintColor,
+    VRT_OT_CleanNames,
+    VRT_OT_AddRigidBody,
+    VRT_OT_ExportCollisions,
+    VTR_OT_LinkCollisionsToFracture,
+    VTR_OT_SelectLinkedCollisions,
+    VTR_OT_UnlinkCollisionsFractureCollisions,
+    VRT_OT_ConvexHullFromSelected,
+    VTR_OT_fracture_add,
+    VTR_OT_fracture_remove,
+    VRT_OT_fracture_Assign,
+    VRT_OT_fracture_Remove,
+    VRT_OT_fracture_Select,
+    VRT_OT_fracture_Deselect,
+    VRT_OT_fracture_Repopulate_List,
+    VRT_OT_fracture_ConvertStorage,
+    VRT_OT_section_add,
+    VRT_OT_section_add_preset,
+    VRT_OT_section_remove,
+    VRT_OT_Section_Assign,
+    VRT_OT_Section_Remove,
+    VRT_OT_Section_Select,
+    VRT_OT_Section_Deselect,
+    VRT_OT_Section_Repopulate_List,
+    VRT_OT_QuickExport,
+    VRT_OT_QuickExportCollisions,
+    VRT_OT_GenerateLODs,
+    VRT_OT_QuickExportLODs,
+    VRT_OT_BatchExport,
+    VRT_OT_DocuLink,
+    VRT_OT_NotificationDisplay,
+    VRT_OT_DeleteNotification,
+    VRT_OT_ClearnNotification,
+
+    VRT_OT_GetCurrentVersion,
+    VRT_OT_CheckUpdate,
+    VRT_OT_DumpOperatorStats,
+    VRT_OT_Validate,
+    VRT_OT_ExportBlockStatistics,
+    VRT_OT_ClearOperatorStats,
+    
+    # Construction Tool - temporary implementation
+    ConstructionPropertySettings,
+	OBJECT_PT_construction_panel,
+	OBJECT_OT_apply_selected_properties,
+	OBJECT_OT_detach_materials,
+	# OBJECT_OT_select_objects_by_name,
+	OBJECT_OT_SetFractureGroupDefault,
+	OBJECT_OT_SetFractureGroupHide,
+	OBJECT_OT_SetFractureGroupSupport,
+	OBJECT_OT_SetFractureGroupFrameCut,
+	OBJECT_OT_SetColliderMeshGroups
+)
+
+#region (Un)Register
+
+def register():
+
+    # Notifications record the operator which raised them, see utilities/notifications.py
+    track_operators(classes)
+    # Opt-in timing of every VRT operator, see utilities/operator_stats.py
+    instrument_operators(classes)
+
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+    bpy.types.Scene.vrt = bpy.props.PointerProperty(type=VRT_Scene)
+    bpy.types.ViewLayer.vrt = bpy.props.PointerProperty(type=VRT_ViewLayer)
+    bpy.types.Text.vrt = bpy.props.PointerProperty(type=VRT_Text)
+    bpy.types.Object.vrt = bpy.props.PointerProperty(type=VRT_Object)
+
+    MSFT_Physics_register()
+
+    load_notification_catalog()
+
+    bpy.app.handlers.load_post.append(file_load_handler)
+    register_watch_export()
+    register_validation()
+    register_block_statistics()
+    
+    # Construction Tool - temporary implementation
+    bpy.types.Scene.construction_props = bpy.props.PointerProperty(type=ConstructionPropertySettings)
+
+def unregister():
+    # Construction Tool - temporary implementation
+    del bpy.types.Scene.construction_props
+
+    MSFT_Physics_unregister()
+
+    del bpy.types.Object.vrt
+    del bpy.types.Text.vrt
+    del bpy.types.ViewLayer.vrt
+    del bpy.types.Scene.vrt
+
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+
+    uninstrument_operators(classes)
+    untrack_operators(classes)
+
+    unregister_block_statistics()
+    unregister_validation()
+    unregister_watch_export()
+    bpy.app.handlers.load_post.remove(file_load_handler)
+
+#region Event Handlers
+
+@persistent
+def file_load_handler(dummy):
+    bpy.ops.scene.vrt_section_repopulate_list('INVOKE_DEFAULT',)
+    bpy.context.scene.msft_physics_exporter_props.enabled = False # Disable havok extension. It can mess with glTF imports
+
+    # Headless runs (render farm, batch exports) never need to know about updates
+    if not bpy.app.background:
+        bpy.ops.wm.vrt_check_update('INVOKE_DEFAULT', force=False)
\ No newline at end of file
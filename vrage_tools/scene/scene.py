@@ -14,6 +14,9 @@ from bpy.props      import (EnumProperty,
 
 
 from ..utilities.notifications  import display_notification
+from ..utilities.watch_export   import update_use_watch_export
+from ..utilities.validation     import update_use_live_validation
+from ..utilities.block_statistics import update_use_block_statistics
 
 # Update functions
 def update_paint_color_ui(self, context):
@@ -44,6 +47,7 @@ class VRT_Section(PropertyGroup):
                 continue
             if obj['SECTION'] == oldname:
                 obj['SECTION'] = value
+                obj.update_tag()
         self["name"] = value
 
     name: StringProperty(
@@ -99,6 +103,16 @@ class VRT_Scene(PropertyGroup):
 
     fractures_list_active_index: IntProperty() # type: ignore
 
+    fracture_storage: EnumProperty(
+        items=[
+            ('LEGACY', "Custom Properties", "Write the fracture into ColliderMeshGroups, group and FractureGroupName of every object"),
+            ('CANONICAL', "Single Property", "Store the fracture in one property per object. The custom properties VRAGE reads are only written while exporting"),
+        ],
+        name="Fracture Storage",
+        description="How objects remember their fracture. Use Convert Fracture Storage to switch existing scenes",
+        default='LEGACY'
+    ) # type: ignore
+
     sections_list: CollectionProperty(
         type=VRT_Section
         ) # type: ignore
@@ -138,6 +152,97 @@ class VRT_Scene(PropertyGroup):
         description="Limit which objects to export"
     ) # type: ignore
 
+    use_incremental_export: BoolProperty(
+        name="Skip Unchanged",
+        description="Don't rewrite exported files whose objects and export settings haven't changed since the last export. Hashes are kept in a manifest in the export directory",
+        default=True
+    ) # type: ignore
+
+    use_mesh_optimization: BoolProperty(
+        name="Optimize Meshes",
+        description="Weld duplicate vertices and reorder triangles and vertices of temporary mesh copies for the GPU vertex cache before quick exports. The meshes in the scene aren't changed, ACMR before and after is added to the notifications",
+        default=False
+    ) # type: ignore
+
+    use_export_profiler: BoolProperty(
+        name="Profile Exports",
+        description="Record how long each phase of quick exports takes. A Chrome trace (.trace.json) is written next to the exported file and a summary is added to the notifications",
+        default=False
+    ) # type: ignore
+
+    lod_count: IntProperty(
+        name="LODs",
+        description="Number of LODs to generate from LOD0",
+        default=3,
+        min=1,
+        max=4
+    ) # type: ignore
+
+    lod_ratios: FloatVectorProperty(
+        name="Triangle Ratios",
+        description="Share of the LOD0 triangles LOD1 to LOD4 keep",
+        size=4,
+        default=(0.5, 0.25, 0.12, 0.06),
+        min=0.01,
+        max=1.0
+    ) # type: ignore
+
+    use_watch_export: BoolProperty(
+        name="Export on Save",
+        description="Quick export the selected variant whenever the file is saved and objects to export changed since the last export",
+        default=False,
+        update=update_use_watch_export
+    ) # type: ignore
+
+    watch_export_lod: IntProperty(
+        name="LOD",
+        description="LOD to export on save",
+        default=0,
+        min=0,
+        max=4
+    ) # type: ignore
+
+    watch_export_collisions: BoolProperty(
+        name="Collisions",
+        description="Also export collisions on save",
+        default=True
+    ) # type: ignore
+
+    watch_export_delay: FloatProperty(
+        name="Delay",
+        description="Seconds to wait after the last save before exporting",
+        default=1.0,
+        min=0.0,
+        max=60.0,
+        subtype='TIME_ABSOLUTE'
+    ) # type: ignore
+
+    use_live_validation: BoolProperty(
+        name="Live Validation",
+        description="Check the block for problems which block the export while modeling, e.g. too many fractures or ambiguous collider names. Only changed objects are checked again, new problems are added to the notifications",
+        default=False,
+        update=update_use_live_validation
+    ) # type: ignore
+
+    use_block_statistics: BoolProperty(
+        name="Block Statistics",
+        description="Count triangles, draw calls and colliders of the block while modeling. Only changed objects are counted again",
+        default=False,
+        update=update_use_block_statistics
+    ) # type: ignore
+
+    block_statistics_group: EnumProperty(
+        name="Group By",
+        description="Which totals to show in the block statistics",
+        items=(
+            ('SECTION', 'Section', "Totals per SECTION"),
+            ('FRACTURE', 'Fracture', "Totals per fracture group"),
+            ('COLLECTION', 'Collection', "Totals per collection"),
+            ('LOD', 'LOD', "Totals per LOD, taken from LODn collection or object names"),
+        ),
+        default='SECTION'
+    ) # type: ignore
+
     use_experimental_features: BoolProperty(
         name="Enable Experimental",
         description="Enable experimental, work-in-progress features, which may not be compatible with the rest of VRAGE Tools, and may break existing project files."
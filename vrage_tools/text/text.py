@@ -19,7 +19,9 @@ class VRT_Notification(PropertyGroup):
         unit='TIME'
     )
 
-    issue_type: EnumProperty(
+    sequence: IntProperty()
+
+    notification_type: EnumProperty(
         name='Info Type',
         items=(
             ('INFO', 'INFO', ''),
@@ -50,6 +52,22 @@ class VRT_Text(PropertyGroup):
         default=0
     )
 
+    # Index of the oldest notification in the notifications ring buffer
+    notification_head: IntProperty(
+        default=0
+    )
+
+    notification_sequence: IntProperty(
+        default=0
+    )
+
+    notification_page: IntProperty(
+        name="Page",
+        description="Page of the VRT Notifications screen to display",
+        default=1,
+        min=1
+    )
+
     notification_alert: BoolProperty(
         default=False
     )
@@ -1,5 +1,7 @@
 import bpy
-import re
+
+from .functions.fn_names import get_fracture_prefix, is_fracture_group, get_collider_mesh_groups
+from .utilities.name_model import get_name_model, get_object_fracture_group
 
 # Material names
 cut_material = "FracturedMaterial01"
@@ -82,8 +84,7 @@ def detach_faces_with_suffix(obj, material_names, suffix):
 		return None
 
 	# Step 4: rename
-	prefix_match = re.match(r"(Fracture_\d+)", obj.name)
-	base_prefix = prefix_match.group(1) if prefix_match else obj.name
+	base_prefix = get_name_model(obj).fracture_prefix or obj.name
 	suffix_name_map = {
 		"cut": "Cut",
 		"hide": "Hide",
@@ -134,7 +135,7 @@ def detach_faces_with_suffix(obj, material_names, suffix):
 		else:
 			group_name = base_prefix
 
-		if re.match(r"Fracture_\d+", group_name):
+		if is_fracture_group(group_name):
 			new_obj["Group"] = group_name
 			print(f"[Group] Assigned group '{group_name}' to {new_obj.name}")
 
@@ -147,7 +148,7 @@ def detach_faces_with_suffix(obj, material_names, suffix):
 
 		# Apply group to original only if not Hide/Support
 		if preset_name not in ("Hide", "Support"):
-			if re.match(r"Fracture_\d+", group_name):
+			if is_fracture_group(group_name):
 				obj["Group"] = group_name
 				print(f"[Group] Assigned group '{group_name}' to {obj.name}")
 
@@ -273,13 +274,11 @@ class OBJECT_OT_apply_selected_properties(bpy.types.Operator):
 			del obj["ConstructionMeshOrderDuration"]
 
 		# Extract Fracture_XX prefix
-		base_match = re.match(r"^(Fracture_\d+)", obj.name)
-		if not base_match:
+		base = get_name_model(obj).fracture_prefix
+		if not base:
 			print(f"[Apply] Skipping rename/group: {obj.name} has no valid Fracture_XX name.")
 			return
 
-		base = base_match.group(1)
-
 		# Determine name suffix based on preset
 		if preset_name == "Default":
 			target_name = base
@@ -306,7 +305,7 @@ class OBJECT_OT_apply_selected_properties(bpy.types.Operator):
 		else:
 			group_name = base
 
-		if re.match(r"Fracture_\d+", group_name):
+		if is_fracture_group(group_name):
 			obj["Group"] = group_name
 			print(f"[Apply] Group set to '{group_name}' for {obj.name}")
 
@@ -314,16 +313,15 @@ class OBJECT_OT_apply_selected_properties(bpy.types.Operator):
 	def merge_into_existing(obj, preset_name, props, context):
 		OBJECT_OT_apply_selected_properties.apply_properties_to_object(obj, preset_name, props)
 
-		base_match = re.match(r"^(Fracture_\d+)", obj.name)
-		if not base_match:
+		base_name = get_name_model(obj).fracture_prefix
+		if not base_name:
 			print(f"[Merge] Skipping: {obj.name} has no valid Fracture_ prefix.")
 			return
-		base_name = base_match.group(1)
 
 		def is_valid_target(candidate):
 			if candidate == obj:
 				return False
-			if not candidate.name.startswith(base_name):
+			if get_name_model(candidate).fracture_prefix != base_name:
 				return False
 			if not candidate.visible_get():
 				return False  # Not visible in current viewport
@@ -569,9 +567,8 @@ class OBJECT_OT_SetFractureGroupDefault(bpy.types.Operator):
 				self.report({'INFO'}, f"Skipped non-mesh: {obj.name}")
 				continue
 
-			match = re.match(r"(Fracture_\d+)", obj.name)
-			if match:
-				group_name = match.group(1)
+			group_name = get_object_fracture_group(obj)
+			if group_name:
 
 				if "group" in obj:
 					del obj["group"]
@@ -597,9 +594,8 @@ class OBJECT_OT_SetFractureGroupHide(bpy.types.Operator):
 				self.report({'INFO'}, f"Skipped non-mesh: {obj.name}")
 				continue
 
-			match = re.match(r"(Fracture_\d+)", obj.name)
-			if match:
-				group_name = match.group(1) + "_Hide"
+			group_name = get_object_fracture_group(obj, "Hide")
+			if group_name:
 
 				if "group" in obj:
 					del obj["group"]
@@ -625,9 +621,8 @@ class OBJECT_OT_SetFractureGroupSupport(bpy.types.Operator):
 				self.report({'INFO'}, f"Skipped non-mesh: {obj.name}")
 				continue
 
-			match = re.match(r"(Fracture_\d+)", obj.name)
-			if match:
-				group_name = match.group(1) + "_Support"
+			group_name = get_object_fracture_group(obj, "Support")
+			if group_name:
 
 				if "group" in obj:
 					del obj["group"]
@@ -665,12 +660,11 @@ class OBJECT_OT_SetColliderMeshGroups(bpy.types.Operator):
 				continue
 
 			base_group = str(base_group).strip()
-			match = re.match(r"(Fracture_\d+)", base_group)
-			if not match:
+			root_prefix = get_fracture_prefix(base_group)
+			if not root_prefix:
 				print(f"[ColliderMeshGroups] Skipped (Group format invalid): {obj.name} → {base_group}")
 				continue
 
-			root_prefix = match.group(1)
 			collected = set()
 			collected.add(base_group)
 
@@ -692,15 +686,14 @@ class OBJECT_OT_SetColliderMeshGroups(bpy.types.Operator):
 				other_group = str(other_group).strip()
 				print(f"    > Checking {other.name}: Group = '{other_group}'")
 
-				if other_group.startswith(root_prefix):
+				if get_fracture_prefix(other_group) == root_prefix:
 					collected.add(other_group)
 					print(f"    + Collected: {other_group}")
 				else:
 					print(f"    ~ Ignored {other.name} (prefix mismatch: {other_group})")
 
 			# Deduplicate and sort
-			unique_sorted = sorted(set(collected))
-			collider_val = '|'.join(unique_sorted)
+			collider_val = get_collider_mesh_groups(collected)
 			obj["ColliderMeshGroups"] = collider_val
 			self.report({'INFO'}, f"{obj.name} → ColliderMeshGroups = {collider_val}")
 			print(f"[ColliderMeshGroups] {obj.name}: ColliderMeshGroups set to '{collider_val}'")
@@ -721,9 +714,8 @@ class OBJECT_OT_SetFractureGroupFrameCut(bpy.types.Operator):
 				self.report({'INFO'}, f"Skipped non-mesh: {obj.name}")
 				continue
 
-			match = re.match(r"(Fracture_\d+)", obj.name)
-			if match:
-				group_name = match.group(1) + "_FrameCut"
+			group_name = get_object_fracture_group(obj, "FrameCut")
+			if group_name:
 
 				if "group" in obj:
 					del obj["group"]
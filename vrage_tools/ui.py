@@ -32,6 +32,7 @@ class VRT_PT_Panel(Panel):
             layout.separator()
 
         layout.operator('scene.vrt_relink_project_materials',text="Fix Project Materials", icon='MATERIAL')
+        layout.operator('object.vrt_remove_unused_material_slots', text="Remove Unused Slots", icon='MATERIAL_DATA')
         layout.operator("scene.vrt_clean_names", text="Clean Names", icon='SORTALPHA')
 
         layout.operator("wm.vrt_notification_display", icon='INFO')
@@ -59,6 +60,14 @@ class VRT_PT_Panel_subpanel_physics(Panel):
         layout.separator()
         layout.operator("scene.vrt_add_rigid_body",                     text="Add Rigid Body",          icon='PHYSICS')
         layout.operator("object.vrt_convex_hull_from_selected",         text="Generate Convex Hull",    icon='MESH_ICOSPHERE')
+
+        layout.separator()
+        viewer = context.scene.msft_physics_scene_viewer_props
+        layout.label(text="Overlay:", icon='OVERLAY')
+        row = layout.row(align=True)
+        row.prop(viewer, 'draw_velocity', toggle=True, text="Velocities")
+        row.prop(viewer, 'draw_mass_props', toggle=True, text="Mass")
+        layout.prop(viewer, 'draw_all_bodies')
         # layout.label(text="Fractures:")
         # layout.operator('scene.vrt_link_collisions_to_fracture',        text="Link Collisions",         icon='LINKED')
         # layout.operator('scene.vrt_unlink_fracture_collisions',         text="Unlink Collisions",       icon='UNLINKED')
@@ -161,6 +170,9 @@ class VRT_MT_Menu_subpanel_fractures_more_options(Menu):
     def draw(self, context):
         layout = self.layout
         layout.operator("scene.vrt_fracture_repopulate_list", text="Repopulate List", icon='FILE_REFRESH')
+        layout.separator()
+        layout.label(text="Convert Fracture Storage")
+        layout.operator_enum("scene.vrt_fracture_convert_storage", "storage")
 
 class VRT_UL_sections(bpy.types.UIList): # List item class
 
@@ -309,6 +321,15 @@ class VRT_PT_Materials_subpanel_uv(Panel):
         row.prop(context.view_layer.vrt, 'use_color_grid')
 
 
+def draw_validation_summary(layout, context):
+    """Result of the last live validation, drawing doesn't validate"""
+    from .utilities import validation
+
+    errors, warnings = validation.get_issue_counts(validation.validation_issues)
+    row = layout.row()
+    row.alert = errors > 0
+    row.label(text=f"{errors} error(s), {warnings} warning(s)", icon='CANCEL' if errors else 'ERROR' if warnings else 'CHECKMARK')
+
 class VRT_PT_Export(Panel):
     bl_idname = 'VRT_PT_Export'
     bl_label = 'Quick Export'
@@ -332,10 +353,122 @@ class VRT_PT_Export(Panel):
         layout.separator()
         layout.label(text="Quick Export:", icon='EXPORT')
         layout.prop(context.scene.vrt, "export_limit")
+        row = layout.row(align=True)
+        row.prop(context.scene.vrt, "use_incremental_export")
+        row.prop(context.scene.vrt, "use_export_profiler")
+        layout.prop(context.scene.vrt, "use_mesh_optimization")
         grid = layout.grid_flow(row_major=True, columns=2, even_columns=True, even_rows=True, align=True)
         op = grid.operator('scene.vrt_quick_export', text="LOD 0"); op.export_lod = 0
         op = grid.operator('scene.vrt_quick_export', text="LOD 1"); op.export_lod = 1
         op = grid.operator('scene.vrt_quick_export', text="LOD 2"); op.export_lod = 2
         op = grid.operator('scene.vrt_quick_export', text="LOD 3"); op.export_lod = 3
         op = grid.operator('scene.vrt_quick_export', text="LOD 4"); op.export_lod = 4
-        grid.operator('scene.vrt_quick_export_collisions', text="Collision")
\ No newline at end of file
+        grid.operator('scene.vrt_quick_export_collisions', text="Collision")
+
+        layout.separator()
+        box = layout.box()
+        row = box.row(align=True)
+        row.prop(context.scene.vrt, "lod_count")
+        row.operator('scene.vrt_generate_lods', icon='MOD_DECIM')
+        row = box.row(align=True)
+        for lod in range(context.scene.vrt.lod_count):
+            row.prop(context.scene.vrt, "lod_ratios", index=lod, text=f"LOD{lod + 1}")
+        box.operator('scene.vrt_quick_export_lods', icon='EXPORT')
+
+        layout.separator()
+        layout.operator('scene.vrt_batch_export', icon='FILE_SCRIPT')
+
+        layout.separator()
+        box = layout.box()
+        box.prop(context.scene.vrt, "use_watch_export", icon='FILE_REFRESH')
+        col = box.column(align=True)
+        col.active = context.scene.vrt.use_watch_export
+        row = col.row(align=True)
+        row.prop(context.scene.vrt, "watch_export_lod")
+        row.prop(context.scene.vrt, "watch_export_collisions", toggle=True)
+        col.prop(context.scene.vrt, "watch_export_delay")
+
+        layout.separator()
+        row = layout.row(align=True)
+        row.prop(context.scene.vrt, "use_live_validation", icon='CHECKMARK')
+        row.operator('scene.vrt_validate', text="", icon='FILE_REFRESH')
+        if context.scene.vrt.use_live_validation:
+            draw_validation_summary(layout, context)
+
+class VRT_PT_BlockStatistics(Panel):
+    bl_idname = 'VRT_PT_BlockStatistics'
+    bl_label = 'Block Statistics'
+    bl_category = 'VRAGE'
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_order = 5
+
+    def draw_header(self, context):
+        self.layout.prop(context.scene.vrt, "use_block_statistics", text="")
+
+    def draw(self, context):
+        from .utilities import block_statistics
+
+        layout = self.layout
+        layout.active = context.scene.vrt.use_block_statistics
+
+        row = layout.row(align=True)
+        row.prop(context.scene.vrt, "block_statistics_group", text="")
+        row.operator('scene.vrt_export_block_statistics', text="", icon='EXPORT')
+
+        if not context.scene.vrt.use_block_statistics:
+            return
+
+        totals = block_statistics.get_block_statistics(context, context.scene.vrt.block_statistics_group)
+        col = layout.column(align=True)
+        row = col.row()
+        row.label(text="Group")
+        row.label(text="Tris")
+        row.label(text="Draw Calls")
+        row.label(text="Colliders")
+        for total in totals:
+            row = col.row()
+            row.label(text=total.group or "-")
+            row.label(text=f"{total.triangles:,}")
+            row.label(text=str(total.draw_calls))
+            row.label(text=str(total.colliders))
+
+class VRT_PT_OperatorStats(Panel):
+    bl_idname = 'VRT_PT_OperatorStats'
+    bl_label = 'Operator Statistics'
+    bl_category = 'VRAGE'
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_order = 6
+
+    @classmethod
+    def poll(cls, context):
+        return get_preferences().use_operator_stats
+
+    def draw(self, context):
+        from .utilities import operator_stats
+
+        layout = self.layout
+        summaries = operator_stats.get_cached_operator_summaries()
+
+        if not summaries:
+            layout.label(text="No operator runs recorded yet")
+        else:
+            col = layout.column(align=True)
+            row = col.row()
+            row.label(text="Operator")
+            row.label(text="Runs")
+            row.label(text="Slowest")
+            row.label(text="Polygons")
+            for summary in summaries[:10]:
+                row = col.row()
+                row.label(text=summary.label)
+                row.label(text=str(summary.calls))
+                row.label(text=f"{summary.slowest * 1000:.1f} ms")
+                row.label(text=f"{summary.polygons:,}")
+
+        row = layout.row(align=True)
+        row.operator('wm.vrt_dump_operator_stats', icon='EXPORT')
+        row.operator('wm.vrt_clear_operator_stats', text="", icon='TRASH')
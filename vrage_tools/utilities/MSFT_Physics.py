@@ -12,9 +12,7 @@ https://github.com/eoineoineoin/glTF_Physics_Blender_Exporter
 
 
 import bpy
-import gpu
 from io_scene_gltf2.io.com.gltf2_io import Node, Mesh
-from gpu_extras.batch import batch_for_shader
 from mathutils import Matrix, Quaternion, Vector, Euler
 import os, sys, math, traceback
 
@@ -22,6 +20,9 @@ from io_scene_gltf2.io.com.gltf2_io import from_dict, from_union, from_none, fro
 from io_scene_gltf2.io.com.gltf2_io import from_str, from_list, from_bool, from_int
 from io_scene_gltf2.io.com.gltf2_io import to_float, to_class
 
+from .MSFT_Physics_settings import physics_material_combine_types
+from .profiler import profiled, profile_phase, mark_phase, is_profiling
+
 # glTF extensions are named following a convention with known prefixes.
 # See: https://github.com/KhronosGroup/glTF/tree/master/extensions#about-gltf-extensions
 # also: https://github.com/KhronosGroup/glTF/blob/master/extensions/Prefixes.md
@@ -37,14 +38,6 @@ extension_is_required = False
 # Constant used to construct some quaternions when switching up axis
 halfSqrt2 = 2 ** 0.5 * 0.5
 
-# Enum values for friction/restitution combine modes
-physics_material_combine_types = [
-    ('AVERAGE', 'Average', '', 0),
-    ('MINIMUM', 'Minimum', '', 1),
-    ('MAXIMUM', 'Maximum', '', 2),
-    ('MULTIPLY', 'Multiply', '', 3)
-]
-
 def from_vec(x):
     """Utility to convert a vector, in the style of gltf2_io"""
     assert isinstance(x, Vector)
@@ -437,255 +430,6 @@ class RigidBodiesGlTFExtension:
         return result
 
 
-class MSFTPhysicsSceneAdditionalSettings(bpy.types.PropertyGroup):
-    draw_velocity: bpy.props.BoolProperty(name='Draw Velocities', default=False)
-    draw_mass_props: bpy.props.BoolProperty(name='Draw Mass Properties', default=False)
-
-class MSFTPhysicsBodyAdditionalSettings(bpy.types.PropertyGroup):
-    is_trigger: bpy.props.BoolProperty(name='Is Trigger', default=False)
-    gravity_factor: bpy.props.FloatProperty(name='Gravity Factor', default=1.0)
-    linear_velocity: bpy.props.FloatVectorProperty(name='Linear Velocity', default=(0,0,0))
-    angular_velocity: bpy.props.FloatVectorProperty(name='Angular Velocity', default=(0,0,0))
-
-    enable_inertia_override: bpy.props.BoolProperty(name='Override Inertia Tensor', default=False)
-    inertia_major_axis: bpy.props.FloatVectorProperty(name='Inertia Major Axis', default=(1,1,1))
-    inertia_orientation: bpy.props.FloatVectorProperty(name='Inertia Orientation', subtype='EULER')
-
-    enable_com_override: bpy.props.BoolProperty(name='Override Center of Mass', default=False)
-    center_of_mass: bpy.props.FloatVectorProperty(name='Center of Mass', default=(0,0,0))
-
-    friction_combine: bpy.props.EnumProperty(name='Friction Combine mode', items=physics_material_combine_types)
-    restitution_combine: bpy.props.EnumProperty(name='Restitution Combine mode', items=physics_material_combine_types)
-
-class MSFTPhysicsExporterProperties(bpy.types.PropertyGroup):
-    enabled: bpy.props.BoolProperty(
-        name="VRAGE MSFT_Physics", #bl_info['name'],
-        description='Include rigid body data in the exported glTF file.',
-        default=True)
-
-class MSFTPhysicsImporterProperties(bpy.types.PropertyGroup):
-    enabled: bpy.props.BoolProperty(
-        name="VRAGE MSFT_Physics", #bl_info['name'],
-        description='Include rigid body data from the imported glTF file.',
-        default=True)
-
-class MSFTPhysicsSettingsViewportRenderHelper:
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        shaderType = "3D_UNIFORM_COLOR" if bpy.app.version[0] < 4 else "UNIFORM_COLOR"
-        self.shader = gpu.shader.from_builtin(shaderType)
-
-    def _calcPerpNormalized(self, v):
-        v4 = Vector(v.to_tuple() + (0.0,))
-        d0 = v4.yxww
-        d1 = v4.zwxw
-        if d0.length_squared < d1.length_squared:
-            return d1.xyz.normalized()
-        return d0.xyz.normalized()
-
-    def drawExtraPhysicsProperties(self):
-        if not bpy.context.object:
-            return
-        if not bpy.context.object.rigid_body:
-            return
-
-        obj = bpy.context.object
-
-        if bpy.context.scene.msft_physics_scene_viewer_props.draw_velocity:
-            self.draw_velocity(obj)
-
-        if bpy.context.scene.msft_physics_scene_viewer_props.draw_mass_props:
-            self.draw_mass_props(obj)
-
-    def draw_velocity(self, obj):
-        linVel = Vector(obj.msft_physics_extra_props.linear_velocity)
-        angVel = Vector(obj.msft_physics_extra_props.angular_velocity)
-        coords = [(obj.matrix_world @ Vector((0, 0, 0))).to_tuple(),
-                  (obj.matrix_world @ linVel).to_tuple()]
-        batch = batch_for_shader(self.shader, 'LINES', {"pos": coords})
-        self.shader.uniform_float("color", (1, 1, 0, 1))
-        batch.draw(self.shader)
-
-        # Draw some samples of angular Velocity. This doesn't look great,
-        # maybe a more intiutive way to display this.
-        numAngularSamples = 20
-        coords = [coords[0]]
-        avPerp = self._calcPerpNormalized(angVel)
-        avAxis = angVel.normalized()
-        avMag = angVel.length * math.pi
-        for i in range(numAngularSamples):
-            t = float(i) / numAngularSamples
-            avQ = Quaternion(avAxis, avMag * t)
-            sampleLocal = avQ @ (avPerp * t) + linVel * t
-            coords.append((obj.matrix_world @ sampleLocal))
-            coords.append(coords[-1])
-        batch = batch_for_shader(self.shader, 'LINES', {"pos": coords})
-        self.shader.uniform_float("color", (1, 1, 0, 1))
-        batch.draw(self.shader)
-
-    def draw_mass_props(self, obj):
-        if obj.msft_physics_extra_props.enable_com_override:
-            com = Vector(obj.msft_physics_extra_props.center_of_mass)
-
-            star = [Vector((-1,  0,  0)), Vector((1, 0, 0)),
-                    Vector(( 0, -1,  0)), Vector((0, 1, 0)),
-                    Vector(( 0,  0, -1)), Vector((0, 0, 1))]
-            star = [obj.matrix_world @ com + p * 0.1 for p in star]
-            batch = batch_for_shader(self.shader, 'LINES', {"pos": star})
-            self.shader.uniform_float("color", (1, 0, 1, 1))
-            batch.draw(self.shader)
-        else:
-            com = Vector((0.0, 0.0, 0.0))
-
-        unitBox = [Vector((-1, -1, -1)), Vector((-1, -1,  1)),
-                   Vector((-1,  1, -1)), Vector((-1,  1,  1)),
-                   Vector(( 1, -1, -1)), Vector(( 1, -1,  1)),
-                   Vector(( 1,  1, -1)), Vector(( 1,  1,  1))]
-        if obj.msft_physics_extra_props.enable_inertia_override:
-            itLocal = Vector(obj.msft_physics_extra_props.inertia_major_axis)
-            itOrientation = Euler(obj.msft_physics_extra_props.inertia_orientation).to_quaternion()
-            itBox = [obj.matrix_world @ (com + itOrientation @ (v * itLocal)) for v in unitBox]
-            itBox.append(itBox[0])
-            itBox.append(itBox[2])
-            itBox.append(itBox[1])
-            itBox.append(itBox[3])
-
-            itBox.append(itBox[4])
-            itBox.append(itBox[6])
-            itBox.append(itBox[5])
-            itBox.append(itBox[7])
-
-            itBox.append(itBox[0])
-            itBox.append(itBox[4])
-            itBox.append(itBox[1])
-            itBox.append(itBox[5])
-            itBox.append(itBox[2])
-            itBox.append(itBox[6])
-            itBox.append(itBox[3])
-            itBox.append(itBox[7])
-
-            batch = batch_for_shader(self.shader, 'LINES', {"pos": itBox})
-            self.shader.uniform_float("color", (1, 0, 1, 1))
-            batch.draw(self.shader)
-
-viewportRenderHelper = MSFTPhysicsSettingsViewportRenderHelper()
-
-class MSFTPhysicsSettingsViewportPanel(bpy.types.Panel):
-    bl_space_type = 'VIEW_3D'
-    bl_region_type = 'UI'
-    bl_category = 'MSFT Physics'
-    bl_label = 'MSFT Physics'
-    bl_idname = "OBJECT_PT_MSFT_Physics_Viewport_Extensions"
-
-    @classmethod
-    def poll(cls, context):
-        if context.object and context.object.rigid_body:
-            return True
-        return None
-
-    def draw(self, context):
-        layout = self.layout
-        row = layout.row()
-        row.prop(context.scene.msft_physics_scene_viewer_props, 'draw_velocity')
-        row = layout.row()
-        row.prop(context.scene.msft_physics_scene_viewer_props, 'draw_mass_props')
-
-
-class MSFTPhysicsSettingsPanel(bpy.types.Panel):
-    bl_label = 'MSFT Physics Extensions'
-    bl_idname = "OBJECT_PT_MSFT_Physics_Extensions"
-    bl_space_type = 'PROPERTIES'
-    bl_region_type = 'WINDOW'
-    bl_context = 'physics'
-
-    @classmethod
-    def poll(cls, context):
-        if context.object and context.object.rigid_body:
-            return True
-        return None
-
-    def draw(self, context):
-        layout = self.layout
-
-        obj = context.object
-
-        #todo.eoin This feels a little different to Blender's usual UI.
-        # Figure out how to add nice boxes/expanding headers/margins. (Seems to be nested Panels?)
-        row = layout.row()
-        row.prop(obj.msft_physics_extra_props, 'is_trigger')
-        row = layout.row()
-        row.prop(obj.msft_physics_extra_props, 'gravity_factor')
-        row = layout.row()
-        row.prop(obj.msft_physics_extra_props, 'linear_velocity')
-        row = layout.row()
-        row.prop(obj.msft_physics_extra_props, 'angular_velocity')
-
-        row = layout.row()
-        row.prop(obj.msft_physics_extra_props, 'enable_inertia_override')
-        row = layout.row()
-        row.enabled = obj.msft_physics_extra_props.enable_inertia_override
-        row.prop(obj.msft_physics_extra_props, 'inertia_major_axis')
-        row = layout.row()
-        row.enabled = obj.msft_physics_extra_props.enable_inertia_override
-        row.prop(obj.msft_physics_extra_props, 'inertia_orientation')
-
-        row = layout.row()
-        row.prop(obj.msft_physics_extra_props, 'enable_com_override')
-        row = layout.row()
-        row.prop(obj.msft_physics_extra_props, 'center_of_mass')
-        row.enabled = obj.msft_physics_extra_props.enable_com_override
-
-        row = layout.row()
-        row.prop(obj.msft_physics_extra_props, 'friction_combine')
-        row = layout.row()
-        row.prop(obj.msft_physics_extra_props, 'restitution_combine')
-
-draw_handler = None #<todo.eoin Clean this up
-
-# region: register unregister
-from io_scene_gltf2 import exporter_extension_layout_draw, importer_extension_layout_draw
-
-MSFT_Physics_classes = (
-    MSFTPhysicsExporterProperties, 
-    MSFTPhysicsImporterProperties,
-    MSFTPhysicsSceneAdditionalSettings,
-    MSFTPhysicsBodyAdditionalSettings,
-)
-
-def draw_export(context, layout):
-    exportProps = bpy.context.scene.msft_physics_exporter_props
-    col = layout.column()
-    col.use_property_split = False
-    col.prop(exportProps, "enabled")
-
-def draw_import(context, layout):
-    importProps = bpy.context.scene.msft_physics_importer_props
-    col = layout.column()
-    col.use_property_split = False
-    col.prop(importProps, "enabled")
-
-def MSFT_Physics_register():
-    for cls in MSFT_Physics_classes:
-        bpy.utils.register_class(cls)
-    bpy.types.Scene.msft_physics_exporter_props = bpy.props.PointerProperty(type=MSFTPhysicsExporterProperties)
-    bpy.types.Scene.msft_physics_importer_props = bpy.props.PointerProperty(type=MSFTPhysicsImporterProperties)
-    bpy.types.Scene.msft_physics_scene_viewer_props = bpy.props.PointerProperty(type=MSFTPhysicsSceneAdditionalSettings)
-    bpy.types.Object.msft_physics_extra_props = bpy.props.PointerProperty(type=MSFTPhysicsBodyAdditionalSettings)
-    exporter_extension_layout_draw['MSFT_Physics'] = draw_export
-    importer_extension_layout_draw['MSFT_Physics'] = draw_import
-
-def MSFT_Physics_unregister():
-    del importer_extension_layout_draw['MSFT_Physics']
-    del exporter_extension_layout_draw['MSFT_Physics']
-    del bpy.types.Object.msft_physics_extra_props
-    del bpy.types.Scene.msft_physics_scene_viewer_props
-    del bpy.types.Scene.msft_physics_importer_props
-    del bpy.types.Scene.msft_physics_exporter_props
-    for cls in reversed(MSFT_Physics_classes):
-        bpy.utils.unregister_class(cls)
-
-# endregion
-
 class JointFixup():
     """Helper class to store information about how to connect a joint"""
     def __init__(self, joint, connected_idx):
@@ -875,6 +619,16 @@ class glTF2ImportUserExtension:
                             joint.limit_ang_z_lower = minLimit
                             joint.limit_ang_z_upper = maxLimit
 
+def get_profile_node_type(blender_object) -> str:
+    """Category of a node in export profiles, e.g. MESH/CONVEX_HULL for a convex hull collider"""
+    if blender_object is None:
+        return 'NONE'
+    if blender_object.rigid_body is not None:
+        return f"{blender_object.type}/{blender_object.rigid_body.collision_shape}"
+    if blender_object.rigid_body_constraint is not None:
+        return f"{blender_object.type}/{blender_object.rigid_body_constraint.type}"
+    return blender_object.type
+
 class glTF2ExportUserExtension:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -892,7 +646,10 @@ class glTF2ExportUserExtension:
         self.blenderJointObjects = []
         self.blenderNodeToGltfNode = {}
 
+    @profiled('gather_gltf_extensions_hook', 'hook')
     def gather_gltf_extensions_hook(self, gltf2_plan, export_settings):
+        # Nodes and scenes are gathered, the exporter encodes and writes the file next
+        mark_phase('gathered')
         if not self.properties.enabled:
             return
         bpy.context.scene.msft_physics_exporter_props.enabled = False
@@ -913,6 +670,7 @@ class glTF2ExportUserExtension:
                 required = extension_is_required)
             gltf2_plan.extensions[collisionGeom_Extension_Name] = cgRootExtension
 
+    @profiled('gather_scene_hook', 'hook')
     def gather_scene_hook(self, gltf2_scene, blender_scene, export_settings):
         if not self.properties.enabled:
             return
@@ -963,6 +721,14 @@ class glTF2ExportUserExtension:
             gltf_A.children.append(jointInA)
 
     def gather_node_hook(self, gltf2_object, blender_object, export_settings):
+        # Called for every node, the node type is only looked up while profiling
+        if not is_profiling():
+            self._gather_node_hook(gltf2_object, blender_object, export_settings)
+            return
+        with profile_phase('gather_node_hook', get_profile_node_type(blender_object)):
+            self._gather_node_hook(gltf2_object, blender_object, export_settings)
+
+    def _gather_node_hook(self, gltf2_object, blender_object, export_settings):
         if self.properties.enabled:
             self.blenderNodeToGltfNode[blender_object] = gltf2_object
 
@@ -1003,7 +769,8 @@ class glTF2ExportUserExtension:
                 extension_data.rigid_body = rigid_body
 
             if blender_object.rigid_body:
-                collider_data = self._generateColliderData(blender_object, gltf2_object, export_settings)
+                with profile_phase('_generateColliderData', blender_object.rigid_body.collision_shape):
+                    collider_data = self._generateColliderData(blender_object, gltf2_object, export_settings)
                 if collider_data:
                     extension_data.collider = self.ChildOfRootExtension(name = collisionGeom_Extension_Name,
                                                                         path = ['colliders'], required = extension_is_required,
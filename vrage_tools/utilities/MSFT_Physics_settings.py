@@ -0,0 +1,299 @@
+'''
+ATTRIBUTION NOTICE
+
+This file is a modification of an early version of the "KHR_physics_rigid_bodies" add-on, 
+published under Apache-2.0 license. KHR_physics_rigid_bodies is maintained by Eoin Mcloughlin 
+and can be found on GitHub:
+
+https://github.com/eoineoineoin/glTF_Physics_Blender_Exporter
+'''
+
+import bpy
+
+# This module only holds what is needed to register the MSFT_Physics properties.
+# The glTF extension itself lives in MSFT_Physics.py, which is imported when the first glTF import / export starts.
+
+def batch_for_shader(*args, **kwargs):
+    """Wrapper importing gpu_extras on the first draw instead of at registration"""
+    from gpu_extras.batch import batch_for_shader
+    return batch_for_shader(*args, **kwargs)
+
+# Enum values for friction/restitution combine modes
+physics_material_combine_types = [
+    ('AVERAGE', 'Average', '', 0),
+    ('MINIMUM', 'Minimum', '', 1),
+    ('MAXIMUM', 'Maximum', '', 2),
+    ('MULTIPLY', 'Multiply', '', 3)
+]
+
+class MSFTPhysicsSceneAdditionalSettings(bpy.types.PropertyGroup):
+    draw_velocity: bpy.props.BoolProperty(name='Draw Velocities', default=False)
+    draw_mass_props: bpy.props.BoolProperty(name='Draw Mass Properties', default=False)
+    draw_all_bodies: bpy.props.BoolProperty(
+        name='All Rigid Bodies',
+        description='Draw velocities and mass properties of all visible rigid bodies instead of only the active object',
+        default=False)
+
+class MSFTPhysicsBodyAdditionalSettings(bpy.types.PropertyGroup):
+    is_trigger: bpy.props.BoolProperty(name='Is Trigger', default=False)
+    gravity_factor: bpy.props.FloatProperty(name='Gravity Factor', default=1.0)
+    linear_velocity: bpy.props.FloatVectorProperty(name='Linear Velocity', default=(0,0,0))
+    angular_velocity: bpy.props.FloatVectorProperty(name='Angular Velocity', default=(0,0,0))
+
+    enable_inertia_override: bpy.props.BoolProperty(name='Override Inertia Tensor', default=False)
+    inertia_major_axis: bpy.props.FloatVectorProperty(name='Inertia Major Axis', default=(1,1,1))
+    inertia_orientation: bpy.props.FloatVectorProperty(name='Inertia Orientation', subtype='EULER')
+
+    enable_com_override: bpy.props.BoolProperty(name='Override Center of Mass', default=False)
+    center_of_mass: bpy.props.FloatVectorProperty(name='Center of Mass', default=(0,0,0))
+
+    friction_combine: bpy.props.EnumProperty(name='Friction Combine mode', items=physics_material_combine_types)
+    restitution_combine: bpy.props.EnumProperty(name='Restitution Combine mode', items=physics_material_combine_types)
+
+class MSFTPhysicsExporterProperties(bpy.types.PropertyGroup):
+    enabled: bpy.props.BoolProperty(
+        name="VRAGE MSFT_Physics", #bl_info['name'],
+        description='Include rigid body data in the exported glTF file.',
+        default=True)
+    bake_scale: bpy.props.BoolProperty(
+        name="Bake Collider Scale",
+        description='Export colliders with their scale applied to the mesh. The scene is left unchanged.',
+        default=True)
+    bake_origin: bpy.props.BoolProperty(
+        name="Bake Collider Origin",
+        description='Export colliders with their origin moved to the center of their geometry. The scene is left unchanged.',
+        default=False)
+
+class MSFTPhysicsImporterProperties(bpy.types.PropertyGroup):
+    enabled: bpy.props.BoolProperty(
+        name="VRAGE MSFT_Physics", #bl_info['name'],
+        description='Include rigid body data from the imported glTF file.',
+        default=True)
+
+# Values of msft_physics_extra_props the overlay geometry depends on
+overlay_props = (
+    'linear_velocity',
+    'angular_velocity',
+    'enable_com_override',
+    'center_of_mass',
+    'enable_inertia_override',
+    'inertia_major_axis',
+    'inertia_orientation',
+)
+
+class MSFTPhysicsSettingsViewportRenderHelper:
+    """Draws velocities, centers of mass and inertia boxes of rigid bodies. Line geometry is built with NumPy
+    (fn_physics_overlay.py) and cached per object, all objects are drawn with a single batch which is only
+    rebuilt when one of them changed"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        import gpu
+        shaderType = "3D_SMOOTH_COLOR" if bpy.app.version[0] < 4 else "SMOOTH_COLOR"
+        self.shader = gpu.shader.from_builtin(shaderType)
+        # as_pointer() -> (key, serial, positions, colors)
+        self.object_lines = {}
+        self.serial = 0
+        self.batch = None
+        self.batch_key = None
+
+    def get_overlay_objects(self, context, settings) -> list:
+        if settings.draw_all_bodies:
+            return [obj for obj in context.scene.objects if obj.rigid_body and obj.visible_get()]
+        obj = context.object
+        return [obj] if obj and obj.rigid_body else []
+
+    def get_object_lines(self, obj, settings):
+        from ..functions.fn_physics_overlay import build_object_lines
+
+        extra = obj.msft_physics_extra_props
+        props = {}
+        for name in overlay_props:
+            value = getattr(extra, name)
+            props[name] = tuple(value) if hasattr(value, '__len__') else value
+        matrix = tuple(tuple(row) for row in obj.matrix_world)
+        key = (matrix, tuple(props.values()), settings.draw_velocity, settings.draw_mass_props)
+
+        pointer = obj.as_pointer()
+        cached = self.object_lines.get(pointer)
+        if cached is None or cached[0] != key:
+            self.serial += 1
+            cached = (key, self.serial, *build_object_lines(matrix, props, settings.draw_velocity, settings.draw_mass_props))
+            self.object_lines[pointer] = cached
+        return cached
+
+    def drawExtraPhysicsProperties(self):
+        from ..functions.fn_physics_overlay import combine_lines
+
+        context = bpy.context
+        settings = context.scene.msft_physics_scene_viewer_props
+        if not settings.draw_velocity and not settings.draw_mass_props:
+            return
+
+        objs = self.get_overlay_objects(context, settings)
+        parts = [self.get_object_lines(obj, settings) for obj in objs]
+
+        # Cached entries get a new serial when their object changed, so the serials tell if the batch is still valid
+        batch_key = tuple(part[1] for part in parts)
+        if batch_key != self.batch_key:
+            pointers = {obj.as_pointer() for obj in objs}
+            for pointer in [pointer for pointer in self.object_lines if pointer not in pointers]:
+                del self.object_lines[pointer]
+
+            positions, colors = combine_lines([part[2:] for part in parts])
+            self.batch = batch_for_shader(self.shader, 'LINES', {"pos": positions, "color": colors}) if len(positions) else None
+            self.batch_key = batch_key
+
+        if self.batch is not None:
+            self.batch.draw(self.shader)
+
+viewportRenderHelper = None
+
+def get_viewport_render_helper():
+    """Creates the render helper on first use, as shaders are not available while the add-on registers in background mode"""
+    global viewportRenderHelper
+    if viewportRenderHelper is None:
+        viewportRenderHelper = MSFTPhysicsSettingsViewportRenderHelper()
+    return viewportRenderHelper
+
+def draw_physics_overlay():
+    settings = bpy.context.scene.msft_physics_scene_viewer_props
+    # Nothing is loaded for the overlay until it's turned on
+    if settings.draw_velocity or settings.draw_mass_props:
+        get_viewport_render_helper().drawExtraPhysicsProperties()
+
+class MSFTPhysicsSettingsViewportPanel(bpy.types.Panel):
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'MSFT Physics'
+    bl_label = 'MSFT Physics'
+    bl_idname = "OBJECT_PT_MSFT_Physics_Viewport_Extensions"
+
+    @classmethod
+    def poll(cls, context):
+        if context.object and context.object.rigid_body:
+            return True
+        return None
+
+    def draw(self, context):
+        layout = self.layout
+        row = layout.row()
+        row.prop(context.scene.msft_physics_scene_viewer_props, 'draw_velocity')
+        row = layout.row()
+        row.prop(context.scene.msft_physics_scene_viewer_props, 'draw_mass_props')
+        row = layout.row()
+        row.prop(context.scene.msft_physics_scene_viewer_props, 'draw_all_bodies')
+
+
+class MSFTPhysicsSettingsPanel(bpy.types.Panel):
+    bl_label = 'MSFT Physics Extensions'
+    bl_idname = "OBJECT_PT_MSFT_Physics_Extensions"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = 'physics'
+
+    @classmethod
+    def poll(cls, context):
+        if context.object and context.object.rigid_body:
+            return True
+        return None
+
+    def draw(self, context):
+        layout = self.layout
+
+        obj = context.object
+
+        #todo.eoin This feels a little different to Blender's usual UI.
+        # Figure out how to add nice boxes/expanding headers/margins. (Seems to be nested Panels?)
+        row = layout.row()
+        row.prop(obj.msft_physics_extra_props, 'is_trigger')
+        row = layout.row()
+        row.prop(obj.msft_physics_extra_props, 'gravity_factor')
+        row = layout.row()
+        row.prop(obj.msft_physics_extra_props, 'linear_velocity')
+        row = layout.row()
+        row.prop(obj.msft_physics_extra_props, 'angular_velocity')
+
+        row = layout.row()
+        row.prop(obj.msft_physics_extra_props, 'enable_inertia_override')
+        row = layout.row()
+        row.enabled = obj.msft_physics_extra_props.enable_inertia_override
+        row.prop(obj.msft_physics_extra_props, 'inertia_major_axis')
+        row = layout.row()
+        row.enabled = obj.msft_physics_extra_props.enable_inertia_override
+        row.prop(obj.msft_physics_extra_props, 'inertia_orientation')
+
+        row = layout.row()
+        row.prop(obj.msft_physics_extra_props, 'enable_com_override')
+        row = layout.row()
+        row.prop(obj.msft_physics_extra_props, 'center_of_mass')
+        row.enabled = obj.msft_physics_extra_props.enable_com_override
+
+        row = layout.row()
+        row.prop(obj.msft_physics_extra_props, 'friction_combine')
+        row = layout.row()
+        row.prop(obj.msft_physics_extra_props, 'restitution_combine')
+
+draw_handler = None
+
+# region: register unregister
+
+MSFT_Physics_classes = (
+    MSFTPhysicsExporterProperties, 
+    MSFTPhysicsImporterProperties,
+    MSFTPhysicsSceneAdditionalSettings,
+    MSFTPhysicsBodyAdditionalSettings,
+)
+
+def draw_export(context, layout):
+    exportProps = bpy.context.scene.msft_physics_exporter_props
+    col = layout.column()
+    col.use_property_split = False
+    col.prop(exportProps, "enabled")
+    sub = col.column()
+    sub.active = exportProps.enabled
+    sub.prop(exportProps, "bake_scale")
+    sub.prop(exportProps, "bake_origin")
+
+def draw_import(context, layout):
+    importProps = bpy.context.scene.msft_physics_importer_props
+    col = layout.column()
+    col.use_property_split = False
+    col.prop(importProps, "enabled")
+
+def MSFT_Physics_register():
+    from io_scene_gltf2 import exporter_extension_layout_draw, importer_extension_layout_draw
+
+    for cls in MSFT_Physics_classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.msft_physics_exporter_props = bpy.props.PointerProperty(type=MSFTPhysicsExporterProperties)
+    bpy.types.Scene.msft_physics_importer_props = bpy.props.PointerProperty(type=MSFTPhysicsImporterProperties)
+    bpy.types.Scene.msft_physics_scene_viewer_props = bpy.props.PointerProperty(type=MSFTPhysicsSceneAdditionalSettings)
+    bpy.types.Object.msft_physics_extra_props = bpy.props.PointerProperty(type=MSFTPhysicsBodyAdditionalSettings)
+    exporter_extension_layout_draw['MSFT_Physics'] = draw_export
+    importer_extension_layout_draw['MSFT_Physics'] = draw_import
+
+    global draw_handler
+    # There is no viewport to draw into in background mode
+    if not bpy.app.background:
+        draw_handler = bpy.types.SpaceView3D.draw_handler_add(draw_physics_overlay, (), 'WINDOW', 'POST_VIEW')
+
+def MSFT_Physics_unregister():
+    from io_scene_gltf2 import exporter_extension_layout_draw, importer_extension_layout_draw
+
+    global draw_handler, viewportRenderHelper
+    if draw_handler is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(draw_handler, 'WINDOW')
+        draw_handler = None
+    viewportRenderHelper = None
+
+    del importer_extension_layout_draw['MSFT_Physics']
+    del exporter_extension_layout_draw['MSFT_Physics']
+    del bpy.types.Object.msft_physics_extra_props
+    del bpy.types.Scene.msft_physics_scene_viewer_props
+    del bpy.types.Scene.msft_physics_importer_props
+    del bpy.types.Scene.msft_physics_exporter_props
+    for cls in reversed(MSFT_Physics_classes):
+        bpy.utils.unregister_class(cls)
+
+# endregion
@@ -0,0 +1,186 @@
+'''
+Runs the VRAGE Tools pipeline (vrage_tools.batch) on many .blend files in parallel.
+
+Every file is processed by its own `blender -b` process, so a file which crashes Blender only fails itself.
+At most --workers processes run at the same time. This module doesn't depend on bpy:
+
+    python batch_runner.py --blender /path/to/blender --job job.json --steps clean_names,relink_materials,export
+                           --workers 8 --report report.json Blocks/
+
+A job file named <file>.vrt-job.json next to a .blend file is used instead of --job for that file.
+'''
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# Directory which contains the vrage_tools package
+addon_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Exit code of vrage_tools.batch when the job itself is invalid. Retrying it would fail the same way
+job_error_exit_code = 1
+# Exit code Blender uses when the worker raised an unexpected Python exception
+python_error_exit_code = 2
+
+
+def find_blend_files(paths: list) -> list:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                files.extend(os.path.join(directory, name) for name in sorted(filenames) if name.endswith('.blend'))
+        elif path.endswith('.blend'):
+            files.append(path)
+    return [os.path.abspath(file) for file in files]
+
+
+def get_job_path(blend_file: str, default_job: str = None) -> str:
+    sidecar = f"{os.path.splitext(blend_file)[0]}.vrt-job.json"
+    return sidecar if os.path.exists(sidecar) else default_job
+
+
+def build_command(blender: str, blend_file: str, steps: str, job: str, result_path: str,
+                  save: bool = False, factory_startup: bool = False, force: bool = False) -> list:
+    expression = (
+        f"import sys; sys.path.insert(0, {addon_root!r}); "
+        "import vrage_tools.batch; vrage_tools.batch.main()"
+    )
+    command = [blender, '-b']
+    if factory_startup:
+        command.append('--factory-startup')
+    command += [blend_file, '--python-exit-code', str(python_error_exit_code), '--python-expr', expression,
+                '--', '--steps', steps, '--result', result_path]
+    if job:
+        command += ['--job', job]
+    if save:
+        command.append('--save')
+    if force:
+        command.append('--force')
+    return command
+
+
+def run_file(blend_file: str, options) -> dict:
+    """Processes one file, retrying crashes and timeouts. Returns its entry of the report"""
+    job = get_job_path(blend_file, os.path.abspath(options.job) if options.job else None)
+    entry = {'file': blend_file, 'job': job, 'status': 'failed', 'attempts': 0, 'duration': 0.0}
+
+    for attempt in range(1 + options.retries):
+        entry['attempts'] = attempt + 1
+
+        handle, result_path = tempfile.mkstemp(prefix='vrt-result-', suffix='.json')
+        os.close(handle)
+        command = build_command(options.blender, blend_file, options.steps, job, result_path,
+                                options.save, options.factory_startup, options.force)
+
+        start = time.perf_counter()
+        try:
+            process = subprocess.run(command, capture_output=True, text=True, errors='replace', timeout=options.timeout)
+            returncode = process.returncode
+            output = process.stdout + process.stderr
+        except subprocess.TimeoutExpired:
+            returncode = None
+            output = f"Timed out after {options.timeout}s"
+        entry['duration'] += time.perf_counter() - start
+
+        try:
+            with open(result_path, encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            result = {}
+        finally:
+            os.remove(result_path)
+
+        entry['returncode'] = returncode
+        entry['steps'] = result.get('steps', {})
+        entry['exported'] = result.get('exported', [])
+        entry['skipped'] = result.get('skipped', [])
+        entry['error'] = result.get('error')
+
+        if returncode == 0:
+            entry['status'] = 'ok'
+            break
+
+        if not entry['error']:
+            # Blender crashed or was killed before the worker could write its result, keep the end of its output
+            entry['error'] = output[-2000:] if output else f"Blender exited with code {returncode}"
+        if returncode == job_error_exit_code:
+            break
+
+    return entry
+
+
+def run(files: list, options, log=print) -> dict:
+    start = time.perf_counter()
+    results = []
+
+    with ThreadPoolExecutor(max_workers=options.workers) as executor:
+        futures = {executor.submit(run_file, file, options): file for file in files}
+        for index, future in enumerate(as_completed(futures), 1):
+            try:
+                entry = future.result()
+            except Exception as e:
+                entry = {'file': futures[future], 'status': 'failed', 'attempts': 0, 'duration': 0.0, 'error': str(e)}
+            results.append(entry)
+            log(f"[{index}/{len(files)}] {entry['status']:<6} {entry['duration']:7.1f}s  {entry['file']}")
+
+    results.sort(key=lambda entry: entry['file'])
+    failed = [entry for entry in results if entry['status'] != 'ok']
+
+    return {
+        'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'duration': time.perf_counter() - start,
+        'workers': options.workers,
+        'steps': options.steps.split(','),
+        'total': len(results),
+        'succeeded': len(results) - len(failed),
+        'failed': len(failed),
+        'cpu_time': sum(entry['duration'] for entry in results),
+        'written': sum(len(entry.get('exported', [])) for entry in results),
+        'skipped': sum(len(entry.get('skipped', [])) for entry in results),
+        'files': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the VRAGE Tools pipeline on many .blend files in parallel")
+    parser.add_argument('paths', nargs='+', help=".blend files or directories to search for them")
+    parser.add_argument('--blender', default=os.environ.get('BLENDER') or shutil.which('blender') or 'blender',
+                        help="Blender executable, defaults to $BLENDER or blender on PATH")
+    parser.add_argument('--job', help="Job file used for files without their own <file>.vrt-job.json")
+    parser.add_argument('--steps', default='export', help="Comma separated steps: clean_names, relink_materials, export")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Number of Blender processes running at once")
+    parser.add_argument('--retries', type=int, default=1, help="How many times a crashed or timed out file is retried")
+    parser.add_argument('--timeout', type=float, default=1800, help="Seconds after which a file is killed")
+    parser.add_argument('--force', action='store_true', help="Export all files, even if they haven't changed")
+    parser.add_argument('--save', action='store_true', help="Save the .blend files after all steps succeeded")
+    parser.add_argument('--factory-startup', action='store_true', help="Start Blender without user preferences")
+    parser.add_argument('--report', default='vrt-batch-report.json', help="Path of the JSON report")
+    options = parser.parse_args(argv)
+    options.workers = max(1, options.workers)
+
+    files = find_blend_files(options.paths)
+    if not files:
+        print("No .blend files found", file=sys.stderr)
+        return 1
+
+    report = run(files, options)
+    with open(options.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+
+    print(f"{report['succeeded']}/{report['total']} file(s) succeeded in {report['duration']:.1f}s, "
+          f"{report['written']} export(s) written, {report['skipped']} unchanged "
+          f"({report['cpu_time']:.1f}s of work on {options.workers} worker(s)), report written to {options.report}")
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import bpy
+import csv
+
+from collections            import namedtuple
+
+from bpy.app.handlers       import persistent
+from bpy.types              import Operator
+from bpy.props              import StringProperty
+
+from .lazy_import           import lazy_import
+from ..functions.fn_names   import get_lod
+from ..functions.fn_fracture_groups import is_canonical, get_fracture_group, is_fracture_group_value
+
+np = lazy_import('numpy')
+
+
+# Engine budget relevant counts of one object. Colliders only count as colliders, their triangles aren't rendered
+ObjectStats = namedtuple('ObjectStats', ['name', 'triangles', 'vertices', 'draw_calls', 'collider', 'section', 'fracture', 'collection', 'lod'])
+# Totals of a group of objects
+GroupStats = namedtuple('GroupStats', ['group', 'objects', 'triangles', 'vertices', 'draw_calls', 'colliders'])
+
+statistics_groups = ('SECTION', 'FRACTURE', 'COLLECTION', 'LOD')
+
+# as_pointer() -> ObjectStats of the objects of the scene the statistics were computed for
+object_stats = {}
+# Names of objects changed since the statistics were last brought up to date
+dirty_objects = set()
+needs_full_update = True
+stats_scene = None
+# Bumped whenever object_stats changed, the aggregated totals are cached against it
+stats_version = 0
+totals_cache = (None, None, [])
+
+
+#region Counting
+
+def count_mesh(mesh) -> tuple:
+    """Returns (triangles, vertices, draw calls) of a mesh. Every used material index is one draw call"""
+    polygon_count = len(mesh.polygons)
+    if polygon_count == 0:
+        return 0, len(mesh.vertices), 0
+
+    loop_totals = np.empty(polygon_count, dtype='i4')
+    mesh.polygons.foreach_get('loop_total', loop_totals)
+    material_indices = np.empty(polygon_count, dtype='i4')
+    mesh.polygons.foreach_get('material_index', material_indices)
+
+    triangles = int(loop_totals.sum()) - 2 * polygon_count
+    return triangles, len(mesh.vertices), len(np.unique(material_indices))
+
+def get_object_stats(obj, depsgraph, canonical: bool, group_ids) -> ObjectStats:
+    triangles = vertices = draw_calls = 0
+    collider = obj.rigid_body is not None
+
+    if obj.type == 'MESH' and not collider:
+        # Counted after modifiers, as exported
+        triangles, vertices, draw_calls = count_mesh(obj.evaluated_get(depsgraph).data)
+
+    collection = obj.users_collection[0].name if obj.users_collection else ""
+    # group also links colliders by name, that isn't a fracture
+    fracture = get_fracture_group(obj, canonical)
+    if not is_fracture_group_value(fracture, group_ids):
+        fracture = ""
+    lod = get_lod(collection)
+    if lod is None:
+        lod = get_lod(obj.name)
+    return ObjectStats(
+        name=obj.name,
+        triangles=triangles,
+        vertices=vertices,
+        draw_calls=draw_calls,
+        collider=collider,
+        section=str(obj.get('SECTION', "")),
+        fracture=fracture,
+        collection=collection,
+        lod=lod or 0,
+    )
+
+#endregion
+
+#region Service
+
+def update_object_stats(context):
+    """Brings the cached statistics up to date. Only objects changed since the last update are counted again"""
+    global needs_full_update, stats_scene, stats_version
+
+    scene = context.scene
+    depsgraph = context.evaluated_depsgraph_get()
+    canonical = is_canonical(scene)
+    group_ids = {fracture.group_id for fracture in scene.vrt.fractures_list}
+    objects = scene.objects
+
+    if needs_full_update or stats_scene != scene.name:
+        object_stats.clear()
+        for obj in objects:
+            object_stats[obj.as_pointer()] = get_object_stats(obj, depsgraph, canonical, group_ids)
+    elif dirty_objects or len(object_stats) != len(objects):
+        for name in dirty_objects:
+            obj = objects.get(name)
+            if obj is not None:
+                object_stats[obj.as_pointer()] = get_object_stats(obj, depsgraph, canonical, group_ids)
+
+        # Objects were added or deleted
+        if len(object_stats) != len(objects):
+            pointers = {obj.as_pointer(): obj for obj in objects}
+            for pointer in [pointer for pointer in object_stats if pointer not in pointers]:
+                del object_stats[pointer]
+            for pointer, obj in pointers.items():
+                if pointer not in object_stats:
+                    object_stats[pointer] = get_object_stats(obj, depsgraph, canonical, group_ids)
+    else:
+        return
+
+    dirty_objects.clear()
+    needs_full_update = False
+    stats_scene = scene.name
+    stats_version += 1
+
+def aggregate(stats, group: str) -> list:
+    """Totals per section, fracture, collection or LOD, sorted by group name"""
+    field = group.lower()
+    totals = {}
+    for stat in stats:
+        key = str(getattr(stat, field))
+        total = totals.get(key)
+        if total is None:
+            total = totals[key] = [0, 0, 0, 0, 0]
+        total[0] += 1
+        total[1] += stat.triangles
+        total[2] += stat.vertices
+        total[3] += stat.draw_calls
+        total[4] += stat.collider
+    return [GroupStats(key, *values) for key, values in sorted(totals.items())]
+
+def get_block_statistics(context, group: str) -> list:
+    """Aggregated statistics for the panel, only recomputed when objects changed"""
+    global totals_cache
+
+    update_object_stats(context)
+    if totals_cache[:2] != (stats_version, group):
+        totals_cache = (stats_version, group, aggregate(object_stats.values(), group))
+    return totals_cache[2]
+
+def mark_all_dirty():
+    global needs_full_update
+    needs_full_update = True
+
+#endregion
+
+#region Handlers
+
+@persistent
+def statistics_depsgraph_handler(scene, depsgraph):
+    if not scene.vrt.use_block_statistics:
+        return
+
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Object):
+            dirty_objects.add(id_data.name)
+        elif isinstance(id_data, bpy.types.Collection):
+            # Objects were linked or unlinked, their collection and LOD may have changed
+            dirty_objects.update(obj.name for obj in id_data.all_objects)
+
+@persistent
+def statistics_load_handler(dummy):
+    mark_all_dirty()
+    object_stats.clear()
+    dirty_objects.clear()
+
+def update_use_block_statistics(self, context):
+    # Changes made while the statistics were off weren't tracked
+    mark_all_dirty()
+
+#endregion
+
+
+class VRT_OT_ExportBlockStatistics(Operator):
+    """Write the block statistics of every object and the totals per section, fracture, collection and LOD to a CSV file"""
+    bl_idname = "scene.vrt_export_block_statistics"
+    bl_label = "Export Statistics"
+    bl_options = {'REGISTER'}
+
+    filepath: StringProperty(subtype='FILE_PATH') # type: ignore
+    filter_glob: StringProperty(default="*.csv", options={'HIDDEN'}) # type: ignore
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = f"{context.scene.vrt.export_name or 'block'}_statistics.csv"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        update_object_stats(context)
+        stats = sorted(object_stats.values(), key=lambda stat: stat.name)
+
+        with open(bpy.path.abspath(self.filepath), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['kind', 'group', *ObjectStats._fields])
+            for stat in stats:
+                writer.writerow(['OBJECT', "", *stat])
+
+            writer.writerow([])
+            writer.writerow(['kind', *GroupStats._fields])
+            for group in statistics_groups:
+                for total in aggregate(stats, group):
+                    writer.writerow([group, *total])
+
+        self.report({'INFO'}, f"Saved statistics of {len(stats)} objects")
+        return {'FINISHED'}
+
+
+def register_block_statistics():
+    bpy.app.handlers.depsgraph_update_post.append(statistics_depsgraph_handler)
+    bpy.app.handlers.load_post.append(statistics_load_handler)
+
+def unregister_block_statistics():
+    bpy.app.handlers.load_post.remove(statistics_load_handler)
+    bpy.app.handlers.depsgraph_update_post.remove(statistics_depsgraph_handler)
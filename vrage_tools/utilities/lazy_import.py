@@ -0,0 +1,20 @@
+import sys
+import importlib.util
+
+
+def lazy_import(name: str, package: str = None):
+    """Returns a module which is only executed once one of its attributes is accessed.
+    Use it for large modules which are not needed to register the add-on."""
+
+    name = importlib.util.resolve_name(name, package)
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+
+    return module
@@ -0,0 +1,20 @@
+from ..functions.fn_names   import NameModel, parse_name
+
+
+# Parsed names are cached by name in fn_names.parse_name(). A cache per object on top of it saved nothing
+# measurable and had to be pruned on every rename
+
+
+def get_name_model(obj) -> NameModel:
+    """Returns the parsed name of the object: base name, duplicate index, Fracture_XX prefix and role"""
+    return parse_name(obj.name)
+
+def get_name_models(objs) -> list:
+    return [parse_name(obj.name) for obj in objs]
+
+def get_object_fracture_group(obj, role: str = None):
+    """Fracture_XX or Fracture_XX_<role> of the object, None if its name has no Fracture_XX prefix"""
+    prefix = get_name_model(obj).fracture_prefix
+    if prefix is None:
+        return None
+    return f"{prefix}_{role}" if role else prefix
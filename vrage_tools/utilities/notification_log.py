@@ -0,0 +1,178 @@
+'''
+Rotating JSONL sink for VRT notifications.
+
+This module doesn't depend on bpy, so a log can be followed outside of Blender,
+e.g. while a headless batch run is working on a file:
+
+    python notification_log.py --follow path/to/Block.vrt-log.jsonl
+'''
+
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+
+
+class NotificationLog:
+    """Appends notification records to a JSONL file and rotates it once it exceeds max_bytes.
+    Rotated files are kept as <path>.1 (newest) to <path>.<backup_count> (oldest)"""
+
+    def __init__(self, path: str, max_bytes: int = 1048576, backup_count: int = 3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+    def write(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size > 0 and size + len(line.encode('utf-8')) > self.max_bytes:
+            self.rotate()
+
+        with open(self.path, 'a', encoding='utf-8') as log_file:
+            log_file.write(line)
+
+    def rotate(self):
+        if self.backup_count < 1:
+            os.remove(self.path)
+            return
+
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+# Types of the records which change earlier records instead of being notifications themselves
+deletion_type = 'DELETED'
+clear_type = 'CLEARED'
+
+
+def make_record(notification_type: str, code: str, text: str, operator: str = "", objects: list = None) -> dict:
+    return {
+        'id': uuid.uuid4().hex,
+        'timestamp': time.time(),
+        'type': notification_type,
+        'code': code,
+        'text': text,
+        'operator': operator or "",
+        'objects': list(objects) if objects else [],
+    }
+
+
+def make_deletion_record(ids: list) -> dict:
+    """Record which removes the notifications with the given ids when the log is read"""
+    return {'timestamp': time.time(), 'type': deletion_type, 'ids': list(ids)}
+
+
+def make_clear_record() -> dict:
+    """Record which removes all earlier notifications when the log is read"""
+    return {'timestamp': time.time(), 'type': clear_type}
+
+
+def read_records(path: str, count: int = None) -> list:
+    """Returns the last `count` notification records of a log, or all of them if count is None.
+    Deleted and cleared notifications are left out"""
+    if not os.path.exists(path):
+        return []
+
+    # Records of older logs have no id, they can't be deleted one by one
+    records = {}
+    with open(path, encoding='utf-8') as log_file:
+        for number, line in enumerate(log_file):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line may be cut off if Blender crashed while writing it
+                continue
+
+            if record.get('type') == clear_type:
+                records.clear()
+            elif record.get('type') == deletion_type:
+                for record_id in record.get('ids', []):
+                    records.pop(record_id, None)
+            else:
+                records[record.get('id') or number] = record
+
+    records = list(records.values())
+    return records[max(0, len(records) - count):] if count is not None else records
+
+
+def follow(path: str, interval: float = 0.5, from_end: bool = False):
+    """Yields records as they are appended to the log. Handles rotation of the log file.
+    With from_end, records which are already in the log are skipped"""
+    position = os.path.getsize(path) if from_end and os.path.exists(path) else 0
+    while True:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            time.sleep(interval)
+            continue
+
+        # The file got smaller, it has been rotated
+        if size < position:
+            position = 0
+
+        if size > position:
+            with open(path, encoding='utf-8') as log_file:
+                log_file.seek(position)
+                for line in log_file:
+                    if not line.endswith("\n"):
+                        break
+                    position += len(line.encode('utf-8'))
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        else:
+            time.sleep(interval)
+
+
+def format_record(record: dict) -> str:
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record.get('timestamp', 0)))
+    if record.get('type') == clear_type:
+        return f"{timestamp} {clear_type}"
+    if record.get('type') == deletion_type:
+        return f"{timestamp} {deletion_type} {len(record.get('ids', []))} notification(s)"
+    text = f"{timestamp} {record.get('type', '')} {record.get('code', '')}: {record.get('text', '')}"
+    if record.get('operator'):
+        text += f" [{record['operator']}]"
+    if record.get('objects'):
+        text += f" ({', '.join(record['objects'])})"
+    return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print or follow a VRT notification log")
+    parser.add_argument('path', help="Path of the .vrt-log.jsonl file")
+    parser.add_argument('-n', '--tail', type=int, default=20, help="Number of records to print")
+    parser.add_argument('-f', '--follow', action='store_true', help="Keep printing records as they are written")
+    parser.add_argument('--json', action='store_true', help="Print raw JSON records")
+    args = parser.parse_args(argv)
+
+    def output(record):
+        print(json.dumps(record) if args.json else format_record(record), flush=True)
+
+    for record in read_records(args.path, args.tail):
+        output(record)
+
+    if args.follow:
+        try:
+            for record in follow(args.path, from_end=True):
+                output(record)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,52 @@
 import bpy
 import os
+import math
 import time
 import json
 
+from collections            import namedtuple, deque
+from contextlib             import contextmanager
+
 from bpy.types              import Operator
 from bpy.props              import IntProperty
 
 from ..text.text            import get_blend_data
 from .generic               import wrap_text
+from .notification_log      import NotificationLog, make_record, make_deletion_record, make_clear_record, read_records
+from ..functions.fn_ui      import refresh_ui
+from ..preferences          import get_preferences
+
+# Number of notifications drawn per page of the notifications popup
+notifications_per_page = 20
+
+NotificationEntry = namedtuple('NotificationEntry', ('index', 'number', 'notification_type', 'code', 'time', 'lines'))
+
+
+class LoggedNotification:
+    """In-memory copy of a notification written to the notification log"""
+    __slots__ = ('sequence', 'record_id', 'timestamp', 'notification_type', 'code', 'text')
+
+    def __init__(self, sequence, record_id, timestamp, notification_type, code, text):
+        self.sequence = sequence
+        self.record_id = record_id
+        self.timestamp = timestamp
+        self.notification_type = notification_type
+        self.code = code
+        self.text = text
+
+
+# While the notification log is used, only the latest notifications are kept in memory (oldest first)
+# instead of being stored in the BLEND file
+recent_notifications = deque()
+recent_notifications_path = None
+recent_notifications_sequence = 0
+
+# bl_idnames of the operators currently running, innermost last, so notifications know which operator raised them
+running_operators = []
+
+# Open notification logs by path
+notification_logs = {}
+
 
 class VRT_OT_NotificationDisplay(Operator):
     """Displays a list of notifications from VRT"""
@@ -16,16 +55,16 @@ class VRT_OT_NotificationDisplay(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
 
-    notifications_sorted = []
+    # Filtered entries of the popup, rebuilt only when the notifications or display filters change
+    view_model = []
+    view_key = None
 
 
     def execute(self, context):
         data = get_blend_data()
 
-        self.notifications_sorted.clear()
-        self.notifications_sorted = sorted(data.vrt.notifications, key=lambda notification: notification.timestamp, reverse=True)
-
         data.vrt.notification_alert = False
+        data.vrt.notification_page = 1
 
         return context.window_manager.invoke_popup(self, width=600)
 
@@ -34,17 +73,22 @@ class VRT_OT_NotificationDisplay(Operator):
         data = get_blend_data()
         layout = self.layout
 
+        entries = get_notification_view(data.vrt)
+        page_count = max(1, math.ceil(len(entries) / notifications_per_page))
+        page = min(data.vrt.notification_page, page_count) - 1
+
         layout.label(text="VRT Notifications", icon='INFO')
 
-        if len(self.notifications_sorted) < 1:
+        if count_notifications(data.vrt) < 1:
             layout.separator(factor=1.0)
             layout.label(text="VRT has not generated any notifications so far.")
         else:
             split = layout.split(factor=0.75)
-            split.label(text="This list displays the last 50 notifications generated by VRT.")
-            split.operator('wm.vrt_clear_notification', icon='REMOVE')
+            split.label(text=f"This list displays the last {get_preferences().notification_capacity} notifications generated by VRT.")
+            split.operator('wm.vrt_clear_notifications', icon='REMOVE')
             row = layout.row()
             split = row.split(factor=0.6)
+            split.prop(data.vrt, 'notification_page', text=f"Page (of {page_count})")
             split = row.split(factor=0.8)
             split.label(text="")
             split.prop(data.vrt, 'display_errors', icon='CANCEL', text="")
@@ -52,66 +96,57 @@ class VRT_OT_NotificationDisplay(Operator):
             split.prop(data.vrt, 'display_infos', icon='INFO', text="")
             layout.separator(factor=1.0)
 
-        for notification in self.notifications_sorted:
-
-            index = self.notifications_sorted.index(notification)
-
-            if notification.notification_type == 'ERROR' and not data.vrt.display_errors:
-                continue
-            if notification.notification_type == 'WARNING' and not data.vrt.display_warnings:
-                continue
-            if notification.notification_type == 'INFO' and not data.vrt.display_infos:
-                continue
+        for entry in entries[page * notifications_per_page:(page + 1) * notifications_per_page]:
 
             box = layout.box()
 
             split = box.split(factor=0.025)
             row = split.row()
-            if notification.notification_type == 'ERROR':
+            if entry.notification_type == 'ERROR':
                 row.alert = True
-            elif notification.notification_type == 'INFO':
+            elif entry.notification_type == 'INFO':
                 row.active = False
-            row.label(text=str(index + 1))
+            row.label(text=str(entry.number))
 
             split = split.split(factor=0.70)
             row = split.row()
-            if notification.notification_type == 'INFO':
+            if entry.notification_type == 'INFO':
                 row.active = False
 
-            if notification.notification_type == 'ERROR':
+            if entry.notification_type == 'ERROR':
                 row.alert = True
                 icon = 'CANCEL'
-            elif notification.notification_type == 'WARNING':
+            elif entry.notification_type == 'WARNING':
                 icon = 'ERROR'
             else:
                 icon = 'INFO'
-            row.label(text=notification.notification_type, icon=icon)
-            row.label(text=notification.code)
-            row.label(text=time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(notification.timestamp)))
+            row.label(text=entry.notification_type, icon=icon)
+            row.label(text=entry.code)
+            row.label(text=entry.time)
 
             col = box.column()
-            if notification.notification_type == 'ERROR':
+            if entry.notification_type == 'ERROR':
                 col.alert = True
 
-            for text in wrap_text(notification.text, 110):
+            for text in entry.lines:
                 row = col.row()
                 row.scale_y = 0.75
-                if notification.notification_type == 'INFO':
+                if entry.notification_type == 'INFO':
                     row.active = False
                 row.label(text=text)
 
             split = split.split(factor=0.85)
             row = split.row()
-            if notification.notification_type == 'ERROR':
+            if entry.notification_type == 'ERROR':
                 row.alert = True
-            if notification.notification_type == 'ERROR' or notification.notification_type == 'WARNING':
+            if entry.notification_type == 'ERROR' or entry.notification_type == 'WARNING':
                 docu = row.operator('wm.vrt_docu_link', text="How to Fix", icon='INFO')
                 docu.section = 'Tools/VRT/'
                 docu.page = 'Notifications/'
-                docu.code = notification.code
+                docu.code = entry.code
 
             op = split.operator('wm.vrt_delete_notification', icon='REMOVE', text="", emboss=False)
-            op.idx = index
+            op.idx = entry.index
 
         layout.separator(factor=1.0)
         split = layout.split(factor=0.75)
@@ -133,13 +168,28 @@ class VRT_OT_DeleteNotification(Operator):
 
         data = get_blend_data()
 
-        for index in range(0, len(data.vrt.notifications)):
-            if data.vrt.notifications[index] == self.notifications_sorted[self.idx]:
-                data.vrt.notifications.remove(index)
-                break
+        if use_notification_log():
+            if not 0 <= self.idx < len(recent_notifications):
+                return {'CANCELLED'}
+            # The log is only appended to, the deletion is recorded so it persists when the log is read again
+            record_id = recent_notifications[self.idx].record_id
+            if record_id:
+                get_notification_log().write(make_deletion_record([record_id]))
+            del recent_notifications[self.idx]
+            return {'FINISHED'}
+
+        notifications = data.vrt.notifications
+
+        if not 0 <= self.idx < len(notifications):
+            return {'CANCELLED'}
+
+        notifications.remove(self.idx)
 
-        self.notifications_sorted.clear()
-        self.notifications_sorted = sorted(data.vrt.notifications, key=lambda notification: notification.timestamp, reverse=True)
+        # Keep the head pointing at the oldest notification
+        if self.idx < data.vrt.notification_head:
+            data.vrt.notification_head -= 1
+        elif data.vrt.notification_head >= len(notifications):
+            data.vrt.notification_head = 0
 
         return {'FINISHED'}
 
@@ -155,61 +205,322 @@ class VRT_OT_ClearnNotification(Operator):
 
         data = get_blend_data()
         data.vrt.notifications.clear()
-        self.notifications_sorted.clear()
+        data.vrt.notification_head = 0
+
+        if use_notification_log():
+            sync_recent_notifications()
+            get_notification_log().write(make_clear_record())
+        recent_notifications.clear()
 
         return {'FINISHED'}
 
 
-def display_notification(context, notification_type: str, code: str, variables: list = []):
+@contextmanager
+def running_operator(bl_idname: str):
+    """Attributes the notifications emitted inside the block to the operator"""
+    running_operators.append(bl_idname)
+    try:
+        yield
+    finally:
+        running_operators.pop()
+
+
+def track_method(cls, name: str):
+    method = cls.__dict__[name]
+
+    # Blender checks the number of arguments of operator methods, *args wouldn't register
+    if name == 'execute':
+        def tracked(self, context):
+            with running_operator(cls.bl_idname):
+                return method(self, context)
+    else:
+        def tracked(self, context, event):
+            with running_operator(cls.bl_idname):
+                return method(self, context, event)
+
+    tracked.__name__ = method.__name__
+    tracked.__doc__ = method.__doc__
+    tracked.untracked = method
+    setattr(cls, name, tracked)
+
+
+def track_operators(classes):
+    """Wraps execute(), invoke() and modal() of all operators in `classes`, so the notification log records which
+    operator raised a notification. Must be called before the classes are registered"""
+    for cls in classes:
+        if not isinstance(cls, type) or not issubclass(cls, Operator):
+            continue
+        for name in ('execute', 'invoke', 'modal'):
+            method = cls.__dict__.get(name)
+            if method is not None and not hasattr(method, 'untracked'):
+                track_method(cls, name)
+
+
+def untrack_operators(classes):
+    for cls in classes:
+        for name in ('execute', 'invoke', 'modal'):
+            method = cls.__dict__.get(name)
+            if method is not None and hasattr(method, 'untracked'):
+                setattr(cls, name, method.untracked)
+
+
+def use_notification_log() -> bool:
+    return get_preferences().use_notification_log
+
+
+def get_notification_log_path() -> str:
+    """Returns the path of the notification log of the current BLEND file"""
+    preferences = get_preferences()
+
+    if bpy.data.filepath:
+        directory, filename = os.path.split(bpy.data.filepath)
+        name = os.path.splitext(filename)[0]
+    else:
+        directory = bpy.app.tempdir
+        name = "untitled"
+
+    if preferences.notification_log_directory:
+        directory = bpy.path.abspath(preferences.notification_log_directory)
+
+    return os.path.join(directory, f"{name}.vrt-log.jsonl")
+
+
+def get_notification_log() -> NotificationLog:
+    preferences = get_preferences()
+    path = get_notification_log_path()
+
+    log = notification_logs.get(path)
+    if log is None:
+        log = notification_logs[path] = NotificationLog(path)
+    log.max_bytes = preferences.notification_log_max_size * 1024
+    log.backup_count = preferences.notification_log_backups
+
+    return log
+
+
+def sync_recent_notifications():
+    """Reloads the in-memory notifications from the log, if the log of another file was mirrored so far"""
+    global recent_notifications_path, recent_notifications_sequence
+
+    path = get_notification_log_path()
+    capacity = get_preferences().notification_capacity
+
+    if path != recent_notifications_path:
+        recent_notifications.clear()
+        for record in read_records(path, capacity):
+            recent_notifications_sequence += 1
+            recent_notifications.append(LoggedNotification(
+                recent_notifications_sequence,
+                record.get('id', ""),
+                record.get('timestamp', 0.0),
+                record.get('type', 'INFO'),
+                record.get('code', ""),
+                record.get('text', ""),
+                ))
+        recent_notifications_path = path
+
+    while len(recent_notifications) > capacity:
+        recent_notifications.popleft()
+
+
+def count_notifications(vrt) -> int:
+    if use_notification_log():
+        sync_recent_notifications()
+        return len(recent_notifications)
+    return len(vrt.notifications)
+
+
+def iter_notifications(vrt):
+    """Yields (index, notification) pairs of the active notification store, newest first"""
+    if use_notification_log():
+        sync_recent_notifications()
+        count = len(recent_notifications)
+        for number, notification in enumerate(reversed(recent_notifications)):
+            yield count - 1 - number, notification
+        return
+
+    notifications = vrt.notifications
+    count = len(notifications)
+    for number in range(count):
+        # Walk the ring backwards, starting at the newest notification just before the head
+        index = (vrt.notification_head - 1 - number) % count
+        yield index, notifications[index]
+
+
+def get_notification_view(vrt) -> list:
+    """Returns the notifications to display, newest first and filtered by the display toggles.
+    The result is cached until a notification is added or removed, or a filter changes"""
+
+    if use_notification_log():
+        sync_recent_notifications()
+        key = ('LOG', recent_notifications_path, recent_notifications_sequence, len(recent_notifications),
+               vrt.display_errors, vrt.display_warnings, vrt.display_infos)
+    else:
+        key = ('BLEND', vrt.notification_sequence, len(vrt.notifications), vrt.notification_head,
+               vrt.display_errors, vrt.display_warnings, vrt.display_infos)
+    if key == VRT_OT_NotificationDisplay.view_key:
+        return VRT_OT_NotificationDisplay.view_model
+
+    shown = {'ERROR': vrt.display_errors, 'WARNING': vrt.display_warnings, 'INFO': vrt.display_infos}
+
+    entries = []
+    for number, (index, notification) in enumerate(iter_notifications(vrt)):
+        if not shown.get(notification.notification_type, True):
+            continue
+        entries.append(NotificationEntry(
+            index=index,
+            number=number + 1,
+            notification_type=notification.notification_type,
+            code=notification.code,
+            time=time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(notification.timestamp)),
+            lines=wrap_text(notification.text, 110),
+            ))
+
+    VRT_OT_NotificationDisplay.view_model = entries
+    VRT_OT_NotificationDisplay.view_key = key
+
+    return entries
 
-    json_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'notifications.json')
 
-    with open(json_path) as json_file:
+catalog_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'notifications.json')
+
+# Format templates per notification type and code, filled by load_notification_catalog()
+notification_catalog = {}
+notification_catalog_mtime = None
+
+
+def load_notification_catalog(force=False) -> dict:
+    """Loads the notification texts, only re-reading notifications.json if it changed since the last load"""
+    global notification_catalog, notification_catalog_mtime
+
+    mtime = os.stat(catalog_path).st_mtime_ns
+    if not force and mtime == notification_catalog_mtime:
+        return notification_catalog
+
+    with open(catalog_path) as json_file:
         data = json.load(json_file)
 
-    text = data[notification_type][code]
-    text = text.format(*variables)
+    # Keep the bound format method of each text, so emitting a notification doesn't touch the raw json
+    notification_catalog = {
+        notification_type: {code: text.format for code, text in codes.items()}
+        for notification_type, codes in data.items()
+    }
+    notification_catalog_mtime = mtime
+
+    return notification_catalog
+
+
+def emit_notification(context, notification_type: str, code: str, variables: list = [], operator: str = "", objects: list = None) -> str:
+    """Formats, prints and stores a notification without any UI feedback. Returns the notification text.
+    The operator and object names are only recorded in the notification log. The bl_idname of the running
+    operator is recorded if there is one, operator names the source otherwise (e.g. timers and handlers)"""
+
+    text = load_notification_catalog()[notification_type][code](*variables)
+    if running_operators:
+        operator = running_operators[-1]
 
     if notification_type == 'ERROR':
-        show_popup(context, "Report: Error", text)
         print(f"VRT Error: {text} ({code})")
     elif notification_type == 'WARNING':
         print(f"VRT Warning: {text} ({code})")
     elif notification_type == 'INFO':
         print(f"VRT Info: {text} ({code})")
 
-    add_to_notifications(context, notification_type, text, code)
+    add_to_notifications(context, notification_type, text, code, operator, objects)
+
+    return text
+
+
+def display_notification(context, notification_type: str, code: str, variables: list = [], operator: str = "", objects: list = None):
+
+    text = emit_notification(context, notification_type, code, variables, operator, objects)
+
+    if notification_type == 'ERROR':
+        show_popup(context, "Report: Error", text)
+
+
+def display_notifications(context, notifications: list, operator: str = ""):
+    """Displays many notifications at once, given as (notification_type, code, variables) tuples,
+    optionally followed by a list of object names. Errors are collected into a single popup
+    and the UI is only redrawn once"""
+
+    errors = []
+    for notification_type, code, variables, *objects in notifications:
+        text = emit_notification(context, notification_type, code, variables, operator, objects[0] if objects else None)
+        if notification_type == 'ERROR':
+            errors.append(text)
+
+    if len(errors) == 1:
+        show_popup(context, "Report: Error", errors[0])
+    elif len(errors) > 1:
+        show_popup(context, f"Report: {len(errors)} Errors", errors)
 
+    refresh_ui(None, context)
 
-def show_popup(context, title, text: str):
-    """Displays a popup message that looks like an error report."""
+
+def show_popup(context, title, text):
+    """Displays a popup message that looks like an error report. Pass a list to display one line per entry."""
+
+    lines = [text] if isinstance(text, str) else text
 
     def draw(self, context):
-        self.layout.label(text=text)
+        for line in lines:
+            self.layout.label(text=line)
 
     context.window_manager.popup_menu(draw, title=title, icon='ERROR')
 
 
-def add_to_notifications(context, notification_type: str, text: str, code: str):
-    data = get_blend_data()
-    notifications = data.vrt.notifications
+def add_to_notifications(context, notification_type: str, text: str, code: str, operator: str = "", objects: list = None):
+    global recent_notifications_sequence
 
-    while len(notifications) > 49:
-        oldest = None
-        for index in range(0, len(notifications)):
-            if oldest == None:
-                oldest = index
-            elif notifications[index].timestamp < oldest:
-                oldest = index
+    data = get_blend_data()
 
-        notifications.remove(oldest)
+    if notification_type == 'ERROR':
+        data.vrt.notification_alert = True
+
+    if use_notification_log():
+        # Mirror the existing log before writing to it, so the new record isn't loaded twice
+        sync_recent_notifications()
+        record = make_record(notification_type, code or "", text, operator, objects)
+        get_notification_log().write(record)
+
+        recent_notifications_sequence += 1
+        recent_notifications.append(LoggedNotification(
+            recent_notifications_sequence, record['id'], record['timestamp'], notification_type, code or "", text
+            ))
+        if len(recent_notifications) > get_preferences().notification_capacity:
+            recent_notifications.popleft()
+        return
 
-    notification = notifications.add()
+    notifications = data.vrt.notifications
+    capacity = get_preferences().notification_capacity
+
+    # The notifications form a ring buffer: notification_head is the index of the oldest entry,
+    # the newest entry sits just before it.
+    while len(notifications) > capacity:
+        notifications.remove(data.vrt.notification_head)
+        if data.vrt.notification_head >= len(notifications):
+            data.vrt.notification_head = 0
+
+    if len(notifications) == capacity:
+        # Overwrite the oldest notification
+        index = data.vrt.notification_head
+        data.vrt.notification_head = (index + 1) % capacity
+    elif data.vrt.notification_head == 0:
+        notifications.add()
+        index = len(notifications) - 1
+    else:
+        # Insert right after the newest notification
+        notifications.add()
+        index = data.vrt.notification_head
+        notifications.move(len(notifications) - 1, index)
+        data.vrt.notification_head += 1
+
+    data.vrt.notification_sequence += 1
+
+    notification = notifications[index]
+    notification.sequence = data.vrt.notification_sequence
     notification.timestamp = time.time()
     notification.notification_type = notification_type
     notification.text = text
-
-    if code is not None:
-        notification.code = code
-    if notification_type == 'ERROR':
-        data.vrt.notification_alert = True
\ No newline at end of file
+    notification.code = code if code is not None else ""
@@ -0,0 +1,166 @@
+import bpy
+import json
+import time
+
+from collections            import namedtuple, deque
+
+from bpy.types              import Operator
+from bpy.props              import StringProperty
+
+from ..preferences          import get_preferences
+
+
+OperatorRecord = namedtuple('OperatorRecord', ['timestamp', 'operator', 'label', 'seconds', 'result', 'selected', 'objects', 'polygons'])
+OperatorSummary = namedtuple('OperatorSummary', ['operator', 'label', 'calls', 'total', 'slowest', 'polygons'])
+
+# Class name prefixes of the operators which are instrumented
+instrumented_prefixes = ('VRT_OT_', 'VTR_OT_', 'OBJECT_OT_')
+
+operator_records = deque(maxlen=500)
+# Bumped whenever a record is added, so the panel knows when to rebuild its summary
+operator_records_version = 0
+
+
+#region Instrumentation
+
+def count_polygons(objs) -> int:
+    meshes = {obj.data for obj in objs if obj.type == 'MESH'}
+    return sum(len(mesh.polygons) for mesh in meshes)
+
+def add_operator_record(record: OperatorRecord):
+    global operator_records, operator_records_version
+
+    capacity = get_preferences().operator_stats_capacity
+    if operator_records.maxlen != capacity:
+        operator_records = deque(operator_records, maxlen=capacity)
+
+    operator_records.append(record)
+    operator_records_version += 1
+
+def instrument_execute(cls):
+    execute = cls.execute
+
+    def instrumented_execute(self, context):
+        if not get_preferences().use_operator_stats:
+            return execute(self, context)
+
+        # The operator is measured on the objects it's going to work on, it may change the selection
+        selected = list(context.selected_objects) if hasattr(context, 'selected_objects') else []
+        objs = selected or list(context.scene.objects)
+
+        start = time.perf_counter()
+        result = execute(self, context)
+        seconds = time.perf_counter() - start
+
+        add_operator_record(OperatorRecord(
+            timestamp=time.time(),
+            operator=cls.bl_idname,
+            label=cls.bl_label,
+            seconds=seconds,
+            result=", ".join(sorted(result)) if result else "",
+            selected=len(selected),
+            objects=len(objs),
+            polygons=count_polygons(objs),
+        ))
+        return result
+
+    instrumented_execute.__name__ = execute.__name__
+    instrumented_execute.__doc__ = execute.__doc__
+    instrumented_execute.original = execute
+    cls.execute = instrumented_execute
+
+def instrument_operators(classes):
+    """Wraps execute() of all VRT operators in `classes`. Must be called before the classes are registered"""
+    for cls in classes:
+        if not issubclass(cls, Operator) or not cls.__name__.startswith(instrumented_prefixes):
+            continue
+        # Don't record the statistics operators themselves
+        if cls.__module__ == __name__:
+            continue
+        if 'execute' not in cls.__dict__ or hasattr(cls.execute, 'original'):
+            continue
+        instrument_execute(cls)
+
+def uninstrument_operators(classes):
+    for cls in classes:
+        execute = cls.__dict__.get('execute')
+        if execute is not None and hasattr(execute, 'original'):
+            cls.execute = execute.original
+
+#endregion
+
+#region Summary
+
+def get_operator_summaries() -> list:
+    """Returns one OperatorSummary per operator, slowest first"""
+    summaries = {}
+    for record in operator_records:
+        summary = summaries.get(record.operator)
+        if summary is None:
+            summaries[record.operator] = OperatorSummary(record.operator, record.label, 1, record.seconds, record.seconds, record.polygons)
+        else:
+            summaries[record.operator] = summary._replace(
+                calls=summary.calls + 1,
+                total=summary.total + record.seconds,
+                slowest=max(summary.slowest, record.seconds),
+                polygons=max(summary.polygons, record.polygons),
+            )
+    return sorted(summaries.values(), key=lambda summary: summary.slowest, reverse=True)
+
+summary_cache = (None, [])
+
+def get_cached_operator_summaries() -> list:
+    """Summaries for the panel, only recomputed when a record was added"""
+    global summary_cache
+    if summary_cache[0] != operator_records_version:
+        summary_cache = (operator_records_version, get_operator_summaries())
+    return summary_cache[1]
+
+#endregion
+
+
+class VRT_OT_DumpOperatorStats(Operator):
+    """Write the recorded operator statistics to a JSON file"""
+    bl_idname = "wm.vrt_dump_operator_stats"
+    bl_label = "Save Operator Statistics"
+    bl_options = {'REGISTER'}
+
+    filepath: StringProperty(subtype='FILE_PATH') # type: ignore
+    filter_glob: StringProperty(default="*.json", options={'HIDDEN'}) # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        cls.poll_message_set("No operator runs recorded")
+        return len(operator_records) > 0
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "vrt_operator_stats.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        data = {
+            'blender': bpy.app.version_string,
+            'file': bpy.data.filepath,
+            'summary': [summary._asdict() for summary in get_operator_summaries()],
+            'records': [record._asdict() for record in operator_records],
+        }
+        with open(bpy.path.abspath(self.filepath), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4)
+
+        self.report({'INFO'}, f"Saved {len(operator_records)} operator runs")
+        return {'FINISHED'}
+
+
+class VRT_OT_ClearOperatorStats(Operator):
+    """Forget all recorded operator statistics"""
+    bl_idname = "wm.vrt_clear_operator_stats"
+    bl_label = "Clear Operator Statistics"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        global operator_records_version
+        operator_records.clear()
+        operator_records_version += 1
+        return {'FINISHED'}
@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import threading
+
+from contextlib import contextmanager
+
+
+# Profiler of the export which is running, None if profiling is off. Phases are recorded only while it's set
+active_profiler = None
+
+
+class ExportProfiler:
+    """Records wall time and call counts of export phases and writes them as a Chrome trace
+    (chrome://tracing, https://ui.perfetto.dev)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.end = None
+        # (phase, category) -> [calls, total seconds]
+        self.totals = {}
+        self.events = []
+        self.marks = {}
+
+    def add(self, name: str, category: str, start: float, duration: float, args: dict = None):
+        total = self.totals.setdefault((name, category), [0, 0.0])
+        total[0] += 1
+        total[1] += duration
+
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self.start) * 1e6,
+            'dur': duration * 1e6,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+        }
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    def mark(self, name: str):
+        self.marks[name] = time.perf_counter()
+
+    def add_since(self, mark: str, name: str, category: str = 'export'):
+        """Records a phase which started at a mark, for phases without a hook of their own, e.g. writing the file"""
+        start = self.marks.pop(mark, None)
+        if start is not None:
+            self.add(name, category, start, time.perf_counter() - start)
+
+    def stop(self):
+        self.end = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def get_phases(self) -> list:
+        """Returns (phase, category, calls, seconds) sorted by time spent, slowest first"""
+        return sorted(
+            ((name, category, calls, seconds) for (name, category), (calls, seconds) in self.totals.items()),
+            key=lambda phase: phase[3],
+            reverse=True,
+        )
+
+    def get_summary(self, count: int = 3) -> str:
+        phases = ", ".join(
+            f"{name}{f' [{category}]' if category != 'export' else ''} {seconds * 1000:.0f} ms ({calls}x)"
+            for name, category, calls, seconds in self.get_phases()[:count]
+        )
+        return f"Slowest: {phases}" if phases else ""
+
+    def write_trace(self, filepath: str):
+        trace = {
+            'traceEvents': self.events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'export': self.name,
+                'duration': self.duration,
+                'phases': [
+                    {'name': name, 'category': category, 'calls': calls, 'seconds': seconds}
+                    for name, category, calls, seconds in self.get_phases()
+                ],
+            },
+        }
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(trace, f)
+
+
+@contextmanager
+def profile_phase(name: str, category: str = 'export', **args):
+    """Records the time spent in the block if an export is being profiled. Costs next to nothing otherwise"""
+    profiler = active_profiler
+    if profiler is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.add(name, category, start, time.perf_counter() - start, args)
+
+
+def profiled(name: str = None, category: str = 'export'):
+    """Decorator version of profile_phase(), e.g. for the glTF exporter hooks"""
+    def decorator(function):
+        phase = name or function.__name__
+
+        def wrapper(*args, **kwargs):
+            if active_profiler is None:
+                return function(*args, **kwargs)
+            with profile_phase(phase, category):
+                return function(*args, **kwargs)
+
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+    return decorator
+
+
+def is_profiling() -> bool:
+    return active_profiler is not None
+
+
+def mark_phase(name: str):
+    if active_profiler is not None:
+        active_profiler.mark(name)
+
+
+def end_phase(mark: str, name: str, category: str = 'export'):
+    if active_profiler is not None:
+        active_profiler.add_since(mark, name, category)
+
+
+@contextmanager
+def profile_export(name: str, enabled: bool = True):
+    """Profiles everything inside the block. Yields the profiler, or None if disabled or already profiling"""
+    global active_profiler
+
+    if not enabled or active_profiler is not None:
+        yield None
+        return
+
+    active_profiler = ExportProfiler(name)
+    profiler = active_profiler
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        active_profiler = None
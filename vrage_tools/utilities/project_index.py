@@ -0,0 +1,347 @@
+'''
+Finds exported files which are out of date with their .blend sources and re-exports them.
+
+Outputs of a source are known from the export manifests (written by every quick or batch export) and
+from the source's job file (<file>.vrt-job.json), using the export naming of fn_export_paths.py.
+An output is stale if it's missing, if its source or one of the libraries linked into the source
+changed after it was exported, or if it was never recorded in a manifest.
+
+The index is cached, so only directories, manifests and jobs which changed since the last run are read again.
+Doesn't depend on bpy:
+
+    python -m vrage_tools.utilities.project_index Blocks/ --export-root Export/ --list
+    python -m vrage_tools.utilities.project_index Blocks/ --export-root Export/ --build --blender /path/to/blender
+'''
+
+import os
+import sys
+import json
+import argparse
+
+from collections import namedtuple
+
+from ..functions.fn_export_paths import (
+    manifest_name,
+    job_suffix,
+    get_job_path,
+    get_export_filepath,
+    get_export_extension,
+)
+from ..functions.fn_export_job import BatchExportError, load_job
+
+
+cache_name = ".vrt_project_index.json"
+cache_version = 1
+
+StaleOutput = namedtuple('StaleOutput', ['path', 'source', 'reason'])
+
+
+def normalize_path(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def get_mtime_ns(path: str, cache: dict = None):
+    if cache is not None and path in cache:
+        return cache[path]
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    if cache is not None:
+        cache[path] = mtime
+    return mtime
+
+
+class ProjectIndex:
+    """Dependency graph of .blend sources and their exported files"""
+
+    def __init__(self, source_roots: list, export_roots: list = (), cache_path: str = None):
+        self.source_roots = [normalize_path(root) for root in source_roots]
+        self.export_roots = [normalize_path(root) for root in export_roots]
+        self.cache_path = cache_path or os.path.join(self.source_roots[0], cache_name)
+
+        self.cache = {'version': cache_version, 'directories': {}, 'manifests': {}, 'jobs': {}}
+        self.sources = set()
+        self.manifests = set()
+        # source -> {output path -> manifest entry, or None if the output is only expected by the job}
+        self.graph = {}
+        self.errors = []
+
+    #region Cache
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if cache.get('version') == cache_version:
+            self.cache = cache
+
+    def save_cache(self):
+        temp_path = f"{self.cache_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f)
+        os.replace(temp_path, self.cache_path)
+
+    #endregion
+
+    #region Scan
+
+    def scan(self, incremental: bool = True):
+        """Finds all sources and manifests and builds the graph. With incremental, unchanged directories,
+        manifests and jobs are taken from the cache"""
+        if incremental:
+            self.load_cache()
+        else:
+            self.cache = {'version': cache_version, 'directories': {}, 'manifests': {}, 'jobs': {}}
+
+        visited = set()
+        for root in dict.fromkeys(self.source_roots + self.export_roots):
+            self.scan_directory(root, visited)
+
+        # Forget directories which no longer exist
+        self.cache['directories'] = {path: listing for path, listing in self.cache['directories'].items() if path in visited}
+        self.cache['manifests'] = {path: data for path, data in self.cache['manifests'].items() if path in self.manifests}
+
+        self.build_graph()
+
+    def scan_directory(self, directory: str, visited: set):
+        if directory in visited:
+            return
+        visited.add(directory)
+
+        mtime = get_mtime_ns(directory)
+        if mtime is None:
+            return
+
+        # A directory's mtime only changes when entries are added, removed or renamed
+        listing = self.cache['directories'].get(directory)
+        if listing is None or listing['mtime_ns'] != mtime:
+            listing = {'mtime_ns': mtime, 'blends': [], 'manifests': [], 'subdirs': []}
+            try:
+                entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+            except OSError:
+                entries = []
+            for entry in entries:
+                if entry.name.startswith('.') and entry.name != manifest_name:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    listing['subdirs'].append(entry.name)
+                elif entry.name.endswith('.blend'):
+                    listing['blends'].append(entry.name)
+                elif entry.name == manifest_name:
+                    listing['manifests'].append(entry.name)
+            self.cache['directories'][directory] = listing
+
+        # Manifests record normalized sources, on Windows the file names have to be lowercased alike to match
+        self.sources.update(normalize_path(os.path.join(directory, name)) for name in listing['blends'])
+        self.manifests.update(normalize_path(os.path.join(directory, name)) for name in listing['manifests'])
+
+        for name in listing['subdirs']:
+            self.scan_directory(normalize_path(os.path.join(directory, name)), visited)
+
+    def read_manifest(self, path: str) -> dict:
+        mtime = get_mtime_ns(path)
+        cached = self.cache['manifests'].get(path)
+        if cached is not None and cached['mtime_ns'] == mtime:
+            return cached['entries']
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            self.errors.append(f"Could not read manifest '{path}': {e}")
+            entries = {}
+
+        self.cache['manifests'][path] = {'mtime_ns': mtime, 'entries': entries}
+        return entries
+
+    def read_job(self, source: str) -> dict:
+        path = get_job_path(source)
+        mtime = get_mtime_ns(path)
+        if mtime is None:
+            self.cache['jobs'].pop(path, None)
+            return None
+
+        cached = self.cache['jobs'].get(path)
+        if cached is not None and cached['mtime_ns'] == mtime:
+            job = cached['job']
+        else:
+            try:
+                job = load_job(path)
+            except BatchExportError as e:
+                self.errors.append(str(e))
+                job = None
+            self.cache['jobs'][path] = {'mtime_ns': mtime, 'job': job}
+        return job
+
+    def get_job_outputs(self, source: str, job: dict) -> list:
+        """Files the job of a source writes. Empty if the job relies on the name or directory set in the scene"""
+        name = job.get('name')
+        directory = job.get('directory')
+        if not name or not directory:
+            return []
+        if directory.startswith('//'):
+            directory = os.path.join(os.path.dirname(source), directory[2:])
+
+        outputs = []
+        for entry in job['variants']:
+            variant = entry['variant']
+            for lod, source_collection in entry['lods']:
+                path = get_export_filepath(directory, name, variant, lod, create_dirs=False)
+                outputs.append(normalize_path(path + get_export_extension()))
+            if entry['collision'] is not None:
+                path = get_export_filepath(directory, name, variant, collision=True, create_dirs=False)
+                outputs.append(normalize_path(path + get_export_extension(collision=True)))
+        return outputs
+
+    def build_graph(self):
+        self.graph = {source: {} for source in self.sources}
+
+        for manifest in sorted(self.manifests):
+            directory = os.path.dirname(manifest)
+            for name, entry in self.read_manifest(manifest).items():
+                source = normalize_path(entry['source']) if entry.get('source') else ""
+                self.graph.setdefault(source, {})[normalize_path(os.path.join(directory, name))] = entry
+
+        for source in self.sources:
+            job = self.read_job(source)
+            if job is None:
+                continue
+            for output in self.get_job_outputs(source, job):
+                self.graph[source].setdefault(output, None)
+
+    #endregion
+
+    #region Query
+
+    def get_stale_outputs(self) -> list:
+        mtimes = {}
+        stale = []
+
+        for source, outputs in sorted(self.graph.items()):
+            source_mtime = get_mtime_ns(source, mtimes) if source else None
+
+            for output, entry in sorted(outputs.items()):
+                reason = None
+                output_mtime = get_mtime_ns(output, mtimes)
+
+                if source_mtime is None:
+                    # Exported from an unsaved file or a source which was deleted or moved, nothing to rebuild from
+                    continue
+                elif output_mtime is None:
+                    reason = "missing"
+                elif entry is None:
+                    reason = "not in manifest"
+                elif output_mtime != entry.get('mtime_ns'):
+                    reason = "changed outside of VRAGE Tools"
+                elif source_mtime > (entry.get('source_mtime_ns') or output_mtime):
+                    reason = "source changed"
+                else:
+                    # Older manifests don't record the library times, compare against the output then
+                    libraries_mtime = entry.get('libraries_mtime_ns') or output_mtime
+                    for library in entry.get('libraries', []):
+                        library_mtime = get_mtime_ns(library, mtimes)
+                        if library_mtime is not None and library_mtime > libraries_mtime:
+                            reason = f"library changed: {library}"
+                            break
+
+                if reason:
+                    stale.append(StaleOutput(output, source, reason))
+
+        return stale
+
+    def get_orphaned_outputs(self) -> list:
+        """Outputs whose source no longer exists"""
+        return sorted(
+            output
+            for source, outputs in self.graph.items()
+            if not source or get_mtime_ns(source) is None
+            for output in outputs
+        )
+
+    def get_unindexed_sources(self) -> list:
+        """Sources without a job and without any exported file, the index knows nothing about their outputs"""
+        return sorted(source for source in self.sources if not self.graph.get(source))
+
+    #endregion
+
+
+def build(index: ProjectIndex, stale: list, options, log=print) -> dict:
+    """Re-exports the sources of stale outputs in parallel with the batch runner"""
+    from . import batch_runner
+
+    sources = []
+    for source in sorted({output.source for output in stale}):
+        if os.path.exists(get_job_path(source)) or options.job:
+            sources.append(source)
+        else:
+            log(f"No {job_suffix} for {source} and no --job given, skipping it")
+
+    if not sources:
+        return None
+
+    runner_options = argparse.Namespace(
+        blender=options.blender,
+        job=options.job,
+        steps='export',
+        workers=max(1, options.workers),
+        retries=options.retries,
+        timeout=options.timeout,
+        save=False,
+        factory_startup=False,
+        force=False,
+    )
+    return batch_runner.run(sources, runner_options, log)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="vrage_tools.utilities.project_index",
+                                     description="List and rebuild exported files which are out of date with their .blend sources")
+    parser.add_argument('roots', nargs='+', help="Directories containing .blend sources")
+    parser.add_argument('--export-root', action='append', default=[], help="Directory containing exported files, can be repeated")
+    parser.add_argument('--cache', help=f"Path of the index cache, defaults to {cache_name} in the first root")
+    parser.add_argument('--full', action='store_true', help="Ignore the cache and read everything again")
+    parser.add_argument('--list', action='store_true', help="Print stale outputs")
+    parser.add_argument('--json', action='store_true', help="Print stale outputs as JSON")
+    parser.add_argument('--build', action='store_true', help="Re-export the sources of stale outputs")
+    parser.add_argument('--blender', default=os.environ.get('BLENDER') or 'blender', help="Blender executable used by --build")
+    parser.add_argument('--job', help="Job file for sources without their own job file")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Number of Blender processes running at once")
+    parser.add_argument('--retries', type=int, default=1, help="How many times a crashed or timed out file is retried")
+    parser.add_argument('--timeout', type=float, default=1800, help="Seconds after which a file is killed")
+    parser.add_argument('--report', default='vrt-build-report.json', help="Path of the JSON report written by --build")
+    options = parser.parse_args(argv)
+
+    index = ProjectIndex(options.roots, options.export_root, options.cache)
+    index.scan(incremental=not options.full)
+    index.save_cache()
+    stale = index.get_stale_outputs()
+
+    for error in index.errors:
+        print(error, file=sys.stderr)
+
+    if options.json:
+        print(json.dumps([output._asdict() for output in stale], indent=4))
+    elif options.list or not options.build:
+        for output in stale:
+            print(f"{output.reason:<32} {output.path}  <-  {output.source}")
+        print(f"{len(stale)} stale output(s) of {len({output.source for output in stale})} source(s), "
+              f"{len(index.get_unindexed_sources())} source(s) without known outputs")
+
+    if options.build:
+        report = build(index, stale, options)
+        if report is None:
+            print("Nothing to build")
+            return 0
+        with open(options.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+        print(f"{report['succeeded']}/{report['total']} source(s) rebuilt in {report['duration']:.1f}s, report written to {options.report}")
+        return 1 if report['failed'] else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,13 +3,13 @@ import sys
 import re
 import json
 import time
-import requests
 import webbrowser
 
 from bpy.types              import Operator
 from bpy.props              import BoolProperty
 
 from ..preferences          import get_preferences
+from .update_fetch          import request_timeout, start_update_check, take_update_result
 
 
 rel_ver = re.compile(r"v[0-9]+\.[0-9]+\.[0-9]+$")
@@ -44,6 +44,11 @@ class VRT_OT_CheckUpdate(Operator):
     bl_label = "Check for Updates"
     bl_options = {'REGISTER', 'UNDO'}
 
+    force: BoolProperty(
+        default=True,
+        options={'SKIP_SAVE'}
+    )
+
 
     def execute(self, context):
 
@@ -52,87 +57,143 @@ class VRT_OT_CheckUpdate(Operator):
 
         preferences.addon_current_version = str(addon.bl_info['version'])[1:-1].replace(', ', '.')
 
-        check_repo_update(force=True)
+        check_repo_update(force=self.force)
 
         return {'FINISHED'}
 
 
-def check_repo_update(force=False):
-    """Checks the GitHub API for the latest release of the repository."""
+# Seconds between two automatic checks
+check_interval = 4000
+
+user_reponame = git_url[len("https://github.com/"):]
+url_releases = f"https://api.github.com/repos/{user_reponame}/releases"
+
+update_thread = None
+
 
+def is_offline() -> bool:
     preferences = get_preferences()
-    preferences.addon_needs_update = False
-    preferences.addon_update_message = ""
+    # Blender 4.2+ lets users disable online access globally
+    return preferences.addon_offline_mode or not getattr(bpy.app, 'online_access', True)
 
-    user_reponame = git_url[len("https://github.com/"):]
-    url_tags = f"https://api.github.com/repos/{user_reponame}/tags"
-    url_releases = f"https://api.github.com/repos/{user_reponame}/releases"
-    current_version = tuple(map(int, preferences.addon_current_version.split('.')))
 
-    try:
-        skip = False
-        if time.time() - preferences.addon_last_check >= 4000 or force:
-            response_tags = requests.get(url_tags)
-            response_releases = requests.get(url_releases)
-            json_tags = response_tags.json()
-            json_releases = response_releases.json()
-
-            if response_tags.status_code == 200 and response_releases.status_code == 200:
-                preferences.addon_cache_tags = json.dumps(json_tags)
-                preferences.addon_cache_releases = json.dumps(json_releases)
-                preferences.addon_last_check = time.time()
+def check_repo_update(force=False):
+    """Checks the GitHub API for the latest release of the repository.
+    The request runs in a background thread, its result is applied on the main thread by a timer."""
+    global update_thread
 
-        else:
-            json_tags = json.loads(preferences.addon_cache_tags)
-            json_releases = json.loads(preferences.addon_cache_releases)
-            skip = True
+    preferences = get_preferences()
+
+    if is_offline():
+        preferences.addon_needs_update = False
+        preferences.addon_update_message = "Update check disabled (offline mode)."
+        return
 
-        if skip or (response_tags.status_code == 200 and response_releases.status_code == 200):
-            versions = list()
+    # Use the cached releases if the last check is recent enough
+    if not force and time.time() - preferences.addon_last_check < check_interval and preferences.addon_cache_releases != "":
+        try:
+            update_version_status(json.loads(preferences.addon_cache_releases))
+            return
+        except (ValueError, TypeError):
+            pass
 
-            for tag in json_tags:
-                name_tag = tag['name']
+    if update_thread is not None and update_thread.is_alive():
+        return
 
-                for release in json_releases:
-                    name_release = release['tag_name']
+    etag = preferences.addon_cache_etag if preferences.addon_cache_releases != "" else ""
+    preferences.addon_update_message = "Checking for updates..."
 
-                    if name_tag == name_release:
-                        if rel_ver.match(name_tag):
-                            versions.append(name_tag)
-                        break
+    update_thread = start_update_check(url_releases, etag, request_timeout)
 
-            if versions == []:
-                preferences.addon_update_message = "No valid releases found."
-                return
+    if not bpy.app.timers.is_registered(poll_update_results):
+        bpy.app.timers.register(poll_update_results, first_interval=0.25)
 
-            latest_version_name = sorted(versions, reverse=True)[0][1:]
-            latest_version = tuple(map(int, latest_version_name.split('.')))
 
-            current_version = tuple(current_version)
-            preferences.addon_latest_version = latest_version_name
+def poll_update_results():
+    """Timer which applies the result of the background update check, once it is available"""
+    result = take_update_result()
+    if result is None:
+        return 0.25
 
-            if current_version < latest_version:
-                if current_version == (0, 0, 0):
-                    outdated = f"VRAGE Tools not installed."
-                else:
-                    outdated = f"VRAGE Tools version {latest_version_name} available!"
-                preferences.addon_update_message = outdated
-                preferences.addon_needs_update = True
+    apply_update_result(result)
+    return None
 
-            elif current_version > latest_version:
-                preferences.addon_update_message = "Latest development version."
-                preferences.addon_needs_update = False
 
-            else:
-                preferences.addon_update_message = f"VRAGE Tools is up to date."
-                preferences.addon_needs_update = False
+def apply_update_result(result: dict):
+    preferences = get_preferences()
+    status = result['status']
 
-        elif response_tags.status_code == 403 or response_releases.status_code == 403:
+    try:
+        if status == 200:
+            preferences.addon_cache_releases = json.dumps(result['releases'])
+            preferences.addon_cache_etag = result['etag']
+            preferences.addon_last_check = time.time()
+            update_version_status(result['releases'])
+
+        elif status == 304:
+            preferences.addon_last_check = time.time()
+            update_version_status(json.loads(preferences.addon_cache_releases))
+
+        elif status == 403 or status == 429:
+            preferences.addon_needs_update = False
             preferences.addon_update_message = "Rate limit exceeded! Please wait one hour to check again."
 
+        elif status is None:
+            print(result.get('error'))
+            preferences.addon_needs_update = False
+            preferences.addon_update_message = "Connection Failed!"
+
         else:
+            preferences.addon_needs_update = False
             preferences.addon_update_message = "No valid releases found."
 
     except Exception as e:
         print(e)
-        preferences.addon_update_message = "Connection Failed!"
+        preferences.addon_update_message = "No valid releases found."
+
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            area.tag_redraw()
+
+
+def update_version_status(json_releases):
+    """Compares the current version against the published releases"""
+
+    preferences = get_preferences()
+    preferences.addon_needs_update = False
+    preferences.addon_update_message = ""
+
+    current_version = tuple(map(int, preferences.addon_current_version.split('.')))
+
+    versions = list()
+    for release in json_releases:
+        if release.get('draft') or release.get('prerelease'):
+            continue
+        name_release = release['tag_name']
+        if rel_ver.match(name_release):
+            versions.append(name_release)
+
+    if versions == []:
+        preferences.addon_update_message = "No valid releases found."
+        return
+
+    latest_version = max(tuple(map(int, v[1:].split('.'))) for v in versions)
+    latest_version_name = '.'.join(map(str, latest_version))
+
+    preferences.addon_latest_version = latest_version_name
+
+    if current_version < latest_version:
+        if current_version == (0, 0, 0):
+            outdated = f"VRAGE Tools not installed."
+        else:
+            outdated = f"VRAGE Tools version {latest_version_name} available!"
+        preferences.addon_update_message = outdated
+        preferences.addon_needs_update = True
+
+    elif current_version > latest_version:
+        preferences.addon_update_message = "Latest development version."
+        preferences.addon_needs_update = False
+
+    else:
+        preferences.addon_update_message = f"VRAGE Tools is up to date."
+        preferences.addon_needs_update = False
@@ -0,0 +1,75 @@
+'''
+Background requests of the update check.
+
+This module doesn't depend on bpy: the releases are fetched in a worker thread and queued,
+update_check.py applies the result on Blender's main thread from a timer.
+'''
+
+import json
+import queue
+import threading
+import urllib.error
+import urllib.request
+
+
+# Seconds to wait for GitHub to respond
+request_timeout = 3.0
+
+# (check, result) of finished requests. check is the number of the check which started the request
+update_results = queue.Queue()
+# Number of the latest check, results of earlier checks are dropped
+latest_check = 0
+
+
+def fetch_releases(url: str, etag: str = "", timeout: float = request_timeout) -> dict:
+    """Requests the releases of the repository. Does not touch bpy, so it can run outside of the main thread.
+    With an ETag of previously fetched releases, GitHub answers 304 Not Modified if nothing changed."""
+
+    request = urllib.request.Request(url, headers={'Accept': 'application/vnd.github+json'})
+    if etag:
+        request.add_header('If-None-Match', etag)
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return {
+                'status': response.status,
+                'etag': response.headers.get('ETag', ""),
+                'releases': json.loads(response.read().decode('utf-8')),
+            }
+    except urllib.error.HTTPError as e:
+        return {'status': e.code, 'etag': etag, 'releases': None}
+    except Exception as e:
+        return {'status': None, 'etag': etag, 'releases': None, 'error': str(e)}
+
+
+def start_update_check(url: str, etag: str = "", timeout: float = request_timeout) -> threading.Thread:
+    """Fetches the releases in a background thread. Results of earlier checks which are still queued or
+    still running are dropped, so they can't overwrite the result of this one"""
+    global latest_check
+
+    latest_check += 1
+    check = latest_check
+    while True:
+        try:
+            update_results.get_nowait()
+        except queue.Empty:
+            break
+
+    thread = threading.Thread(
+        target=lambda: update_results.put((check, fetch_releases(url, etag, timeout))),
+        name="VRT Update Check",
+        daemon=True
+        )
+    thread.start()
+    return thread
+
+
+def take_update_result():
+    """Returns the result of the latest check once it's available, None until then"""
+    while True:
+        try:
+            check, result = update_results.get_nowait()
+        except queue.Empty:
+            return None
+        if check == latest_check:
+            return result
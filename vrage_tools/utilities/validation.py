@@ -0,0 +1,255 @@
+import os
+import bpy
+
+from collections            import namedtuple, Counter
+
+from bpy.app.handlers       import persistent
+from bpy.types              import Operator
+
+from .name_model            import get_name_model
+from .notifications         import display_notifications
+from ..functions.fn_names   import split_groups, max_fractures
+from ..functions.fn_fracture_groups import is_canonical, get_fracture_group, is_fracture_group_value
+
+
+# A problem found by a rule, published as a notification. objects are names of the objects involved
+Issue = namedtuple('Issue', ['notification_type', 'code', 'variables', 'objects'])
+
+# What the scene rules need to know about an object. Only recomputed for objects the depsgraph reports as changed
+ObjectFacts = namedtuple('ObjectFacts', ['name', 'fracture_group', 'section', 'collider_base_name', 'linked_colliders', 'issues'])
+
+# as_pointer() -> ObjectFacts of the objects of the validated scene
+object_facts = {}
+# Names of objects changed since the last validation
+dirty_objects = set()
+needs_full_validation = True
+validated_scene = None
+
+validation_issues = []
+# (code, variables) of the issues which were already published, so an issue is only reported once while it persists
+published_issues = set()
+
+validation_delay = 0.25
+
+
+#region Rules
+
+def get_object_facts(obj, canonical: bool) -> ObjectFacts:
+    model = get_name_model(obj)
+    issues = []
+
+    # The construction stages tool derives groups and names from the Fracture_XX prefix
+    if obj.type == 'MESH' and ('Group' in obj or 'ConstructionMeshType' in obj) and model.fracture_prefix is None:
+        issues.append(Issue('WARNING', 'W002', [obj.name], [obj.name]))
+
+    linked = obj.get('group')
+    return ObjectFacts(
+        name=obj.name,
+        fracture_group=get_fracture_group(obj, canonical),
+        section=obj.get('SECTION'),
+        collider_base_name=model.base_name if obj.rigid_body is not None else None,
+        linked_colliders=split_groups(linked) if isinstance(linked, str) else (),
+        issues=tuple(issues),
+    )
+
+def check_fractures(scene, facts) -> list:
+    group_ids = {fracture.group_id for fracture in scene.vrt.fractures_list}
+    used = {fact.fracture_group for fact in facts if is_fracture_group_value(fact.fracture_group, group_ids)}
+    count = len(group_ids | used)
+    if count > max_fractures:
+        return [Issue('ERROR', 'E002', [count, max_fractures], [])]
+    return []
+
+def check_collider_names(scene, facts) -> list:
+    colliders = {}
+    for fact in facts:
+        if fact.collider_base_name is not None:
+            colliders.setdefault(fact.collider_base_name, []).append(fact.name)
+
+    linked = {name for fact in facts for name in fact.linked_colliders}
+    return [
+        Issue('ERROR', 'E003', [name], sorted(colliders[name]))
+        for name in sorted(linked)
+        if len(colliders.get(name, ())) > 1
+    ]
+
+def check_sections(scene, facts) -> list:
+    members = Counter(fact.section for fact in facts if fact.section)
+    return [Issue('WARNING', 'W003', [section.name], []) for section in scene.vrt.sections_list if not members[section.name]]
+
+def check_export_settings(scene, facts) -> list:
+    issues = []
+    if not scene.vrt.export_name:
+        issues.append(Issue('WARNING', 'W004', [], []))
+    if not scene.vrt.export_directory or not os.path.isdir(scene.vrt.export_directory):
+        issues.append(Issue('WARNING', 'W005', [scene.vrt.export_directory], []))
+    return issues
+
+# Rules over the whole scene. They only read ObjectFacts, so running them doesn't touch the objects again
+scene_rules = (
+    check_fractures,
+    check_collider_names,
+    check_sections,
+    check_export_settings,
+)
+
+#endregion
+
+#region Validation
+
+def update_object_facts(scene, full: bool):
+    global needs_full_validation, validated_scene
+
+    canonical = is_canonical(scene)
+    objects = scene.objects
+
+    if full or validated_scene != scene.name:
+        object_facts.clear()
+        for obj in objects:
+            object_facts[obj.as_pointer()] = get_object_facts(obj, canonical)
+    else:
+        for name in dirty_objects:
+            obj = objects.get(name)
+            if obj is not None:
+                object_facts[obj.as_pointer()] = get_object_facts(obj, canonical)
+
+        # Objects were added or deleted
+        if len(object_facts) != len(objects):
+            pointers = {}
+            for obj in objects:
+                pointers[obj.as_pointer()] = obj
+            for pointer in [pointer for pointer in object_facts if pointer not in pointers]:
+                del object_facts[pointer]
+            for pointer, obj in pointers.items():
+                if pointer not in object_facts:
+                    object_facts[pointer] = get_object_facts(obj, canonical)
+
+    dirty_objects.clear()
+    needs_full_validation = False
+    validated_scene = scene.name
+
+def validate(scene, full: bool = False) -> list:
+    """Runs all rules. Unless full, only objects changed since the last validation are looked at again"""
+    global validation_issues
+
+    update_object_facts(scene, full or needs_full_validation)
+
+    facts = list(object_facts.values())
+    issues = [issue for fact in facts for issue in fact.issues]
+    for rule in scene_rules:
+        issues.extend(rule(scene, facts))
+
+    validation_issues = issues
+    return issues
+
+def get_validation_issues(scene) -> list:
+    """Cached result of the last validation, brought up to date if objects changed since"""
+    if needs_full_validation or dirty_objects or validated_scene != scene.name:
+        return validate(scene)
+    return validation_issues
+
+def mark_all_dirty():
+    global needs_full_validation
+    needs_full_validation = True
+
+def get_issue_counts(issues) -> tuple:
+    errors = sum(1 for issue in issues if issue.notification_type == 'ERROR')
+    return errors, len(issues) - errors
+
+def publish_issues(context, issues, republish: bool = False):
+    """Reports issues which appeared since the last validation as notifications"""
+    global published_issues
+
+    keys = {(issue.code, tuple(issue.variables)) for issue in issues}
+    new = [issue for issue in issues if republish or (issue.code, tuple(issue.variables)) not in published_issues]
+    published_issues = keys
+
+    if new:
+        display_notifications(context, [(issue.notification_type, issue.code, issue.variables, issue.objects) for issue in new], operator="validation")
+
+def check_export_gate(operator, context) -> bool:
+    """Returns False and reports the errors if the scene must not be exported"""
+    scene = context.scene
+    # Without live validation no changes are tracked, the cached issues may be outdated
+    issues = get_validation_issues(scene) if scene.vrt.use_live_validation else validate(scene, full=True)
+    errors = [issue for issue in issues if issue.notification_type == 'ERROR']
+    if not errors:
+        return True
+
+    publish_issues(context, errors, republish=True)
+    operator.report({'ERROR'}, f"Export blocked by {len(errors)} validation error(s), see VRT Notifications")
+    return False
+
+#endregion
+
+#region Handlers
+
+def run_live_validation():
+    context = bpy.context
+    scene = context.scene
+    if scene is None or not scene.vrt.use_live_validation:
+        return None
+
+    issues = validate(scene)
+    window = context.window_manager.windows[0] if context.window_manager.windows else None
+    with context.temp_override(window=window):
+        publish_issues(context, issues)
+    return None
+
+@persistent
+def validation_depsgraph_handler(scene, depsgraph):
+    if bpy.app.background or not scene.vrt.use_live_validation:
+        return
+
+    changed = False
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Object):
+            dirty_objects.add(id_data.name)
+            changed = True
+        elif isinstance(id_data, (bpy.types.Scene, bpy.types.Collection)):
+            changed = True
+
+    # Many updates arrive while the user drags something, validate once things calm down
+    if changed and not bpy.app.timers.is_registered(run_live_validation):
+        bpy.app.timers.register(run_live_validation, first_interval=validation_delay)
+
+@persistent
+def validation_load_handler(dummy):
+    global published_issues
+    mark_all_dirty()
+    published_issues = set()
+    object_facts.clear()
+    dirty_objects.clear()
+
+def update_use_live_validation(self, context):
+    # Changes made while live validation was off weren't tracked
+    mark_all_dirty()
+
+#endregion
+
+
+class VRT_OT_Validate(Operator):
+    """Check the whole scene for problems which block the export and list them in the notifications"""
+    bl_idname = "scene.vrt_validate"
+    bl_label = "Validate"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        issues = validate(context.scene, full=True)
+        publish_issues(context, issues, republish=True)
+
+        errors, warnings = get_issue_counts(issues)
+        self.report({'ERROR'} if errors else {'INFO'}, f"{errors} error(s), {warnings} warning(s)")
+        return {'FINISHED'}
+
+
+def register_validation():
+    bpy.app.handlers.depsgraph_update_post.append(validation_depsgraph_handler)
+    bpy.app.handlers.load_post.append(validation_load_handler)
+
+def unregister_validation():
+    if bpy.app.timers.is_registered(run_live_validation):
+        bpy.app.timers.unregister(run_live_validation)
+    bpy.app.handlers.load_post.remove(validation_load_handler)
+    bpy.app.handlers.depsgraph_update_post.remove(validation_depsgraph_handler)
@@ -0,0 +1,120 @@
+import bpy
+import time
+
+from bpy.app.handlers       import persistent
+
+from ..functions.fn_operators import get_export_objects
+
+
+# (type name, name) of objects, meshes and materials changed since the last watch export.
+# None means everything has to be considered changed
+dirty_objects = None
+last_save = 0.0
+exporting = False
+
+
+def mark_all_dirty():
+    global dirty_objects
+    dirty_objects = None
+
+
+#region Handlers
+
+@persistent
+def watch_depsgraph_handler(scene, depsgraph):
+    global dirty_objects
+
+    if exporting or dirty_objects is None or not scene.vrt.use_watch_export:
+        return
+
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, (bpy.types.Object, bpy.types.Mesh, bpy.types.Material)):
+            dirty_objects.add((type(id_data).__name__, id_data.name))
+
+@persistent
+def watch_save_handler(dummy):
+    global last_save
+
+    scene = bpy.context.scene
+    if bpy.app.background or scene is None or not scene.vrt.use_watch_export:
+        return
+
+    # Saving several times in a row only exports once, after the last save
+    last_save = time.monotonic()
+    if not bpy.app.timers.is_registered(run_watch_export):
+        bpy.app.timers.register(run_watch_export, first_interval=scene.vrt.watch_export_delay)
+
+@persistent
+def watch_load_handler(dummy):
+    mark_all_dirty()
+
+#endregion
+
+#region Export
+
+def is_export_dirty(objs) -> bool:
+    if dirty_objects is None:
+        return True
+
+    for obj in objs:
+        if ('Object', obj.name) in dirty_objects:
+            return True
+        if obj.type == 'MESH' and ('Mesh', obj.data.name) in dirty_objects:
+            return True
+        if any(('Material', slot.material.name) in dirty_objects for slot in obj.material_slots if slot.material):
+            return True
+    return False
+
+def run_watch_export():
+    global dirty_objects, exporting
+
+    context = bpy.context
+    scene = context.scene
+    if scene is None or not scene.vrt.use_watch_export:
+        return None
+
+    remaining = scene.vrt.watch_export_delay - (time.monotonic() - last_save)
+    if remaining > 0:
+        return remaining
+
+    objs = get_export_objects(context, scene.vrt.export_limit)
+    if not objs or not is_export_dirty(objs):
+        return None
+
+    window = context.window_manager.windows[0] if context.window_manager.windows else None
+    exporting = True
+    exported = False
+    try:
+        with context.temp_override(window=window):
+            if bpy.ops.scene.vrt_quick_export.poll():
+                exported = bpy.ops.scene.vrt_quick_export(export_lod=scene.vrt.watch_export_lod) == {'FINISHED'}
+            if scene.vrt.watch_export_collisions:
+                exported = exported and bpy.ops.scene.vrt_quick_export_collisions.poll() \
+                    and bpy.ops.scene.vrt_quick_export_collisions() == {'FINISHED'}
+    finally:
+        exporting = False
+
+    # Changes the export couldn't write (edit mode, validation errors, no directory) are exported on the next save
+    if exported:
+        dirty_objects = set()
+
+    return None
+
+#endregion
+
+def update_use_watch_export(self, context):
+    # Nothing is known about what the last export contained
+    mark_all_dirty()
+
+def register_watch_export():
+    bpy.app.handlers.depsgraph_update_post.append(watch_depsgraph_handler)
+    bpy.app.handlers.save_post.append(watch_save_handler)
+    bpy.app.handlers.load_post.append(watch_load_handler)
+
+def unregister_watch_export():
+    if bpy.app.timers.is_registered(run_watch_export):
+        bpy.app.timers.unregister(run_watch_export)
+    bpy.app.handlers.load_post.remove(watch_load_handler)
+    bpy.app.handlers.save_post.remove(watch_save_handler)
+    bpy.app.handlers.depsgraph_update_post.remove(watch_depsgraph_handler)